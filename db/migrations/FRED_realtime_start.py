@@ -0,0 +1,34 @@
+from sqlalchemy import text
+
+from setting.database_orm import SessionLocal
+from Logger import logger
+
+"""
+    * FRED 빈티지(개정 이력) 컬럼 추가 마이그레이션
+        - 개정되는 시리즈 테이블(TB_PCE_INFLATION, TB_MACROECONOMIC_GDP)에 REALTIME_START(DATE) 컬럼 추가
+        - 빈티지 비교 조회용 인덱스 (DATE, REALTIME_START) 생성
+        - 기존 행은 REALTIME_START가 NULL로 남으며, 수집기는 이를 가장 오래된 빈티지로 취급
+        - 실행 : python -m db.migrations.FRED_realtime_start
+"""
+
+TABLES = ["TB_PCE_INFLATION", "TB_MACROECONOMIC_GDP"]
+
+
+def migrate() -> None:
+    with SessionLocal() as conn:
+        try:
+            for table in TABLES:
+                conn.execute(text(f'ALTER TABLE "{table}" ADD COLUMN IF NOT EXISTS "REALTIME_START" DATE'))
+                conn.execute(text(
+                    f'CREATE INDEX IF NOT EXISTS "IX_{table}_DATE_REALTIME_START" ON "{table}" ("DATE", "REALTIME_START")'
+                ))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error("[FRED : 마이그레이션] -----> ERROR : REALTIME_START 컬럼 추가 실패", exc_info=True)
+            raise
+    logger.info(f"[FRED : 마이그레이션] -----> 완료 : {', '.join(TABLES)}")
+
+
+if __name__ == "__main__":
+    migrate()
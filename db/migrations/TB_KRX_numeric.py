@@ -0,0 +1,129 @@
+import argparse
+
+from sqlalchemy import text
+
+from setting.database_orm import SessionLocal
+from infrastructure.krx.columns import KRX_BIGINT_COLUMNS, KRX_NUMERIC_COLUMNS
+from Logger import logger
+
+"""
+    * TB_KRX 숫자 컬럼 타입 변환 마이그레이션 (TEXT → BIGINT / NUMERIC)
+        - ALTER COLUMN TYPE은 테이블 전체를 재작성하며 잠금을 오래 유지하므로 단계별로 나눠 수행
+        - 1단계: 임시 컬럼("<컬럼>__NEW") 추가
+        - 2단계: ID 범위 단위(기본 50,000건)로 콤마 제거 후 숫자 변환하여 채움, 청크마다 커밋 (중단 후 재실행 가능)
+        - 3단계: 단일 트랜잭션에서 기존 컬럼 삭제 후 임시 컬럼 이름 변경
+            DROP COLUMN은 해당 컬럼을 참조하는 인덱스도 함께 삭제하므로 삭제 전 정의를 저장해 두었다가 같은 트랜잭션에서 재생성
+            (예: TB_KRX_partition이 만든 커버링 인덱스 IX_TB_KRX_STOCK_CODE_BAS_DD ... INCLUDE ("MKTCAP", "MKT_NM"))
+        - 숫자가 아닌 값('-', 빈 문자열 등)은 NULL로 변환
+        - 3단계 직전 적재분이 누락되지 않도록 TB_KRX 스케줄러를 멈춘 상태에서 실행
+        - 실행 순서 : 본 마이그레이션 → TB_KRX_partition 권장
+            (파티션 전환 후 실행해도 인덱스는 재생성되지만 전체 파티션 인덱스를 다시 만드는 동안 잠금이 길어짐)
+        - 실행 : python -m db.migrations.TB_KRX_numeric --chunk-size 50000
+"""
+
+TABLE = "TB_KRX"
+NUMBER_RE = r"^-?[0-9]+(\.[0-9]+)?$"
+COLUMN_TYPES = {**{col: "BIGINT" for col in KRX_BIGINT_COLUMNS}, **{col: "NUMERIC(10, 2)" for col in KRX_NUMERIC_COLUMNS}}
+
+
+def _cast_expr(col: str, sql_type: str) -> str:
+    cleaned = f"btrim(replace(\"{col}\", ',', ''))"
+    value = f"round({cleaned}::numeric)::bigint" if sql_type == "BIGINT" else f"{cleaned}::numeric"
+    return f"CASE WHEN {cleaned} ~ '{NUMBER_RE}' THEN {value} END"
+
+
+def pending_columns(conn) -> dict:
+    """아직 TEXT로 남아 있는 대상 컬럼 → 변환 타입"""
+    rows = conn.execute(
+        text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_name = :table AND data_type = 'text'"
+        ),
+        {"table": TABLE},
+    ).all()
+    text_columns = {row[0] for row in rows}
+    return {col: sql_type for col, sql_type in COLUMN_TYPES.items() if col in text_columns}
+
+
+def add_shadow_columns(conn, columns: dict) -> None:
+    for col, sql_type in columns.items():
+        conn.execute(text(f'ALTER TABLE "{TABLE}" ADD COLUMN IF NOT EXISTS "{col}__NEW" {sql_type}'))
+    conn.commit()
+
+
+def backfill(conn, columns: dict, chunk_size: int) -> None:
+    min_id, max_id = conn.execute(text(f'SELECT min("ID"), max("ID") FROM "{TABLE}"')).one()
+    if min_id is None:
+        return
+    assignments = ", ".join(f'"{col}__NEW" = {_cast_expr(col, sql_type)}' for col, sql_type in columns.items())
+    stmt = text(f'UPDATE "{TABLE}" SET {assignments} WHERE "ID" BETWEEN :lo AND :hi')
+
+    for lo in range(min_id, max_id + 1, chunk_size):
+        hi = lo + chunk_size - 1
+        try:
+            result = conn.execute(stmt, {"lo": lo, "hi": hi})
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error(f"[TB_KRX : 마이그레이션] -----> ERROR : ID {lo}~{hi} 변환 실패", exc_info=True)
+            raise
+        logger.info(f"[TB_KRX : 마이그레이션] -----> ID {lo:,}~{hi:,} 변환 : {result.rowcount:,}건")
+
+
+def dependent_indexes(conn, columns: dict) -> list:
+    """
+    대상 컬럼을 참조하는 인덱스 (이름, 정의) 목록 (제약조건 인덱스 제외)
+    - 파티션 부모 인덱스의 정의는 'ON ONLY'로 나오므로 파티션까지 생성되도록 'ON'으로 변경
+    """
+    rows = conn.execute(
+        text(
+            "SELECT i.relname, pg_get_indexdef(x.indexrelid) FROM pg_index x "
+            "JOIN pg_class t ON t.oid = x.indrelid JOIN pg_class i ON i.oid = x.indexrelid "
+            "WHERE t.relname = :table "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)"
+        ),
+        {"table": TABLE},
+    ).all()
+    return [
+        (name, definition.replace(" ON ONLY ", " ON "))
+        for name, definition in rows
+        if any(f'"{col}"' in definition for col in columns)
+    ]
+
+
+def swap_columns(conn, columns: dict) -> None:
+    """기존 TEXT 컬럼 삭제 후 임시 컬럼을 원래 이름으로 변경, 함께 삭제된 인덱스 재생성 (단일 트랜잭션)"""
+    try:
+        indexes = dependent_indexes(conn, columns)
+        for col in columns:
+            conn.execute(text(f'ALTER TABLE "{TABLE}" DROP COLUMN "{col}"'))
+            conn.execute(text(f'ALTER TABLE "{TABLE}" RENAME COLUMN "{col}__NEW" TO "{col}"'))
+        for name, definition in indexes:
+            conn.execute(text(definition))
+            logger.info(f"[TB_KRX : 마이그레이션] -----> 인덱스 재생성 : {name}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def migrate(chunk_size: int = 50000) -> None:
+    logger.info("[TB_KRX : 마이그레이션] -----> 숫자 컬럼 타입 변환 시작")
+    with SessionLocal() as conn:
+        columns = pending_columns(conn)
+        if not columns:
+            logger.info("[TB_KRX : 마이그레이션] -----> 변환할 컬럼이 없습니다.")
+            return
+        add_shadow_columns(conn, columns)
+        backfill(conn, columns, chunk_size)
+        swap_columns(conn, columns)
+        conn.execute(text(f'ANALYZE "{TABLE}"'))
+        conn.commit()
+    logger.info(f"[TB_KRX : 마이그레이션] -----> 완료 : {', '.join(columns)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TB_KRX 숫자 컬럼 타입 변환")
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    args = parser.parse_args()
+    migrate(chunk_size=args.chunk_size)
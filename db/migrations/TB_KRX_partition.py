@@ -0,0 +1,139 @@
+from typing import Optional
+
+from sqlalchemy import text
+
+from setting.database_orm import SessionLocal
+from infrastructure.krx.partitions import TABLE, ensure_year_partitions
+from Logger import logger
+
+"""
+    * TB_KRX 연도별 RANGE 파티션 전환 마이그레이션
+        - 1단계: 기존 TB_KRX와 동일 컬럼의 파티션 부모 테이블(TB_KRX_NEW) 생성, PK (ID, BAS_DD)
+        - 2단계: 데이터가 있는 연도별 파티션(TB_KRX_YYYY) + DEFAULT 파티션 생성, 커버링 인덱스 생성
+        - 3단계: 연도 단위로 INSERT ... SELECT 복사, 연도마다 커밋 (BAS_DD가 NULL인 행은 파티션 키가 없어 제외)
+        - 4단계: 단일 트랜잭션에서 TB_KRX → TB_KRX_OLD, TB_KRX_NEW → TB_KRX 이름 교체, ID 시퀀스 소유권 이전
+            제약조건 이름도 교체 (기존 PK → TB_KRX_OLD_pkey, TB_KRX_NEW_pkey/_fkey → TB_KRX_pkey/_fkey, 모델과 일치)
+        - TB_KRX_OLD는 검증 후 수동 삭제, 실행 중에는 TB_KRX 스케줄러를 멈춘 상태로 유지
+        - 실행 순서 : TB_KRX_numeric(숫자 컬럼 변환) 먼저 실행 후 본 마이그레이션 실행
+            (LIKE로 컬럼 타입을 복사하므로 변환된 타입이 그대로 이어짐, 반대 순서로 실행하면 MKTCAP 삭제 시 함께 지워지는
+             IX_TB_KRX_STOCK_CODE_BAS_DD를 TB_KRX_numeric이 전체 파티션에 다시 생성하느라 잠금이 길어짐)
+        - 실행 : python -m db.migrations.TB_KRX_partition
+"""
+
+NEW_TABLE = f"{TABLE}_NEW"
+OLD_TABLE = f"{TABLE}_OLD"
+INDEX_NAME = "IX_TB_KRX_STOCK_CODE_BAS_DD"
+
+
+def is_partitioned(conn) -> bool:
+    return conn.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON pt.partrelid = c.oid "
+            "WHERE c.relname = :table"
+        ),
+        {"table": TABLE},
+    ).first() is not None
+
+
+def data_years(conn) -> list:
+    rows = conn.execute(text(
+        f'SELECT DISTINCT EXTRACT(YEAR FROM "BAS_DD")::int FROM "{TABLE}" WHERE "BAS_DD" IS NOT NULL ORDER BY 1'
+    )).all()
+    return [row[0] for row in rows]
+
+
+def create_parent(conn, years: list) -> None:
+    """이전 실행에서 남은 임시 테이블은 파티션까지 삭제 후 재생성 (중단 후 재실행 시 처음부터 복사)"""
+    conn.execute(text(f'DROP TABLE IF EXISTS "{NEW_TABLE}"'))
+    conn.execute(text(
+        f'CREATE TABLE "{NEW_TABLE}" (LIKE "{TABLE}" INCLUDING DEFAULTS) '
+        f'PARTITION BY RANGE ("BAS_DD")'
+    ))
+    conn.execute(text(f'ALTER TABLE "{NEW_TABLE}" ALTER COLUMN "BAS_DD" SET NOT NULL'))
+    conn.execute(text(
+        f'ALTER TABLE "{NEW_TABLE}" ADD CONSTRAINT "{NEW_TABLE}_pkey" PRIMARY KEY ("ID", "BAS_DD")'
+    ))
+    conn.execute(text(
+        f'ALTER TABLE "{NEW_TABLE}" ADD CONSTRAINT "{NEW_TABLE}_STOCK_CODE_fkey" '
+        f'FOREIGN KEY ("STOCK_CODE") REFERENCES "TB_COMPANY" ("STOCK_CODE")'
+    ))
+    conn.execute(text(
+        f'CREATE INDEX "{INDEX_NAME}" ON "{NEW_TABLE}" ("STOCK_CODE", "BAS_DD") '
+        f'INCLUDE ("MKTCAP", "MKT_NM")'
+    ))
+    conn.execute(text(f'CREATE TABLE IF NOT EXISTS "{TABLE}_DEFAULT" PARTITION OF "{NEW_TABLE}" DEFAULT'))
+    conn.commit()
+    ensure_year_partitions(conn, years, table=NEW_TABLE)
+
+
+def copy_years(conn, years: list) -> None:
+    stmt = text(
+        f'INSERT INTO "{NEW_TABLE}" SELECT * FROM "{TABLE}" '
+        f'WHERE "BAS_DD" >= make_date(:year, 1, 1) AND "BAS_DD" < make_date(:year + 1, 1, 1)'
+    )
+    for year in years:
+        try:
+            result = conn.execute(stmt, {"year": year})
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error(f"[TB_KRX : 파티션 마이그레이션] -----> ERROR : {year}년 복사 실패", exc_info=True)
+            raise
+        logger.info(f"[TB_KRX : 파티션 마이그레이션] -----> {year}년 복사 : {result.rowcount:,}건")
+
+    skipped = conn.execute(text(f'SELECT count(*) FROM "{TABLE}" WHERE "BAS_DD" IS NULL')).scalar()
+    if skipped:
+        logger.warning(f"[TB_KRX : 파티션 마이그레이션] -----> BAS_DD NULL {skipped:,}건 제외 ({OLD_TABLE}에 보존)")
+
+
+def primary_key_name(conn, table: str) -> Optional[str]:
+    return conn.execute(
+        text(
+            "SELECT con.conname FROM pg_constraint con JOIN pg_class c ON con.conrelid = c.oid "
+            "WHERE c.relname = :table AND con.contype = 'p'"
+        ),
+        {"table": table},
+    ).scalar()
+
+
+def swap_tables(conn) -> None:
+    """
+    이름 교체 + ID 시퀀스 소유권 이전 (TB_KRX_OLD 삭제 시 시퀀스가 함께 삭제되지 않도록)
+    - PK 인덱스 이름은 스키마 내 유일 → 기존 PK를 먼저 TB_KRX_OLD_pkey로 바꾼 뒤 새 PK를 TB_KRX_pkey로 변경
+    """
+    try:
+        sequence = conn.execute(text(f"SELECT pg_get_serial_sequence('\"{TABLE}\"', 'ID')")).scalar()
+        old_pkey = primary_key_name(conn, TABLE)
+        conn.execute(text(f'ALTER TABLE "{TABLE}" RENAME TO "{OLD_TABLE}"'))
+        if old_pkey:
+            conn.execute(text(f'ALTER TABLE "{OLD_TABLE}" RENAME CONSTRAINT "{old_pkey}" TO "{OLD_TABLE}_pkey"'))
+        conn.execute(text(f'ALTER TABLE "{NEW_TABLE}" RENAME TO "{TABLE}"'))
+        conn.execute(text(f'ALTER TABLE "{TABLE}" RENAME CONSTRAINT "{NEW_TABLE}_pkey" TO "{TABLE}_pkey"'))
+        conn.execute(text(
+            f'ALTER TABLE "{TABLE}" RENAME CONSTRAINT "{NEW_TABLE}_STOCK_CODE_fkey" TO "{TABLE}_STOCK_CODE_fkey"'
+        ))
+        if sequence:
+            conn.execute(text(f'ALTER SEQUENCE {sequence} OWNED BY "{TABLE}"."ID"'))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def migrate() -> None:
+    logger.info("[TB_KRX : 파티션 마이그레이션] -----> 시작")
+    with SessionLocal() as conn:
+        if is_partitioned(conn):
+            logger.info("[TB_KRX : 파티션 마이그레이션] -----> 이미 파티션 테이블입니다.")
+            return
+        years = data_years(conn)
+        create_parent(conn, years)
+        copy_years(conn, years)
+        swap_tables(conn)
+        conn.execute(text(f'ANALYZE "{TABLE}"'))
+        conn.commit()
+    logger.info(f"[TB_KRX : 파티션 마이그레이션] -----> 완료 (기존 테이블 : {OLD_TABLE})")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,50 @@
+from sqlalchemy import text
+
+from setting.database_orm import SessionLocal
+from db.public.models import TB_RUN_STATE, TB_RUN_STATE_ITEM
+from Logger import logger
+
+"""
+    * 스케줄러 체크포인트 테이블 생성 마이그레이션
+        - TB_RUN_STATE : 실행 1회(RUN_ID) 단위 대상(JOB, BSNS_YEAR, REPRT_CODE, FS_DIV, BAS_DD), 상태, 마지막 처리 기업
+        - TB_RUN_STATE_ITEM : 실행별 기업(건) 처리 상태 (RUN_ID, CORP_CODE, ITEM_KEY 유일)
+        - 이미 존재하는 테이블은 건너뜀 (재실행 가능)
+        - ITEM_KEY 도입 전에 생성된 TB_RUN_STATE_ITEM은 컬럼 추가('' 기본값) + 유일 제약을 (RUN_ID, CORP_CODE, ITEM_KEY)로 교체
+        - 실행 : python -m db.migrations.TB_RUN_STATE
+"""
+
+TABLES = [TB_RUN_STATE.__table__, TB_RUN_STATE_ITEM.__table__]
+ITEM_TABLE = TB_RUN_STATE_ITEM.__tablename__
+OLD_CONSTRAINT = "UQ_TB_RUN_STATE_ITEM_RUN_ID_CORP_CODE"
+NEW_CONSTRAINT = "UQ_TB_RUN_STATE_ITEM_RUN_ID_CORP_CODE_ITEM_KEY"
+
+
+def upgrade_item_key(conn) -> None:
+    """기존 TB_RUN_STATE_ITEM에 ITEM_KEY 컬럼/유일 제약 반영"""
+    conn.execute(text(f'ALTER TABLE "{ITEM_TABLE}" ADD COLUMN IF NOT EXISTS "ITEM_KEY" TEXT NOT NULL DEFAULT \'\''))
+    conn.execute(text(f'ALTER TABLE "{ITEM_TABLE}" DROP CONSTRAINT IF EXISTS "{OLD_CONSTRAINT}"'))
+    exists = conn.execute(
+        text("SELECT 1 FROM pg_constraint WHERE conname = :name"), {"name": NEW_CONSTRAINT}
+    ).first()
+    if exists is None:
+        conn.execute(text(
+            f'ALTER TABLE "{ITEM_TABLE}" ADD CONSTRAINT "{NEW_CONSTRAINT}" UNIQUE ("RUN_ID", "CORP_CODE", "ITEM_KEY")'
+        ))
+
+
+def migrate() -> None:
+    with SessionLocal() as conn:
+        try:
+            for table in TABLES:
+                table.create(bind=conn.connection(), checkfirst=True)
+            upgrade_item_key(conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error("[RUN_STATE : 마이그레이션] -----> ERROR : 테이블 생성 실패", exc_info=True)
+            raise
+    logger.info(f"[RUN_STATE : 마이그레이션] -----> 완료 : {', '.join(table.name for table in TABLES)}")
+
+
+if __name__ == "__main__":
+    migrate()
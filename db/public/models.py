@@ -2,7 +2,7 @@
 PostgreSQL ORM 모델 정의
 스키마: public
 """
-from sqlalchemy import Column, Integer, Boolean, Text, Date, ForeignKey, String, ARRAY
+from sqlalchemy import Column, Integer, BigInteger, Numeric, Boolean, Text, Date, DateTime, ForeignKey, String, ARRAY, Index, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 from db.base import Base
 
@@ -119,9 +119,12 @@ class TB_EMBEZZLEMENT(Base):
 # GDP 성장률 추정
 class TB_MACROECONOMIC_GDP(Base):
     __tablename__ = "TB_MACROECONOMIC_GDP"
+    __table_args__ = (Index("IX_TB_MACROECONOMIC_GDP_DATE_REALTIME_START", "DATE", "REALTIME_START"),)
     ID = Column(Integer, primary_key=True)
     VALUE = Column(Text, nullable=True)
     DATE = Column(Date, nullable=True)
+    # FRED 빈티지 발표일 (개정 이력 추적, 기존 적재분은 NULL)
+    REALTIME_START = Column(Date, nullable=True)
 
 # 불성실 공시 
 class TB_UNFAITHFUL_DISCLOSURE(Base):
@@ -141,9 +144,12 @@ class TB_UNFAITHFUL_DISCLOSURE(Base):
 # 개인소비지출 물가지수
 class TB_PCE_INFLATION(Base):
     __tablename__ = "TB_PCE_INFLATION"
+    __table_args__ = (Index("IX_TB_PCE_INFLATION_DATE_REALTIME_START", "DATE", "REALTIME_START"),)
     ID = Column(Integer, primary_key=True)
     VALUE = Column(Text, nullable=True)
     DATE = Column(Date, nullable=True)
+    # FRED 빈티지 발표일 (개정 이력 추적, 기존 적재분은 NULL)
+    REALTIME_START = Column(Date, nullable=True)
 
 # 부도발생
 class TB_BANKRUPTCY(Base):
@@ -189,24 +195,35 @@ class TB_DELISTING(Base):
     company = relationship("TB_COMPANY", back_populates="delistings")
 
 # 한국거래소
+# - BAS_DD 연도별 RANGE 파티션 (파티션 키 포함을 위해 PK는 ID + BAS_DD)
+# - 시가총액 조회용 커버링 인덱스 (STOCK_CODE, BAS_DD) INCLUDE (MKTCAP, MKT_NM)
 class TB_KRX(Base):
     __tablename__ = "TB_KRX"
-    ID = Column(Integer, primary_key=True)
+    __table_args__ = (
+        Index(
+            "IX_TB_KRX_STOCK_CODE_BAS_DD",
+            "STOCK_CODE",
+            "BAS_DD",
+            postgresql_include=["MKTCAP", "MKT_NM"],
+        ),
+        {"postgresql_partition_by": 'RANGE ("BAS_DD")'},
+    )
+    ID = Column(Integer, primary_key=True, autoincrement=True)
     STOCK_CODE = Column(Text, ForeignKey("TB_COMPANY.STOCK_CODE"), nullable=False)
-    BAS_DD = Column(Date, nullable=True)
+    BAS_DD = Column(Date, primary_key=True, nullable=False)
     ISU_NM = Column(Text, nullable=True)
     MKT_NM = Column(Text, nullable=True)
     SECT_TP_NM = Column(Text, nullable=True)
-    TDD_CLSPRC = Column(Text, nullable=True)
-    CMPPREVDD_PRC = Column(Text, nullable=True)
-    FLUC_RT = Column(Text, nullable=True)
-    TDD_OPNPRC = Column(Text, nullable=True)
-    TDD_HGPRC = Column(Text, nullable=True)
-    TDD_LWPRC = Column(Text, nullable=True)
-    ACC_TRDVOL = Column(Text, nullable=True)
-    ACC_TRDVAL = Column(Text, nullable=True)
-    MKTCAP = Column(Text, nullable=True)
-    LIST_SHRS = Column(Text, nullable=True)
+    TDD_CLSPRC = Column(BigInteger, nullable=True)
+    CMPPREVDD_PRC = Column(BigInteger, nullable=True)
+    FLUC_RT = Column(Numeric(10, 2), nullable=True)
+    TDD_OPNPRC = Column(BigInteger, nullable=True)
+    TDD_HGPRC = Column(BigInteger, nullable=True)
+    TDD_LWPRC = Column(BigInteger, nullable=True)
+    ACC_TRDVOL = Column(BigInteger, nullable=True)
+    ACC_TRDVAL = Column(BigInteger, nullable=True)
+    MKTCAP = Column(BigInteger, nullable=True)
+    LIST_SHRS = Column(BigInteger, nullable=True)
     # Relationship to TB_COMPANY
     company = relationship("TB_COMPANY", back_populates="krx_data")
 
@@ -265,4 +282,40 @@ class TB_CRT_NEWS(Base):
     RESULT_BEGINNER = Column(Text, nullable=True) 
     RESULT_PRO = Column(Text, nullable=True)     
     CRT = Column(ARRAY(String), nullable=True)  
-    CVT = Column(ARRAY(String), nullable=True)  
\ No newline at end of file
+    CVT = Column(ARRAY(String), nullable=True)  
+
+# 스케줄러 실행 상태 (체크포인트)
+class TB_RUN_STATE(Base):
+    __tablename__ = "TB_RUN_STATE"
+    __table_args__ = (Index("IX_TB_RUN_STATE_TARGET", "JOB", "BSNS_YEAR", "REPRT_CODE", "FS_DIV", "BAS_DD"),)
+    RUN_ID = Column(Text, primary_key=True)
+    JOB = Column(Text, nullable=False)
+    BSNS_YEAR = Column(Text, nullable=True)
+    REPRT_CODE = Column(Text, nullable=True)
+    FS_DIV = Column(Text, nullable=True)
+    # 일 단위 대상 (조회 기간이 당일로 고정된 스케줄러)
+    BAS_DD = Column(Date, nullable=True)
+    # RUNNING / COMPLETE / FAILED
+    STATUS = Column(Text, nullable=False)
+    LAST_CORP_CODE = Column(Text, nullable=True)
+    TOTAL = Column(Integer, nullable=True)
+    STARTED_AT = Column(DateTime, server_default=func.now())
+    UPDATED_AT = Column(DateTime, server_default=func.now())
+    items = relationship("TB_RUN_STATE_ITEM", back_populates="run")
+
+# 스케줄러 실행 상태 (기업별, 기업 내 여러 건이면 ITEM_KEY로 구분)
+class TB_RUN_STATE_ITEM(Base):
+    __tablename__ = "TB_RUN_STATE_ITEM"
+    __table_args__ = (
+        UniqueConstraint("RUN_ID", "CORP_CODE", "ITEM_KEY", name="UQ_TB_RUN_STATE_ITEM_RUN_ID_CORP_CODE_ITEM_KEY"),
+    )
+    ID = Column(Integer, primary_key=True)
+    RUN_ID = Column(Text, ForeignKey("TB_RUN_STATE.RUN_ID"), nullable=False)
+    CORP_CODE = Column(Text, nullable=False)
+    # 기업 내 처리 건 구분 (예: 재무제표 "BSNS_YEAR:REPRT_CODE"), 기업 단위 스케줄러는 ''
+    ITEM_KEY = Column(Text, nullable=False, default="", server_default="")
+    # SUCCESS / NO_DATA / SKIP / FAIL
+    STATUS = Column(Text, nullable=False)
+    MESSAGE = Column(Text, nullable=True)
+    UPDATED_AT = Column(DateTime, server_default=func.now())
+    run = relationship("TB_RUN_STATE", back_populates="items")
@@ -0,0 +1,70 @@
+import os
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from Logger import logger
+
+"""
+    * DB 세션/커넥션 풀 설정
+        - 풀 설정은 환경변수로 조정 (스케줄러 동시 실행 시 Postgres max_connections 초과 방지)
+            DB_POOL_SIZE(5), DB_MAX_OVERFLOW(5), DB_POOL_TIMEOUT(30초), DB_POOL_RECYCLE(1800초),
+            DB_POOL_PRE_PING(true), DB_QUERY_CACHE_SIZE(500, SQLAlchemy 컴파일 캐시)
+        - DB_PGBOUNCER=true : pgbouncer(transaction 모드) 뒤에서 실행 → 애플리케이션 풀 없이(NullPool) 연결 관리를 pgbouncer에 위임
+        - make_session_factory : 위 설정으로 엔진/세션 팩토리 생성 (setting.database_orm의 SessionLocal 생성에 사용)
+        - unit_of_work : 실행(run) 단위 세션 1개를 열어 파이프라인 전체에 전달 → 기업/건별 세션 생성 제거
+"""
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "y")
+
+
+def engine_options() -> dict:
+    """환경변수 기반 create_engine 옵션"""
+    options = {
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+        "query_cache_size": int(os.getenv("DB_QUERY_CACHE_SIZE", "500")),
+    }
+    if _env_bool("DB_PGBOUNCER", False):
+        options["poolclass"] = NullPool
+        return options
+
+    options.update(
+        pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "5")),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    )
+    return options
+
+
+def make_session_factory(url: str, **overrides) -> sessionmaker:
+    """엔진 생성 후 세션 팩토리 반환 (overrides로 개별 옵션 덮어쓰기)"""
+    engine = create_engine(url, **{**engine_options(), **overrides})
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+@contextmanager
+def unit_of_work(session_factory: Optional[Callable[[], Session]] = None) -> Iterator[Session]:
+    """
+    실행 단위 세션 : 정상 종료 시 커밋, 예외 시 롤백 후 재발생, 종료 시 커넥션 반환
+    - session_factory 미지정 시 setting.database_orm.SessionLocal 사용
+    """
+    if session_factory is None:
+        from setting.database_orm import SessionLocal
+        session_factory = SessionLocal
+
+    session = session_factory()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        logger.error("[DB] -----> unit_of_work 롤백", exc_info=True)
+        raise
+    finally:
+        session.close()
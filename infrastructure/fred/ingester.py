@@ -0,0 +1,212 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from sqlalchemy import func
+from urllib3.util.retry import Retry
+
+from infrastructure.queryFactory.base_orm import BaseQueryFactory
+from db.public.models import TB_TREASURY_SECURITY, TB_PCE_INFLATION, TB_MACROECONOMIC_GDP
+from error.fred.errors import FRED_ERROR_MESSAGES
+from Logger import logger
+
+"""
+    * FRED 공통 수집기 (시리즈 → 테이블 매핑 기반)
+        - 시리즈별 DB 최신 DATE(워터마크) 다음 날을 observation_start로 전달 → 신규 관측치만 전송받음
+        - 여러 시리즈를 커넥션 풀/재시도가 설정된 requests.Session 1개로 동시에 요청 (DB 작업은 호출 스레드에서만 수행)
+        - 관측치는 DataFrame으로 변환 후 insert_frame으로 일괄 삽입 ('.' 값은 NULL)
+        - 새 거시 시리즈 추가 : FRED_SERIES에 FredSeries 1건 추가
+        - 빈티지 모드(vintage=True) : 개정되는 시리즈(PCE, GDPNow)는 관측치별 REALTIME_START를 함께 저장
+          → 최근 lookback_days 구간 + 마지막 저장 빈티지 이후 발표분만 1회 요청, 저장 빈티지와 집합 비교 후 새 빈티지만 삽입
+"""
+
+BASE_URL = "https://api.stlouisfed.org/fred/series/observations"
+DEFAULT_WORKERS = int(os.getenv("FRED_FETCH_WORKERS", "4"))
+REALTIME_END = "9999-12-31"
+
+
+def add_is_friday(df: pd.DataFrame) -> pd.DataFrame:
+    """금요일 여부 컬럼 추가 (월(0)~일(6), 4=금)"""
+    df["IS_FRIDAY"] = df["DATE"].dt.weekday == 4
+    return df
+
+
+@dataclass(frozen=True)
+class FredSeries:
+    series_id: str
+    model: type
+    tag: str = "FRED"
+    # DATE/VALUE 외 파생 컬럼 (DataFrame → DataFrame)
+    derive: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None
+    # 개정 추적(ALFRED 빈티지) : 관측치를 REALTIME_START와 함께 저장, 최근 lookback_days 구간의 개정분 재요청
+    vintage: bool = False
+    lookback_days: int = 0
+
+
+FRED_SERIES: Dict[str, FredSeries] = {
+    "DGS10": FredSeries("DGS10", TB_TREASURY_SECURITY, tag="FRED", derive=add_is_friday),
+    "PCETRIM12M159SFRBDAL": FredSeries("PCETRIM12M159SFRBDAL", TB_PCE_INFLATION, tag="FRED:PCE", vintage=True, lookback_days=730),
+    "GDPNOW": FredSeries("GDPNOW", TB_MACROECONOMIC_GDP, tag="FRED:GDPNOW", vintage=True, lookback_days=180),
+}
+
+
+class FredApiError(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+    def __str__(self):
+        return f"FredApiError: {self.message}"
+
+
+class FredIngester:
+    def __init__(self, api_key: str, series: List[FredSeries], max_workers: int = DEFAULT_WORKERS,
+                 timeout: float = 30.0, retries: int = 3):
+        self.api_key = api_key
+        self.series = series
+        self.max_workers = max(1, min(max_workers, len(series) or 1))
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        self.session.close()
+
+    @staticmethod
+    def watermark(conn, spec: FredSeries) -> Optional[date]:
+        """시리즈 테이블의 최신 DATE (비어 있으면 None)"""
+        return conn.query(func.max(spec.model.DATE)).scalar()
+
+    @staticmethod
+    def vintage_watermark(conn, spec: FredSeries) -> Optional[date]:
+        """저장된 최신 REALTIME_START (빈티지 미적재 시 None)"""
+        return conn.query(func.max(spec.model.REALTIME_START)).scalar()
+
+    def request_params(self, conn, spec: FredSeries) -> dict:
+        """
+        시리즈별 요청 범위
+        - 일반 : observation_start = 최신 DATE 다음 날
+        - 빈티지 : observation_start = 최신 DATE - lookback_days (개정 대상 구간),
+                   realtime_start = 저장된 최신 REALTIME_START ~ realtime_end = 9999-12-31 (이후 발표된 빈티지만)
+        """
+        latest = self.watermark(conn, spec)
+        logger.info(f"[{spec.tag}] {spec.series_id} DB 최신 DATE: {latest}")
+        if not spec.vintage:
+            return {"observation_start": latest + timedelta(days=1)} if latest else {}
+
+        params = {}
+        if latest:
+            params["observation_start"] = latest - timedelta(days=spec.lookback_days)
+        realtime = self.vintage_watermark(conn, spec)
+        if realtime:
+            params["realtime_start"] = realtime
+            params["realtime_end"] = REALTIME_END
+        return params
+
+    def fetch(self, spec: FredSeries, **window) -> list:
+        params = {
+            "api_key": self.api_key,
+            "series_id": spec.series_id,
+            "file_type": "json",
+            "sort_order": "asc",
+        }
+        for key, value in window.items():
+            params[key] = value.strftime("%Y-%m-%d") if isinstance(value, date) else value
+
+        resp = self.session.get(BASE_URL, params=params, timeout=self.timeout)
+        if resp.status_code != 200:
+            msg = FRED_ERROR_MESSAGES.get(str(resp.status_code), "Unknown error")
+            raise FredApiError(f"HTTP {resp.status_code} ({msg}) (series_id={spec.series_id})")
+        try:
+            return resp.json().get("observations", [])
+        except ValueError:
+            raise FredApiError(f"JSON 파싱 실패 (series_id={spec.series_id})")
+
+    @staticmethod
+    def to_frame(spec: FredSeries, observations: list, observation_start: Optional[date] = None) -> pd.DataFrame:
+        """관측치 → DATE/VALUE(+빈티지 REALTIME_START, 파생 컬럼) DataFrame, 요청 범위 이전 날짜는 제외"""
+        df = pd.DataFrame(observations, columns=["date", "value", "realtime_start"])
+        out = pd.DataFrame({
+            "DATE": pd.to_datetime(df["date"], format="%Y-%m-%d", errors="coerce"),
+            "VALUE": df["value"].where(~df["value"].isin([".", ""]), None),
+        })
+        if spec.vintage:
+            out["REALTIME_START"] = pd.to_datetime(df["realtime_start"], format="%Y-%m-%d", errors="coerce")
+        out = out.dropna(subset=["DATE"])
+        if observation_start:
+            out = out.loc[out["DATE"].dt.date >= observation_start]
+        if spec.derive and not out.empty:
+            out = spec.derive(out.copy())
+        return out.reset_index(drop=True)
+
+    @staticmethod
+    def new_vintages(factory: BaseQueryFactory, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        요청 구간의 저장 빈티지를 1회 조회하여 집합 비교 → 값이 바뀐 빈티지만 반환
+        - 날짜별 최신 저장 값(REALTIME_START 없이 적재된 기존 행은 가장 오래된 빈티지로 취급) 뒤에 수신 빈티지를 시점순으로 이어 붙임
+        - 같은 날짜의 직전 값과 VALUE가 다른 수신 행만 새 빈티지로 판단
+          (realtime_start가 요청 시작일로 잘려 다시 내려오는 기존 값, 이미 저장된 빈티지는 제외됨)
+        """
+        def _keys(frame: pd.DataFrame) -> pd.DataFrame:
+            return pd.DataFrame({
+                "DATE": pd.to_datetime(frame["DATE"]).dt.strftime("%Y-%m-%d"),
+                "REALTIME_START": pd.to_datetime(frame["REALTIME_START"]).dt.strftime("%Y-%m-%d"),
+                "VALUE": frame["VALUE"].astype(object).where(frame["VALUE"].notna(), "").astype(str),
+            }, index=frame.index)
+
+        dates = df["DATE"].dt.date
+        stored = _keys(factory.find_key_frame(
+            ["DATE", "REALTIME_START", "VALUE"], date_column="DATE", date_from=dates.min(), date_to=dates.max()
+        ))
+        latest = (
+            stored.sort_values(["DATE", "REALTIME_START"], na_position="first", kind="stable")
+            .groupby("DATE", as_index=False)
+            .last()
+            .assign(_ROW=-1)
+        )
+        incoming = _keys(df).assign(_ROW=range(len(df)))
+
+        combined = pd.concat([latest, incoming], ignore_index=True).sort_values(
+            ["DATE", "REALTIME_START", "_ROW"], na_position="first", kind="stable"
+        )
+        previous = combined.groupby("DATE")["VALUE"].shift()
+        changed = combined.loc[(combined["_ROW"] >= 0) & (combined["VALUE"] != previous), "_ROW"]
+        return df.iloc[sorted(changed)].reset_index(drop=True)
+
+    def run(self, conn) -> Dict[str, int]:
+        """시리즈별 요청 범위 계산 → 동시 요청 → 시리즈별 일괄 삽입, {series_id: 삽입 건수} 반환"""
+        windows = {spec.series_id: self.request_params(conn, spec) for spec in self.series}
+
+        inserted = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [(spec, executor.submit(self.fetch, spec, **windows[spec.series_id])) for spec in self.series]
+            for spec, future in futures:
+                try:
+                    window = windows[spec.series_id]
+                    df = self.to_frame(spec, future.result(), window.get("observation_start"))
+                    factory = BaseQueryFactory(conn, spec.model)
+                    if spec.vintage and not df.empty:
+                        df = self.new_vintages(factory, df)
+                    if df.empty:
+                        logger.info(f"[{spec.tag}] 신규 데이터 없음 (series_id={spec.series_id})")
+                        inserted[spec.series_id] = 0
+                        continue
+                    columns = {col: col for col in df.columns}
+                    date_columns = ["DATE", "REALTIME_START"] if spec.vintage else ["DATE"]
+                    inserted[spec.series_id] = factory.insert_frame(df, columns, date_columns=date_columns)
+                    logger.info(f"[{spec.tag}] 삽입 완료 (series_id={spec.series_id}, 건수: {inserted[spec.series_id]})")
+                except Exception as e:
+                    logger.error(f"[{spec.tag}] 시리즈 처리 실패: {spec.series_id} / {e}", exc_info=True)
+        return inserted
@@ -0,0 +1,141 @@
+import os
+import queue
+import threading
+from typing import Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
+
+from Logger import logger
+
+"""
+    * KIND 셀레니움 공용 브라우저 풀
+        - 스케줄러마다 크롬을 새로 띄우지 않고, 미리 기동한(pre-warmed) 드라이버를 빌려주고 반납받아 재사용
+        - 드라이버별 페이지 이동 수가 max_pages에 도달하면 종료 후 새 드라이버로 교체(recycle)
+        - 고정 --remote-debugging-port를 사용하지 않으므로 여러 KIND 작업을 동시에 실행 가능
+        - 풀 크기/재활용 기준은 KIND_BROWSER_POOL_SIZE / KIND_BROWSER_MAX_PAGES 환경변수로 조정
+"""
+
+DEFAULT_POOL_SIZE = int(os.getenv("KIND_BROWSER_POOL_SIZE", "3"))
+DEFAULT_MAX_PAGES = int(os.getenv("KIND_BROWSER_MAX_PAGES", "200"))
+BLANK_PAGE = "about:blank"
+
+
+def chrome_options() -> Options:
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    return options
+
+
+class PooledBrowser:
+    """풀에서 빌린 드라이버 (driver/wait는 기존 스케줄러 속성과 동일하게 사용)"""
+
+    def __init__(self, pool: "BrowserPool", driver, wait_sec: int = 20):
+        self.pool = pool
+        self.driver = driver
+        self.wait = WebDriverWait(driver, wait_sec)
+        self.pages = 0
+
+    def count_page(self, n: int = 1) -> None:
+        self.pages += n
+
+    def release(self) -> None:
+        self.pool.release(self)
+
+
+class BrowserPool:
+    def __init__(self, size: int = DEFAULT_POOL_SIZE, max_pages: int = DEFAULT_MAX_PAGES, warm: int = 1):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self._idle: "queue.LifoQueue[PooledBrowser]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._created = 0
+        for _ in range(min(warm, self.size)):
+            self._idle.put(self._new_browser())
+
+    def _new_browser(self) -> PooledBrowser:
+        with self._lock:
+            self._created += 1
+        logger.info(f"[KIND : 브라우저 풀] -----> 크롬 기동 (누적 {self._created}개)")
+        return PooledBrowser(self, webdriver.Chrome(options=chrome_options()))
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledBrowser:
+        """유휴 드라이버 반환 (없으면 새로 기동, 풀 크기 초과 시 반납될 때까지 대기)"""
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("KIND 브라우저 풀 대기 시간 초과")
+        try:
+            browser = self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                return self._new_browser()
+            except Exception:
+                self._slots.release()
+                raise
+        if not self._is_alive(browser):
+            self._quit(browser)
+            try:
+                return self._new_browser()
+            except Exception:
+                self._slots.release()
+                raise
+        return browser
+
+    def release(self, browser: PooledBrowser) -> None:
+        """반납: 작업 중 열린 창 정리 후 재사용, 페이지 수 초과/오류 시 종료"""
+        try:
+            if browser.pages >= self.max_pages:
+                logger.info(f"[KIND : 브라우저 풀] -----> 페이지 {browser.pages}회 사용, 드라이버 교체")
+                self._quit(browser)
+                return
+            handles = browser.driver.window_handles
+            for handle in handles[1:]:
+                browser.driver.switch_to.window(handle)
+                browser.driver.close()
+            browser.driver.switch_to.window(handles[0])
+            browser.driver.get(BLANK_PAGE)
+            self._idle.put(browser)
+        except Exception as e:
+            logger.warn(f"[KIND : 브라우저 풀] -----> 드라이버 정리 실패, 폐기 : {e}")
+            self._quit(browser)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    @staticmethod
+    def _is_alive(browser: PooledBrowser) -> bool:
+        try:
+            browser.driver.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(browser: PooledBrowser) -> None:
+        try:
+            browser.driver.quit()
+        except Exception:
+            pass
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """프로세스 공용 브라우저 풀 (최초 호출 시 생성)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+        return _pool
@@ -0,0 +1,261 @@
+import re
+import datetime
+from typing import Dict, Iterator, List, Optional
+
+import lxml.html
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from Logger import logger
+
+"""
+    * KIND HTTP 스크래퍼 (헤드리스 크롬 대체)
+        - KIND 목록 화면은 검색 폼 POST(…Sub 메서드)에 대한 서버 렌더링 HTML → 폼을 직접 전송
+        - 커넥션 풀/재시도가 설정된 requests.Session 1개를 재사용
+        - 결과 표는 lxml로 파싱, pageIndex로 페이지 이동 (전체 페이지 수는 첫 응답에서 확인)
+        - 목록 표를 찾지 못하는 등 응답 구조가 다르면 KindHttpError → 각 스케줄러는 셀레니움으로 대체 수집
+        - 첫 페이지 0건, 페이지 표시('n / N')와 요청 pageIndex 불일치, 마지막 전 페이지의 행 수 부족도
+          폼 파라미터가 무시된 것으로 보고 KindHttpError (빈 결과를 정상 수집으로 오인하지 않도록)
+        - 실험적 기능 : KIND_FORMS의 요청 경로/메서드/파라미터명은 실제 KIND 응답으로 검증되지 않음
+          → 스케줄러 기본값은 셀레니움(use_http=False), HTTP 경로는 명시적으로 켤 때만 사용
+          (tests/kind/fixtures는 목록 화면 구조를 본뜬 수작성 HTML로, 파서 동작만 검증)
+"""
+
+BASE_URL = "https://kind.krx.co.kr"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+# table.list.type-00 (cssselect 의존성 없이 XPath로 표현)
+TABLE_XPATH = (
+    "//table[contains(concat(' ', normalize-space(@class), ' '), ' list ')"
+    " and contains(concat(' ', normalize-space(@class), ' '), ' type-00 ')]"
+)
+PAGE_INFO_XPATH = "//*[contains(@class, 'info') and contains(@class, 'type-00')]"
+PAGE_SIZE = 100
+
+# 스케줄러별 검색 폼 (path: 요청 경로, method: 목록 조회 메서드, date_keys: 시작/종료일 파라미터명)
+KIND_FORMS: Dict[str, dict] = {
+    "TB_DELISTING": {
+        "path": "/investwarn/delcompany.do",
+        "method": "searchDelCompanySub",
+        "date_keys": ("fromDate", "toDate"),
+    },
+    "TB_INVESTMENT_WARNING": {
+        "path": "/investwarn/investattentwarnrisky.do",
+        "method": "investattentwarnriskySub",
+        "date_keys": ("startDate", "endDate"),
+    },
+    "TB_EMBEZZLEMENT": {
+        "path": "/investwarn/investattentEmbezzlement.do",
+        "method": "searchInvestAttentEmbezzlementSub",
+        "date_keys": ("fromDate", "toDate"),
+    },
+    "TB_UNFAITHFUL_DISCLOSURE": {
+        "path": "/investwarn/undisclosure.do",
+        "method": "searchUnfaithfulDisclosureCorpSub",
+        "date_keys": None,
+    },
+    "TB_INVESTMENT_ATTENTION": {
+        "path": "/investwarn/hwangiissue.do",
+        "method": "searchHwangiIssueSub",
+        "date_keys": None,
+    },
+    "TB_MANAGEMENT": {
+        "path": "/investwarn/adminissue.do",
+        "method": "searchAdminIssueSub",
+        "date_keys": None,
+    },
+}
+
+# 투자주의/경고/위험 탭 → menuIndex
+WARNING_MENU_INDEX = {"주의": "1", "경고": "2", "위험": "3"}
+
+PAGE_INFO_RE = re.compile(r"(\d+)\s*/\s*(\d+)")
+PAGE_GO_RE = re.compile(r"fnPageGo\(\s*'?(\d+)'?\s*\)")
+ISUR_CD_RE = re.compile(r"companysummary_open\(\s*'([^']+)'")
+
+
+class KindHttpError(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+    def __str__(self):
+        return f"KindHttpError: {self.message}"
+
+
+def to_form_date(value) -> str:
+    """'20250101' / date / datetime → KIND 폼 날짜 형식('2025-01-01')"""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.strftime("%Y-%m-%d")
+    digits = re.sub(r"\D", "", str(value or ""))
+    if len(digits) == 8:
+        return f"{digits[:4]}-{digits[4:6]}-{digits[6:]}"
+    return str(value or "")
+
+
+def cell_text(td) -> str:
+    return re.sub(r"\s+", " ", td.text_content() or "").strip()
+
+
+def cell_link(td):
+    """셀 내 첫 번째 <a> (없으면 None)"""
+    links = td.xpath(".//a")
+    return links[0] if links else None
+
+
+def link_isur_cd(link) -> Optional[str]:
+    """기업명 링크의 companysummary_open('xxxxx') 인자 (KIND 회사코드)"""
+    if link is None:
+        return None
+    match = ISUR_CD_RE.search((link.get("onclick") or "") + " " + (link.get("href") or ""))
+    return match.group(1) if match else None
+
+
+def parse_rows(html_text: str, table_xpath: str = TABLE_XPATH) -> List[list]:
+    """목록 표의 데이터 행 → td 엘리먼트 리스트 (표 자체가 없으면 KindHttpError)"""
+    root = lxml.html.fromstring(html_text)
+    tables = root.xpath(table_xpath)
+    if not tables:
+        raise KindHttpError("목록 표를 찾을 수 없습니다.")
+    rows = []
+    for tr in tables[0].xpath(".//tr[td]"):
+        tds = tr.xpath("./td")
+        # '조회된 결과값이 없습니다' 단일 셀 행 제외
+        if len(tds) <= 1:
+            continue
+        rows.append(tds)
+    return rows
+
+
+def total_pages(html_text: str) -> int:
+    """페이지 정보('1 / 5') 또는 페이지 링크(fnPageGo)에서 전체 페이지 수 추출"""
+    root = lxml.html.fromstring(html_text)
+    for info in root.xpath(PAGE_INFO_XPATH):
+        match = PAGE_INFO_RE.search(info.text_content())
+        if match:
+            return max(1, int(match.group(2)))
+    pages = [int(p) for p in PAGE_GO_RE.findall(html_text)]
+    return max(pages) if pages else 1
+
+
+def current_page(html_text: str) -> Optional[int]:
+    """페이지 정보('1 / 5')의 현재 페이지 (표시가 없으면 None)"""
+    root = lxml.html.fromstring(html_text)
+    for info in root.xpath(PAGE_INFO_XPATH):
+        match = PAGE_INFO_RE.search(info.text_content())
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def check_page(html_text: str, rows: List[list], page: int, pages: int) -> None:
+    """
+    응답이 요청한 페이지인지 검증 (불일치 시 KindHttpError)
+    - 0건 페이지 : 첫 페이지면 폼 파라미터 오류 가능성, 이후 페이지면 전체 페이지 수 오판
+    - 페이지 표시와 pageIndex 불일치 : pageIndex 무시 (같은 페이지 반복 수집 방지)
+    - 마지막 전 페이지가 PAGE_SIZE 미만 : currentPageSize 무시 (누락 방지)
+    """
+    if not rows:
+        raise KindHttpError(f"{page}/{pages} 페이지 결과 0건")
+    marker = current_page(html_text)
+    if marker is not None and marker != page:
+        raise KindHttpError(f"페이지 표시 불일치 (요청={page}, 응답={marker})")
+    if page < pages and len(rows) < PAGE_SIZE:
+        raise KindHttpError(f"{page}/{pages} 페이지 행 수 부족 ({len(rows)} < {PAGE_SIZE})")
+
+
+class KindHttpClient:
+    def __init__(self, timeout: float = 20.0, retries: int = 3, pool_size: int = 4):
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Referer": BASE_URL,
+            "X-Requested-With": "XMLHttpRequest",
+        })
+
+    def close(self) -> None:
+        self.session.close()
+
+    def build_form(self, job: str, from_date=None, to_date=None, **extra) -> dict:
+        spec = KIND_FORMS[job]
+        form = {
+            "method": spec["method"],
+            "currentPageSize": str(PAGE_SIZE),
+            "pageIndex": "1",
+            "orderMode": "0",
+            "orderStat": "D",
+            "forward": spec["method"].lower(),
+        }
+        if spec["date_keys"] and (from_date or to_date):
+            from_key, to_key = spec["date_keys"]
+            form[from_key] = to_form_date(from_date)
+            form[to_key] = to_form_date(to_date)
+        form.update({k: str(v) for k, v in extra.items()})
+        return form
+
+    def post(self, job: str, form: dict) -> str:
+        url = BASE_URL + KIND_FORMS[job]["path"]
+        try:
+            resp = self.session.post(url, data=form, timeout=self.timeout)
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            raise KindHttpError(f"{job} 요청 실패: {e}")
+        resp.encoding = resp.encoding or "utf-8"
+        return resp.text
+
+    def iter_pages(self, job: str, form: dict, max_pages: Optional[int] = None) -> Iterator[List[list]]:
+        """
+        첫 페이지 응답에서 전체 페이지 수를 읽고 pageIndex를 증가시키며 페이지별 행 반환
+        - 페이지마다 check_page로 검증 → 실패 시 KindHttpError (호출 측은 수집분을 버리고 셀레니움으로 대체)
+        """
+        form = dict(form, pageIndex="1")
+        html_text = self.post(job, form)
+        pages = total_pages(html_text)
+        rows = parse_rows(html_text)
+        check_page(html_text, rows, 1, pages)
+        if max_pages:
+            pages = min(pages, max_pages)
+        yield rows
+        for page in range(2, pages + 1):
+            form["pageIndex"] = str(page)
+            html_text = self.post(job, form)
+            rows = parse_rows(html_text)
+            check_page(html_text, rows, page, pages)
+            yield rows
+
+    def fetch_stock_code(self, isur_cd: Optional[str]) -> Optional[str]:
+        """기업 개요 화면(HTTP)에서 종목코드 조회 (팝업 대체)"""
+        if not isur_cd:
+            return None
+        try:
+            resp = self.session.get(
+                BASE_URL + "/common/companysummary.do",
+                params={"method": "searchCompanySummary", "strIsurCd": isur_cd},
+                timeout=self.timeout,
+            )
+            resp.raise_for_status()
+            root = lxml.html.fromstring(resp.text)
+            cells = root.xpath("//th[contains(text(), '종목코드')]/following-sibling::td[1]")
+            return cell_text(cells[0]) if cells else None
+        except Exception as e:
+            logger.warn(f"[KIND : HTTP] -----> 종목코드 조회 실패 (회사코드={isur_cd}) : {e}")
+            return None
+
+    def resolve_stock_code(self, resolver, corp_name: str, link) -> Optional[str]:
+        """TB_COMPANY 인덱스 → (미스) 기업 개요 HTTP 조회 순으로 종목코드 해석"""
+        stock_code = resolver.lookup(corp_name)
+        if stock_code:
+            return stock_code
+        stock_code = self.fetch_stock_code(link_isur_cd(link))
+        resolver.remember(corp_name, stock_code)
+        return stock_code
@@ -0,0 +1,128 @@
+from typing import Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from infrastructure.kind.http_client import PAGE_INFO_RE, PAGE_GO_RE
+
+"""
+    * KIND 셀레니움 페이지 이동 헬퍼 (고정 sleep 대체)
+        - 페이지 로드: document.readyState == 'complete' + 목록 표 존재 확인
+        - 검색/탭/다음 페이지: 클릭 전 목록 표를 잡아두고 staleness(교체) → 새 표 행 존재까지 대기
+        - AJAX 교체가 없는 경우(결과 동일 등)를 대비해 페이지 번호 표시 변경도 함께 확인
+        - 검색/탭 클릭의 교체 확인과 행 존재 확인은 짧은 대기(refresh_timeout) → 동일 결과 재렌더링·결과 없음에서 멈추지 않음
+          (행 또는 '조회된 결과값이 없습니다' 셀이 나타나면 즉시 반환)
+        - 페이지 이동은 반드시 표가 교체되어야 하므로 전체 timeout으로 대기하고 시간 초과 시 예외 (이전 페이지 재수집 방지)
+        - 팝업 창은 클릭 전 핸들 집합과의 차집합으로 식별 (window_handles 순서는 보장되지 않음)
+        - 전체 페이지 수를 검색 직후 1회 읽어 정확한 횟수만큼만 이동 (이전 페이지 데이터 비교 불필요)
+"""
+
+TABLE_LOCATOR = (By.CSS_SELECTOR, "table.list.type-00")
+ROW_LOCATOR = (By.CSS_SELECTOR, "table.list.type-00 tbody tr")
+PAGE_INFO_LOCATOR = (By.CSS_SELECTOR, ".info.type-00")
+NO_RESULT_LOCATOR = (By.XPATH, "//table[contains(@class, 'list')]//td[contains(normalize-space(.), '조회된 결과값이 없습니다')]")
+
+
+class KindNavigator:
+    def __init__(self, driver, wait: Optional[WebDriverWait] = None, timeout: int = 20,
+                 table_locator=TABLE_LOCATOR, row_locator=ROW_LOCATOR, refresh_timeout: float = 3):
+        self.driver = driver
+        self.wait = wait or WebDriverWait(driver, timeout)
+        # 교체 확인/행 존재처럼 조건이 끝내 충족되지 않을 수 있는 대기용
+        self.short_wait = WebDriverWait(driver, refresh_timeout)
+        self.table_locator = table_locator
+        self.row_locator = row_locator
+
+    def wait_ready(self) -> None:
+        """문서 로드 완료(readyState) 대기"""
+        self.wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+
+    def open(self, url: str, wait_table: bool = False) -> None:
+        """페이지 이동 후 로드 완료(필요 시 목록 표 존재)까지 대기"""
+        self.driver.get(url)
+        self.wait_ready()
+        if wait_table:
+            self.wait.until(EC.presence_of_element_located(self.table_locator))
+
+    def _current_table(self):
+        found = self.driver.find_elements(*self.table_locator)
+        return found[0] if found else None
+
+    def page_marker(self) -> str:
+        """페이지 번호 표시 텍스트 (목록 교체 여부 보조 판단)"""
+        found = self.driver.find_elements(*PAGE_INFO_LOCATOR)
+        return found[0].text if found else ""
+
+    def wait_refresh(self, old_table, old_marker: str, strict: bool = False) -> None:
+        """
+        이전 목록 표가 교체(stale)되거나 페이지 표시가 바뀔 때까지 대기 → 새 행 존재 확인
+        - strict=False : 짧게 대기 후 교체가 없으면 현재 표 사용 (검색/탭 클릭은 동일 결과 재렌더링이 정상)
+        - strict=True : 전체 timeout 대기, 교체되지 않으면 TimeoutException (페이지 이동)
+        """
+        def refreshed(driver):
+            if old_table is None:
+                return True
+            try:
+                old_table.is_enabled()
+            except Exception:
+                return True  # StaleElementReference: 표가 교체됨
+            return self.page_marker() != old_marker
+
+        if strict:
+            self.wait.until(refreshed)
+        else:
+            try:
+                self.short_wait.until(refreshed)
+            except TimeoutException:
+                # 동일 결과로 재렌더링되지 않은 경우: 현재 표를 그대로 사용
+                pass
+        self.wait_ready()
+        self.wait.until(EC.presence_of_element_located(self.table_locator))
+
+    def click_and_wait(self, element) -> None:
+        """JS 클릭 후 목록 표 교체까지 대기"""
+        old_table, old_marker = self._current_table(), self.page_marker()
+        self.driver.execute_script("arguments[0].click();", element)
+        self.wait_refresh(old_table, old_marker)
+
+    def click_locator_and_wait(self, locator) -> None:
+        element = self.wait.until(EC.element_to_be_clickable(locator))
+        self.click_and_wait(element)
+
+    def total_pages(self) -> int:
+        """'1 / 5' 페이지 표시 또는 fnPageGo 링크에서 전체 페이지 수 (확인 불가 시 1)"""
+        match = PAGE_INFO_RE.search(self.page_marker())
+        if match:
+            return max(1, int(match.group(2)))
+        pages = [int(p) for p in PAGE_GO_RE.findall(self.driver.page_source)]
+        return max(pages) if pages else 1
+
+    def go_to_page(self, page: int) -> None:
+        """fnPageGo(page) 호출 후 목록 교체까지 대기 (교체되지 않으면 TimeoutException)"""
+        old_table, old_marker = self._current_table(), self.page_marker()
+        self.driver.execute_script(f"fnPageGo('{page}')")
+        self.wait_refresh(old_table, old_marker, strict=True)
+
+    def rows(self):
+        """현재 목록 표의 행 (결과 없음 등으로 행이 없으면 빈 리스트)"""
+        def loaded(driver):
+            # 행 또는 결과 없음 셀 중 먼저 나타나는 쪽에서 종료
+            return driver.find_elements(*self.row_locator) or driver.find_elements(*NO_RESULT_LOCATOR)
+
+        try:
+            self.short_wait.until(loaded)
+        except TimeoutException:
+            return []
+        return self.driver.find_elements(*self.row_locator)
+
+    def wait_new_window(self, handles_before: set):
+        """팝업 창이 열릴 때까지 대기 후 새 창 핸들 반환 (handles_before: 클릭 전 window_handles 집합)"""
+        new_handles = self.wait.until(lambda d: set(d.window_handles) - set(handles_before))
+        return next(iter(new_handles))
+
+    def wait_element_text(self, locator) -> str:
+        """요소가 나타날 때까지 대기 후 텍스트 반환"""
+        return self.wait.until(EC.presence_of_element_located(locator)).text.strip()
+
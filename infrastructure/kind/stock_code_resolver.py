@@ -0,0 +1,92 @@
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Optional
+
+from setting.database_orm import SessionLocal
+from infrastructure.queryFactory.TB_COMPANY.queryFactory import TBCompanyQueryFactory
+from Logger import logger
+
+"""
+    * KIND 크롤러 공통 종목코드 해석기
+        - TB_COMPANY(CORP_NAME, STOCK_CODE)를 프로세스당 1회 메모리에 적재하여 기업명 → 종목코드 매핑
+        - 기업명은 정규화(NFKC, (주)/주식회사/공백 제거, 영문 대문자) 후 비교
+        - 동일 정규화 이름에 종목코드가 여러 개면 활성(IS_ACTIVE) 기업이 1개일 때만 사용, 아니면 미해석 처리
+        - 미해석(캐시 미스) 시에만 크롤러가 팝업으로 종목코드를 조회하고 remember()로 결과를 기록 → 이후 크롤러는 재사용
+"""
+
+NAME_NOISE_RE = re.compile(r"\(주\)|\(유\)|주식회사|\s+")
+
+
+def normalize_corp_name(name: Optional[str]) -> str:
+    if not name:
+        return ""
+    return NAME_NOISE_RE.sub("", unicodedata.normalize("NFKC", name)).upper()
+
+
+class StockCodeResolver:
+    # 프로세스 공용 인덱스/별칭 캐시 (모든 KIND 크롤러가 공유)
+    _index: Optional[Dict[str, str]] = None
+    _aliases: Dict[str, str] = {}
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self._ensure_loaded()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def _ensure_loaded(cls) -> None:
+        with cls._lock:
+            if cls._index is None:
+                cls._index = cls._load_index()
+
+    @classmethod
+    def refresh(cls) -> None:
+        """TB_COMPANY 재적재 (팝업으로 기록한 별칭 캐시는 유지)"""
+        with cls._lock:
+            cls._index = cls._load_index()
+
+    @staticmethod
+    def _load_index() -> Dict[str, str]:
+        try:
+            with SessionLocal() as conn:
+                rows = TBCompanyQueryFactory(conn=conn).stock_code_names() or []
+        except Exception as e:
+            logger.error(f"[KIND : 종목코드] -----> ERROR(TB_COMPANY 적재 실패, 팝업 조회로 대체) : {e}", exc_info=True)
+            return {}
+
+        grouped = defaultdict(dict)
+        for stock_code, corp_name, is_active in rows:
+            key = normalize_corp_name(corp_name)
+            if key and stock_code:
+                grouped[key][stock_code] = bool(is_active)
+
+        index = {}
+        for key, codes in grouped.items():
+            if len(codes) == 1:
+                index[key] = next(iter(codes))
+                continue
+            active = [code for code, is_active in codes.items() if is_active]
+            if len(active) == 1:
+                index[key] = active[0]
+        logger.info(f"[KIND : 종목코드] -----> TB_COMPANY 기업명 인덱스 {len(index):,}건 적재")
+        return index
+
+    def lookup(self, corp_name: Optional[str]) -> Optional[str]:
+        """기업명 → 종목코드 (별칭 캐시 우선, 없으면 None)"""
+        key = normalize_corp_name(corp_name)
+        code = (self._aliases.get(key) or (self._index or {}).get(key)) if key else None
+        if code:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return code
+
+    def remember(self, corp_name: Optional[str], stock_code: Optional[str]) -> None:
+        """팝업으로 확인한 종목코드를 별칭 캐시에 기록"""
+        key = normalize_corp_name(corp_name)
+        if key and stock_code and stock_code != "N/A":
+            with self._lock:
+                self._aliases[key] = stock_code
@@ -0,0 +1,43 @@
+from typing import List
+
+import pandas as pd
+
+"""
+    * TB_KRX 숫자 컬럼 정의 및 수집 시 변환
+        - KRX API는 가격/거래량/시가총액을 '1,234' 형태 문자열로 반환 → 적재 전 콤마 제거 후 숫자로 변환
+        - 정수 컬럼(BIGINT): 가격, 대비, 거래량, 거래대금, 시가총액, 상장주식수
+        - 소수 컬럼(NUMERIC): 등락률
+        - 빈 값/'-' 등 숫자가 아닌 값은 NULL(None)로 저장
+"""
+
+KRX_BIGINT_COLUMNS: List[str] = [
+    "TDD_CLSPRC",
+    "CMPPREVDD_PRC",
+    "TDD_OPNPRC",
+    "TDD_HGPRC",
+    "TDD_LWPRC",
+    "ACC_TRDVOL",
+    "ACC_TRDVAL",
+    "MKTCAP",
+    "LIST_SHRS",
+]
+KRX_NUMERIC_COLUMNS: List[str] = ["FLUC_RT"]
+
+
+def parse_number(series: pd.Series) -> pd.Series:
+    """'1,234' / '-1.5' 문자열 → float (변환 불가 시 NaN)"""
+    text = series.astype(str).str.replace(",", "", regex=False).str.strip()
+    return pd.to_numeric(text, errors="coerce")
+
+
+def parse_krx_numbers(api: pd.DataFrame) -> pd.DataFrame:
+    """KRX 응답 DataFrame의 숫자 컬럼을 DB 타입에 맞게 변환 (None은 NULL로 적재)"""
+    out = api.copy()
+    for col in KRX_BIGINT_COLUMNS + KRX_NUMERIC_COLUMNS:
+        if col not in out.columns:
+            continue
+        values = parse_number(out[col])
+        if col in KRX_BIGINT_COLUMNS:
+            values = values.round().astype("Int64")
+        out[col] = values.astype(object).where(values.notna(), None)
+    return out
@@ -0,0 +1,88 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from Logger import logger
+
+"""
+    * KRX 일별 매매정보 병렬 수집기
+        - (기준일, 시장) 쌍을 제한된 워커 풀로 동시에 요청 (기본 4개, KRX_FETCH_WORKERS 환경변수로 조정)
+        - 커넥션 풀/재시도(429·5xx 백오프)가 설정된 requests.Session 1개를 워커가 공유
+        - 완료되는 순서대로 (기준일, 시장, DataFrame)을 내보내므로 적재기는 전체 수집 완료를 기다리지 않고 바로 저장
+        - 개별 요청 실패는 로그 후 건너뛰고 failed 목록에 기록 (전체 백필 중단 없음)
+"""
+
+KRX_BASE_URLS: Dict[str, str] = {
+    "KOSPI": "http://data-dbg.krx.co.kr/svc/apis/sto/stk_bydd_trd",
+    "KOSDAQ": "http://data-dbg.krx.co.kr/svc/apis/sto/ksq_bydd_trd",
+}
+DEFAULT_WORKERS = int(os.getenv("KRX_FETCH_WORKERS", "4"))
+
+
+def date_range(from_date: str, to_date: str, weekdays_only: bool = True) -> List[str]:
+    """'YYYYMMDD' 범위의 날짜 목록 (주말은 KRX 휴장이므로 기본 제외)"""
+    start = datetime.strptime(from_date, "%Y%m%d")
+    end = datetime.strptime(to_date, "%Y%m%d")
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    return [d.strftime("%Y%m%d") for d in days if not weekdays_only or d.weekday() < 5]
+
+
+class KrxFetcher:
+    def __init__(self, api_key: str, max_workers: int = DEFAULT_WORKERS, timeout: float = 30.0, retries: int = 3):
+        self.api_key = api_key
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=len(KRX_BASE_URLS), pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"AUTH_KEY": api_key})
+        self.failed: List[Tuple[str, str]] = []
+
+    def close(self) -> None:
+        self.session.close()
+
+    def fetch(self, bas_dd: str, market: str) -> pd.DataFrame:
+        """단일 (기준일, 시장) 조회 → 컬럼명 대문자 DataFrame (휴장일 등 데이터 없으면 빈 DataFrame)"""
+        response = self.session.get(KRX_BASE_URLS[market], params={"basDd": bas_dd}, timeout=self.timeout)
+        response.raise_for_status()
+        api = pd.DataFrame(response.json().get("OutBlock_1") or [])
+        if not api.empty:
+            api.columns = api.columns.str.upper()
+        return api
+
+    def iter_frames(self, dates: Iterable[str], markets: Iterable[str] = tuple(KRX_BASE_URLS)) -> Iterator[Tuple[str, str, pd.DataFrame]]:
+        """(기준일, 시장) 쌍을 병렬 요청하고 완료 순서대로 결과 반환 (빈 결과는 제외)"""
+        pairs = [(bas_dd, market) for bas_dd in dates for market in markets]
+        self.failed = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.fetch, bas_dd, market): (bas_dd, market) for bas_dd, market in pairs}
+            try:
+                for future in as_completed(futures):
+                    bas_dd, market = futures[future]
+                    try:
+                        api = future.result()
+                    except Exception as e:
+                        self.failed.append((bas_dd, market))
+                        logger.error(f"[TB_KRX] -----> {bas_dd} {market} 요청 실패 : {e}")
+                        continue
+                    if api.empty:
+                        logger.info(f"[TB_KRX] -----> {bas_dd} {market} 데이터가 없습니다.")
+                        continue
+                    yield bas_dd, market, api
+            finally:
+                # 적재 오류 등으로 소비가 중단되면 대기 중인 요청 취소
+                for future in futures:
+                    future.cancel()
@@ -0,0 +1,61 @@
+from typing import Iterable, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from Logger import logger
+
+"""
+    * TB_KRX 연도별 파티션 관리
+        - TB_KRX는 BAS_DD 기준 RANGE 파티션 테이블 (연도당 1개 파티션 "TB_KRX_YYYY" + DEFAULT 파티션)
+        - 적재 전 대상 연도 파티션이 없으면 생성 → DEFAULT 파티션에 쌓이지 않도록 함
+        - 커버링 인덱스(STOCK_CODE, BAS_DD) INCLUDE (MKTCAP, MKT_NM)는 부모 테이블에 정의되어 새 파티션에 자동 생성
+        - 오래된 연도는 detach_year_partition으로 분리 후 별도 보관/삭제 가능
+"""
+
+TABLE = "TB_KRX"
+
+
+def partition_name(year: int) -> str:
+    return f"{TABLE}_{year}"
+
+
+def existing_partitions(conn: Session, table: str = TABLE) -> List[str]:
+    rows = conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+            "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    ).all()
+    return [row[0] for row in rows]
+
+
+def ensure_year_partitions(conn: Session, years: Iterable[int], table: str = TABLE) -> List[str]:
+    """대상 연도 파티션이 없으면 생성 후 커밋, 새로 만든 파티션명 반환 (table: 부모 테이블, 마이그레이션 중에는 임시 테이블)"""
+    existing = set(existing_partitions(conn, table))
+    created = []
+    for year in sorted(set(years)):
+        name = partition_name(year)
+        if name in existing:
+            continue
+        conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        ))
+        created.append(name)
+    if created:
+        conn.commit()
+        logger.info(f"[TB_KRX : 파티션] -----> 생성 : {', '.join(created)}")
+    return created
+
+
+def detach_year_partition(conn: Session, year: int) -> str:
+    """연도 파티션을 부모 테이블에서 분리 (데이터는 독립 테이블로 남음 → 보관/삭제는 별도 수행)"""
+    name = partition_name(year)
+    conn.execute(text(f'ALTER TABLE "{TABLE}" DETACH PARTITION "{name}"'))
+    conn.commit()
+    logger.info(f"[TB_KRX : 파티션] -----> 분리 : {name}")
+    return name
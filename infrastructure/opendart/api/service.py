@@ -56,7 +56,7 @@ def opendart_company_api(api_key:str, corp_code:str):
     return response.json()
 
 # OPENDART - 부도발생 조회(https://opendart.fss.or.kr/guide/detail.do?apiGrpCd=DS005&apiId=2020019)
-def opendart_bankruptcy_api(api_key:str, corp_code:str):
+def opendart_bankruptcy_api(api_key:str, corp_code:str, timeout:float=30):
     url = "https://opendart.fss.or.kr/api/dfOcr.json"
     params = {
         'crtfc_key': api_key,   # 인증키
@@ -64,7 +64,7 @@ def opendart_bankruptcy_api(api_key:str, corp_code:str):
         'bgn_de': datetime.today().strftime('%Y%m%d'), # 시작일(최초접수일 - 20240501)
         'end_de': datetime.today().strftime('%Y%m%d'), # 종료일(최초접수일 - 20240501)
     }
-    response = requests.get(url, params=params)
+    response = requests.get(url, params=params, timeout=timeout)
     return response.json()
 
 # OPENDART - 공시정보 조회(https://opendart.fss.or.kr/guide/detail.do?apiGrpCd=DS001&apiId=2019001)
@@ -1,10 +1,12 @@
 import json
 import re
+from contextlib import contextmanager
 from typing import List, Optional, Tuple
 
 import pandas as pd
 import re
 from sqlalchemy import literal, cast, String
+from sqlalchemy.orm import Session
 from Logger import logger
 from infrastructure.queryFactory.base_orm import BaseQueryFactory
 from setting.database_orm import SessionLocal
@@ -17,13 +19,16 @@ class FinancialDataProcessor:
         df: pd.DataFrame,
         keyword_map_path: str = "/app/infrastructure/opendart/financial/map/keyword.json",
         sj_map_path: str = "/app/infrastructure/opendart/financial/map/sj_nm.json",
+        session: Optional[Session] = None,
     ):
         """
         df: OpenDART 원본(또는 1차 정제) DataFrame
         keyword_map_path: 표준계정명 ← 후보 계정명 리스트 매핑 파일
         sj_map_path: 표준계정명 ← 허용 SJ_NM 리스트 매핑 파일
+        session: 호출 측 실행 단위 세션 (미지정 시 조회마다 SessionLocal 생성)
         """
         self.df = df.copy()
+        self.session = session
         self.keyword_map_path = keyword_map_path
         self.sj_map_path = sj_map_path
         self.keyword_map = self._load_json(self.keyword_map_path)
@@ -39,6 +44,15 @@ class FinancialDataProcessor:
             kw for kw in self.keyword_map.keys() if kw not in self.full_reports_accounts
         ]
         attach_error_email_handler(logger, service_name='WEB:FINANCIAL_VARIABLE 스케줄러')
+    @contextmanager
+    def _session(self):
+        """주입된 세션 재사용 (닫지 않음), 없으면 임시 세션 생성 후 종료 시 반환"""
+        if self.session is not None:
+            yield self.session
+        else:
+            with SessionLocal() as session:
+                yield session
+
     def _load_json(self, path: str):
         with open(path, "r", encoding="utf-8") as f:
             return json.load(f)
@@ -262,11 +276,9 @@ class FinancialDataProcessor:
         if df.empty:
             return df
 
-        with SessionLocal() as session:
+        with self._session() as session:
             factory = BaseQueryFactory(conn=session, model=TB_COMPANY)
-            columns = factory.get_columns_by_names("CORP_CODE", "CORP_NAME", "STOCK_CODE")
-            rows = session.query(*columns).all()
-            company_df = pd.DataFrame(rows, columns=["CORP_CODE", "CORP_NAME", "STOCK_CODE"])
+            company_df = factory.find_frame("CORP_CODE", "CORP_NAME", "STOCK_CODE")
 
         out = df.copy()
         out["CORP_CODE"] = out["CORP_CODE"].astype(str).str.zfill(8)
@@ -434,7 +446,7 @@ class FinancialDataProcessor:
         codes_s = [str(c) for c in codes]
 
         # DB에서 최소 범위만 로드
-        with SessionLocal() as session:
+        with self._session() as session:
             def fetch_var():
                 model = TB_FINANCIAL_VARIABLE
                 cols = [model.CORP_CODE, model.BSNS_YEAR, model.REPRT_CODE]
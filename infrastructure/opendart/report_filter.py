@@ -0,0 +1,86 @@
+import re
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from db.public.models import TB_COMPANY, TB_DISCLOSURE_INFORMATION
+from Logger import logger
+
+"""
+    * 정기보고서 접수 기반 재무제표 조회 대상 선별
+        - TB_DISCLOSURE_INFORMATION에 접수된 사업/반기/분기보고서의 REPORT_NM "(YYYY.MM)" 기간 + 기업 결산월(ACC_MT)
+          → (BSNS_YEAR, REPRT_CODE) 변환 (choose_report_by_acc_mt와 같은 사업연도 기준: 해당 기간이 속한 회계연도 종료 연도)
+        - 결산월 기준 경과 개월 0 → 11011(사업), 3 → 11013(1분기), 6 → 11012(반기), 9 → 11014(3분기)
+        - 사업보고서는 기간 연도를 그대로 사용, 반기/분기보고서는 결산월과 보고서 종류가 맞지 않으면 제외
+        - 정정 공시([기재정정] 등)도 새 접수번호이므로 대상에 포함
+"""
+
+PERIODIC_REPORTS = ("사업보고서", "반기보고서", "분기보고서")
+REPORT_PERIOD_RE = re.compile(r"(사업|반기|분기)보고서\s*\((\d{4})\.(\d{2})\)")
+REPRT_CODE_BY_ELAPSED = {0: "11011", 3: "11013", 6: "11012", 9: "11014"}
+REPRT_CODES_BY_KIND = {"반기": {"11012"}, "분기": {"11013", "11014"}}
+
+
+def _acc_month(acc_mt) -> int:
+    try:
+        acc = int(str(acc_mt).strip() or 12)
+    except (TypeError, ValueError):
+        return 12
+    return acc if 1 <= acc <= 12 else 12
+
+
+def report_target(report_nm: str, acc_mt) -> Optional[Tuple[str, str]]:
+    """정기보고서명 + 결산월 → (BSNS_YEAR, REPRT_CODE), 해석 불가 시 None"""
+    match = REPORT_PERIOD_RE.search(report_nm or "")
+    if not match:
+        return None
+    kind, year, month = match.group(1), int(match.group(2)), int(match.group(3))
+    if kind == "사업":
+        # 사업보고서 기간 = 회계연도 종료월 → 결산월 정보와 무관
+        return str(year), "11011"
+    acc = _acc_month(acc_mt)
+    reprt_code = REPRT_CODE_BY_ELAPSED.get((month - acc) % 12)
+    if reprt_code not in REPRT_CODES_BY_KIND[kind]:
+        # 결산월(ACC_MT)과 보고서 종류가 맞지 않으면 대상 연도를 확정할 수 없음
+        return None
+    bsns_year = year if month <= acc else year + 1
+    return str(bsns_year), reprt_code
+
+
+def new_report_targets(conn: Session, since: date, loaded: Set[str]) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    since 이후 접수된 정기보고서 중 loaded(적재 완료 RCEPT_NO)에 없는 건 → {CORP_CODE: [(BSNS_YEAR, REPRT_CODE), ...]}
+    """
+    stmt = (
+        select(
+            TB_COMPANY.CORP_CODE,
+            TB_DISCLOSURE_INFORMATION.RCEPT_NO,
+            TB_DISCLOSURE_INFORMATION.REPORT_NM,
+            TB_COMPANY.ACC_MT,
+        )
+        .join(TB_COMPANY, TB_COMPANY.STOCK_CODE == TB_DISCLOSURE_INFORMATION.STOCK_CODE)
+        .where(
+            TB_DISCLOSURE_INFORMATION.RCEPT_DT >= since,
+            or_(*[TB_DISCLOSURE_INFORMATION.REPORT_NM.contains(name) for name in PERIODIC_REPORTS]),
+        )
+        .order_by(TB_DISCLOSURE_INFORMATION.RCEPT_DT)
+    )
+
+    targets: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+    unparsed = 0
+    for corp_code, rcept_no, report_nm, acc_mt in conn.execute(stmt):
+        if rcept_no in loaded:
+            continue
+        target = report_target(report_nm, acc_mt)
+        if target is None:
+            unparsed += 1
+            continue
+        if target not in targets[corp_code]:
+            targets[corp_code].append(target)
+
+    if unparsed:
+        logger.warning(f"[REPORT_FILTER] -----> 보고서 기간 해석 실패 {unparsed}건 (REPORT_NM 형식 확인 필요)")
+    return dict(targets)
@@ -0,0 +1,136 @@
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Tuple, Union
+from uuid import uuid4
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from db.public.models import TB_RUN_STATE, TB_RUN_STATE_ITEM
+from Logger import logger
+
+"""
+    * 기업 단위 OpenDART 스케줄러 체크포인트
+        - 실행(RUN_ID)별 대상(JOB, BSNS_YEAR, REPRT_CODE, FS_DIV, BAS_DD)과 기업별 처리 상태를 TB_RUN_STATE(_ITEM)에 기록
+        - 같은 대상의 직전 실행이 완료되지 않았으면(RUNNING/FAILED) 해당 RUN_ID를 이어받아 완료된 기업을 제외하고 재개
+        - only_failed=True : 직전 실행에서 FAIL로 기록된 기업만 다시 처리
+        - 처리 단위(item)는 기업 코드 또는 (기업 코드, ITEM_KEY) : 한 기업을 여러 건(사업연도/보고서코드 등)으로 나눠
+          요청하는 스케줄러는 ITEM_KEY로 건별 상태를 기록 → 같은 기업의 건끼리 상태를 덮어쓰지 않고,
+          재개 시 완료된 건만 제외(기업 상태 = 건별 상태 중 가장 나쁜 값)
+        - record()는 커밋하지 않고 호출 측 세션에 기록 → 적재 데이터와 같은 트랜잭션으로 커밋됨
+          (데이터 롤백 시 기록도 함께 롤백되어 다음 실행에서 다시 처리)
+"""
+
+RUNNING, COMPLETE, FAILED = "RUNNING", "COMPLETE", "FAILED"
+SUCCESS, NO_DATA, SKIP, FAIL = "SUCCESS", "NO_DATA", "SKIP", "FAIL"
+DONE_STATUSES = (SUCCESS, NO_DATA, SKIP)
+
+Item = Union[str, Tuple[str, str]]
+
+
+def _item_key(item: Item) -> Tuple[str, str]:
+    """item → (CORP_CODE, ITEM_KEY), 기업 코드만 주어지면 ITEM_KEY는 ''"""
+    return (item[0], item[1]) if isinstance(item, tuple) else (item, "")
+
+
+class RunCheckpoint:
+    def __init__(self, conn: Session, job: str, bsns_year: Optional[str] = None,
+                 reprt_code: Optional[str] = None, fs_div: Optional[str] = None, bas_dd: Optional[date] = None):
+        self.conn = conn
+        self.job = job
+        self.target = {"BSNS_YEAR": bsns_year, "REPRT_CODE": reprt_code, "FS_DIV": fs_div, "BAS_DD": bas_dd}
+        self.run_id: Optional[str] = None
+        self.last_corp_code: Optional[str] = None
+
+    def _latest_run(self) -> Optional[TB_RUN_STATE]:
+        query = self.conn.query(TB_RUN_STATE).filter(TB_RUN_STATE.JOB == self.job)
+        for name, value in self.target.items():
+            column = getattr(TB_RUN_STATE, name)
+            query = query.filter(column.is_(None) if value is None else column == value)
+        return query.order_by(TB_RUN_STATE.STARTED_AT.desc()).first()
+
+    def _item_keys(self, run_id: str, statuses: Iterable[str]) -> List[Tuple[str, str]]:
+        """상태가 statuses인 (CORP_CODE, ITEM_KEY) 목록 (기록 순서)"""
+        rows = self.conn.execute(
+            select(TB_RUN_STATE_ITEM.CORP_CODE, TB_RUN_STATE_ITEM.ITEM_KEY).where(
+                TB_RUN_STATE_ITEM.RUN_ID == run_id,
+                TB_RUN_STATE_ITEM.STATUS.in_(list(statuses)),
+            ).order_by(TB_RUN_STATE_ITEM.ID)
+        ).all()
+        return [(row[0], row[1]) for row in rows]
+
+    def start(self, items: Optional[List[Item]], resume: bool = True, only_failed: bool = False) -> List[Item]:
+        """
+        실행 시작/재개, 이번 실행에서 처리할 item 목록 반환 (입력 순서 유지)
+        - only_failed이고 items가 None이면 직전 실행의 FAIL 건 전체를 반환 (ITEM_KEY가 있으면 (기업 코드, ITEM_KEY))
+        """
+        if items is None and not only_failed:
+            raise ValueError("items는 only_failed=True일 때만 생략할 수 있습니다.")
+        latest = self._latest_run() if (resume or only_failed) else None
+
+        if only_failed:
+            if latest is None:
+                logger.info(f"[RUN_STATE] -----> {self.job} 이전 실행 없음 → 재처리 대상 없음")
+                return []
+            failed = self._item_keys(latest.RUN_ID, [FAIL])
+            if items is None:
+                targets = [(code, key) if key else code for code, key in failed]
+            else:
+                failed = set(failed)
+                targets = [item for item in items if _item_key(item) in failed]
+            self._reopen(latest)
+            logger.info(f"[RUN_STATE] -----> {self.job} 실패 기업 재처리 : {len(targets)}건 (RUN_ID={self.run_id})")
+            return targets
+
+        if latest is not None and latest.STATUS != COMPLETE:
+            done = set(self._item_keys(latest.RUN_ID, DONE_STATUSES))
+            targets = [item for item in items if _item_key(item) not in done]
+            self._reopen(latest)
+            logger.info(
+                f"[RUN_STATE] -----> {self.job} 재개 (RUN_ID={self.run_id}, 마지막 기업={latest.LAST_CORP_CODE}) "
+                f": 완료 {len(done)}건 제외, 남은 {len(targets)}건"
+            )
+            return targets
+
+        self.run_id = str(uuid4())
+        self.conn.add(TB_RUN_STATE(RUN_ID=self.run_id, JOB=self.job, STATUS=RUNNING, TOTAL=len(items), **self.target))
+        self.conn.commit()
+        logger.info(f"[RUN_STATE] -----> {self.job} 신규 실행 (RUN_ID={self.run_id}, 대상 {len(items)}건)")
+        return list(items)
+
+    def _reopen(self, run: TB_RUN_STATE) -> None:
+        self.run_id = run.RUN_ID
+        self.last_corp_code = run.LAST_CORP_CODE
+        self._set_run(STATUS=RUNNING)
+        self.conn.commit()
+
+    def _set_run(self, **values) -> None:
+        self.conn.execute(
+            update(TB_RUN_STATE)
+            .where(TB_RUN_STATE.RUN_ID == self.run_id)
+            .values(UPDATED_AT=func.now(), **values)
+        )
+
+    def record(self, corp_code: str, status: str, message: Optional[str] = None, item_key: str = "") -> None:
+        """기업(item_key 지정 시 해당 건) 처리 결과 기록 (커밋은 호출 측의 다음 커밋 또는 finish에서 수행)"""
+        stmt = insert(TB_RUN_STATE_ITEM).values(
+            RUN_ID=self.run_id, CORP_CODE=corp_code, ITEM_KEY=item_key, STATUS=status,
+            MESSAGE=(message or None) and str(message)[:1000], UPDATED_AT=datetime.now(),
+        )
+        self.conn.execute(stmt.on_conflict_do_update(
+            constraint="UQ_TB_RUN_STATE_ITEM_RUN_ID_CORP_CODE_ITEM_KEY",
+            set_={"STATUS": stmt.excluded.STATUS, "MESSAGE": stmt.excluded.MESSAGE, "UPDATED_AT": stmt.excluded.UPDATED_AT},
+        ))
+        self._set_run(LAST_CORP_CODE=corp_code)
+        self.last_corp_code = corp_code
+
+    def finish(self, status: str = COMPLETE) -> None:
+        """실행 종료 상태 기록 후 커밋 (FAILED면 다음 실행에서 재개)"""
+        try:
+            self._set_run(STATUS=status, LAST_CORP_CODE=self.last_corp_code)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            logger.error(f"[RUN_STATE] -----> ERROR : {self.job} 상태 기록 실패 (RUN_ID={self.run_id})", exc_info=True)
+            return
+        logger.info(f"[RUN_STATE] -----> {self.job} 종료 : {status} (RUN_ID={self.run_id}, 마지막 기업={self.last_corp_code})")
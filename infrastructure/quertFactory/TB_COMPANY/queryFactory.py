@@ -24,6 +24,16 @@ class TBCompanyQueryFactory(BaseQueryFactory):
         except:
             self.conn.rollback()
             return None
+
+    def stock_code_names(self):
+        """종목코드 해석용: (STOCK_CODE, CORP_NAME, IS_ACTIVE) 전체 조회"""
+        try:
+            return self.conn.query(self.model.STOCK_CODE, self.model.CORP_NAME, self.model.IS_ACTIVE).filter(
+                self.model.CORP_NAME.isnot(None)
+            ).all()
+        except:
+            self.conn.rollback()
+            return None
         
         
 
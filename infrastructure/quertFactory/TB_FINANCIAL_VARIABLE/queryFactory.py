@@ -85,10 +85,18 @@ class TBFINANCIALQueryFactory(Generic[T]):
                     self.model.MKTCAP
                 )
 
+                # 연속된 연도는 하나의 BAS_DD BETWEEN 범위로 묶어 파티션 프루닝/인덱스 범위 스캔 유도
+                year_ranges = []
+                for year in sorted(set(years)):
+                    if year_ranges and year == year_ranges[-1][1] + 1:
+                        year_ranges[-1][1] = year
+                    else:
+                        year_ranges.append([year, year])
                 year_filters = [
-                    self.model.BAS_DD.between(date(year, 1, 1), date(year, 12, 31)) for year in years
+                    self.model.BAS_DD.between(date(start, 1, 1), date(end, 12, 31)) for start, end in year_ranges
                 ]
-                query = query.filter(or_(*year_filters))
+                if year_filters:
+                    query = query.filter(or_(*year_filters) if len(year_filters) > 1 else year_filters[0])
 
                 query = query.filter(self.model.MKT_NM.in_(["KOSPI", "KOSDAQ"]))
 
@@ -1,6 +1,7 @@
 from error.errors import DataBaseError
 import json
-from typing import List, Type, Any
+from typing import List, Type, Any, Dict, Iterable, Optional, Sequence
+import numpy as np
 from pydantic import BaseModel, ValidationError
 from pg8000 import connect, Connection
 import traceback
@@ -27,22 +28,60 @@ def custom_parse(src: Any, dest: Type[BaseModel]) -> BaseModel:
         logger.error(f"dest : {dest}")
         raise e
 
+ROW_FORMATS = ("dict", "tuple", "numpy")
+
+
 class BaseQueryFactory:
+    """
+    pg8000 raw SQL 쿼리 팩토리
+    - params: 쿼리의 %s 자리에 바인딩할 값 (문자열 조립 대신 사용, SQL 인젝션 방지)
+    - row_format: "dict"(기본) / "tuple"(행 dict 생성 생략) / "numpy"(컬럼명 지정 레코드 배열)
+    - run_prepared: :name 형식 쿼리를 쿼리 문자열별 서버 측 prepared statement로 캐시하여 반복 실행 (파싱/플랜 재사용)
+    - execute_many / insert_many: 단일 트랜잭션 배치 실행
+    """
     def __init__(self,conn:Connection):
         self.conn = conn
         # self.conn: Connection = db_connection_pool() #inject.instance(connect)
         self.curs = self.conn.cursor()
+        self._prepared: Dict[str, Any] = {}
+
+    def _execute(self, query: str, params: Optional[Sequence] = None):
+        if params is None:
+            return self.curs.execute(query)
+        return self.curs.execute(query, params)
+
+    def _columns(self) -> List[str]:
+        return [i[0] for i in self.curs.description or []]
 
     def row_to_dict(self):
         """convert tuple result to dict with cursor"""
 
-        col_names = [i[0]for i in self.curs.description]
+        col_names = self._columns()
         result = [dict(zip(col_names, row)) for row in self.curs.fetchall()]
         return result
 
-    def find_one(self, query: str, dto_type: Type[BaseModel] = None, json_loads_column: str = None) -> Type[BaseModel]:
+    def fetch_rows(self, row_format: str = "dict"):
+        """직전 실행 결과를 row_format 형태로 반환"""
+        if row_format not in ROW_FORMATS:
+            raise ValueError(f"row_format must be one of {ROW_FORMATS}: {row_format}")
+        if row_format == "dict":
+            return self.row_to_dict()
+        rows = [tuple(row) for row in self.curs.fetchall()]
+        if row_format == "tuple":
+            return rows
+        return self.to_records(rows, self._columns())
+
+    @staticmethod
+    def to_records(rows: Sequence[tuple], columns: List[str]) -> np.recarray:
+        """튜플 행 → 컬럼명 기반 numpy 레코드 배열 (빈 결과도 컬럼 구조 유지)"""
+        if not rows:
+            return np.rec.array(np.empty(0, dtype=[(name, object) for name in columns]))
+        return np.rec.fromrecords(rows, names=columns)
+
+    def find_one(self, query: str, dto_type: Type[BaseModel] = None, json_loads_column: str = None,
+                 params: Optional[Sequence] = None) -> Type[BaseModel]:
         try:
-            self.curs.execute(query)
+            self._execute(query, params)
             row = self.row_to_dict()[0]
             # logger.info(f"---> query result count : {row} ")
             logger.info(f"---> result type: {type(row)}")
@@ -62,10 +101,13 @@ class BaseQueryFactory:
             logger.error(f"\n{'%'*120}\n\n{query}\n{'%'*120}")
             raise DataBaseError(message=str(err))
         
-    def find_all(self, query: str, dto_type: Type[BaseModel] = None, json_loads_column: str = None) -> Type[BaseModel]:
+    def find_all(self, query: str, dto_type: Type[BaseModel] = None, json_loads_column: str = None,
+                 params: Optional[Sequence] = None, row_format: str = "dict") -> Type[BaseModel]:
         try:
 
-            self.curs.execute(query)
+            self._execute(query, params)
+            if row_format != "dict":
+                return self.fetch_rows(row_format)
             rows = self.row_to_dict()
             if not rows:
                 rows = []
@@ -89,9 +131,9 @@ class BaseQueryFactory:
             logger.error(f"\n{'%'*120}\n\n{err}\n")
             logger.error(f"\n{'%'*120}\n\n{query}\n{'%'*120}")
             raise DataBaseError(message=str(err))
-    def insert_update(self, query: str) -> bool:
+    def insert_update(self, query: str, params: Optional[Sequence] = None) -> bool:
         try:
-            self.curs.execute(query)
+            self._execute(query, params)
         except Exception as err:
             logger.error(f"\n{'%'*120}\n\n{err}\n")
             logger.error(f"\n{'%'*120}\n\n{query}\n{'%'*120}")
@@ -103,12 +145,90 @@ class BaseQueryFactory:
             self.conn.commit()
             return True
             
-    def insert_update_to_select(self, query: str) -> bool:
+    def insert_update_to_select(self, query: str, params: Optional[Sequence] = None) -> bool:
         try:
-            rows = self.curs.execute(query)
+            rows = self._execute(query, params)
             return rows.fetchall()[0]
         except Exception as err:
             logger.error(f"\n{'%'*120}\n\n{err}\n")
             logger.error(f"\n{'%'*120}\n\n{query}\n{'%'*120}")
             self.conn.rollback()
-            raise DataBaseError(message=str(err))
\ No newline at end of file
+            raise DataBaseError(message=str(err))
+
+    def prepare(self, query: str):
+        """쿼리 문자열별 prepared statement 캐시 (같은 커넥션에서 재사용)"""
+        statement = self._prepared.get(query)
+        if statement is None:
+            statement = self.conn.prepare(query)
+            self._prepared[query] = statement
+        return statement
+
+    def run_prepared(self, query: str, row_format: str = "tuple", **params):
+        """
+        :name 형식 쿼리를 prepared statement로 실행 (예: SELECT ... WHERE "CORP_CODE" = :corp_code)
+        - 조회 결과는 row_format(tuple/dict/numpy)으로 반환, 트랜잭션 종료는 호출 측에서 commit/rollback
+        """
+        try:
+            statement = self.prepare(query)
+            rows = [tuple(row) for row in statement.run(**params)]
+        except Exception as err:
+            logger.error(f"\n{'%'*120}\n\n{err}\n")
+            logger.error(f"\n{'%'*120}\n\n{query}\n{'%'*120}")
+            self.conn.rollback()
+            raise DataBaseError(message=str(err))
+
+        if row_format == "tuple":
+            return rows
+        columns = [col["name"] for col in statement.row_desc or []]
+        if row_format == "dict":
+            return [dict(zip(columns, row)) for row in rows]
+        return self.to_records(rows, columns)
+
+    def close_prepared(self) -> None:
+        """캐시된 prepared statement 해제"""
+        for statement in self._prepared.values():
+            try:
+                statement.close()
+            except Exception:
+                pass
+        self._prepared.clear()
+
+    def execute_many(self, query: str, param_sets: Iterable[Dict[str, Any]]) -> int:
+        """
+        :name 형식 쿼리 1개를 여러 파라미터로 반복 실행 (prepared statement 1회 준비, 단일 트랜잭션)
+        - 전체 성공 시 커밋, 실패 시 롤백 후 DataBaseError
+        """
+        count = 0
+        try:
+            statement = self.prepare(query)
+            for params in param_sets:
+                statement.run(**params)
+                count += 1
+        except Exception as err:
+            logger.error(f"\n{'%'*120}\n\n{err}\n")
+            logger.error(f"\n{'%'*120}\n\n{query}\n{'%'*120}")
+            self.conn.rollback()
+            raise DataBaseError(message=str(err))
+        self.conn.commit()
+        return count
+
+    def insert_many(self, table: str, columns: Sequence[str], rows: Iterable[Sequence], batch_size: int = 1000) -> int:
+        """
+        배치당 다중 VALUES INSERT 1문장 (값은 모두 파라미터 바인딩), 단일 트랜잭션
+        - table / columns: 식별자 (큰따옴표로 감쌈), rows: columns 순서의 값 시퀀스
+        """
+        target = ", ".join(f'"{col}"' for col in columns)
+        placeholder = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        rows = [tuple(row) for row in rows]
+        try:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                query = f'INSERT INTO "{table}" ({target}) VALUES ' + ", ".join([placeholder] * len(batch))
+                self.curs.execute(query, [value for row in batch for value in row])
+        except Exception as err:
+            logger.error(f"\n{'%'*120}\n\n{err}\n")
+            logger.error(f"\n{'%'*120}\n\n{table} : {len(rows)} rows\n{'%'*120}")
+            self.conn.rollback()
+            raise DataBaseError(message=str(err))
+        self.conn.commit()
+        return len(rows)
@@ -4,13 +4,27 @@ ORM 기반 DB QueryFactory 모듈
 - 해당 모듈 활용 DB 테이블별 CRUD 수행
 """
 from error.errors import DataBaseError
+import pandas as pd
+from sqlalchemy import cast, column, insert, or_, select, update, values
 from sqlalchemy.orm import Session
-from typing import Type, TypeVar, Generic, Optional, List
+from collections import defaultdict
+from typing import Type, TypeVar, Generic, Optional, List, Dict, Iterable, Iterator, Tuple
 from Logger import logger
 
 # TypeVar를 사용하여 모델 타입을 제네릭으로 지정
 T = TypeVar("T")
 
+
+def _date_key(series: pd.Series) -> pd.Series:
+    """'2025-01-01' / '2025.01.01' / date → datetime (파싱 불가 시 NaT)"""
+    digits = series.astype(str).str.replace(r"\D", "", regex=True).str[:8]
+    return pd.to_datetime(digits, format="%Y%m%d", errors="coerce")
+
+
+def _text_key(series: pd.Series) -> pd.Series:
+    return series.astype(object).where(series.notna(), "").astype(str).str.strip()
+
+
 class BaseQueryFactory(Generic[T]):
     def __init__(self,conn:Session, model: Type[T]):
         self.conn = conn
@@ -30,6 +44,65 @@ class BaseQueryFactory(Generic[T]):
             self.conn.rollback()
             return None
         
+    def _select_columns(self, column_names, filters: dict, where: Optional[list] = None):
+        """지정 컬럼만 SELECT (컬럼 미지정 시 전체 컬럼, ORM 객체 생성 없음)"""
+        names = list(column_names) or [col.name for col in self.model.__table__.columns]
+        stmt = select(*[getattr(self.model, name) for name in names])
+        if filters:
+            stmt = stmt.where(*[getattr(self.model, name) == value for name, value in filters.items()])
+        if where:
+            stmt = stmt.where(*where)
+        return names, stmt
+
+    def iter_key_chunks(self, *column_names: str, chunk_size: int = 10000, **filters) -> Iterator[List[tuple]]:
+        """
+        서버 사이드 커서(yield_per)로 지정 컬럼 튜플을 chunk_size 단위로 반환
+        - 테이블 크기와 무관하게 메모리에는 청크 1개만 유지
+        """
+        _, stmt = self._select_columns(column_names, filters)
+        result = self.conn.execute(stmt.execution_options(yield_per=chunk_size))
+        try:
+            for partition in result.partitions():
+                yield [tuple(row) for row in partition]
+        finally:
+            result.close()
+
+    def iter_frames(self, *column_names: str, chunk_size: int = 10000, **filters) -> Iterator[pd.DataFrame]:
+        """iter_key_chunks와 동일한 스트리밍 조회를 DataFrame 청크로 반환 (컬럼 미지정 시 전체 컬럼)"""
+        yield from self.find_frame(*column_names, chunksize=chunk_size, **filters)
+
+    def find_frame(self, *column_names: str, where: Optional[list] = None, chunksize: Optional[int] = None,
+                   dtype_backend: Optional[str] = None, **filters):
+        """
+        지정 컬럼만 SELECT하여 DBAPI 커서 결과를 바로 DataFrame으로 적재 (ORM 객체/identity map 없음)
+        - 컬럼명은 모델 컬럼명(대문자) 그대로, 컬럼 미지정 시 전체 컬럼
+        - filters: 컬럼 = 값 조건, where: 추가 SQLAlchemy 조건 리스트 (예: [Model.DATE >= d])
+        - chunksize 지정 시 서버 사이드 커서(yield_per)로 DataFrame 청크 iterator 반환
+        - dtype_backend: "numpy_nullable" / "pyarrow" 지정 시 해당 타입으로 변환 (pyarrow 설치 필요)
+        """
+        names, stmt = self._select_columns(column_names, filters, where)
+
+        def _typed(frame: pd.DataFrame) -> pd.DataFrame:
+            return frame.convert_dtypes(dtype_backend=dtype_backend) if dtype_backend else frame
+
+        if chunksize:
+            def _chunks() -> Iterator[pd.DataFrame]:
+                result = self.conn.execute(stmt.execution_options(yield_per=chunksize))
+                try:
+                    for partition in result.partitions():
+                        yield _typed(pd.DataFrame([tuple(row) for row in partition], columns=names))
+                finally:
+                    result.close()
+            return _chunks()
+
+        try:
+            result = self.conn.execute(stmt)
+            return _typed(pd.DataFrame(result.fetchall(), columns=names))
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"DB Error {e}")
+            raise DataBaseError(message="데이터베이스 에러 발생")
+
     def find_all_contains(self, **filters) -> List[T]:
         try:
             return self.conn.query(self.model).filter(
@@ -72,6 +145,32 @@ class BaseQueryFactory(Generic[T]):
             logger.error(f"DB Error {e}")
             raise DataBaseError(message="데이터베이스 에러 발생")
     
+    def insert_frame(self, df: pd.DataFrame, column_map: Dict[str, str], date_columns: Iterable[str] = (),
+                     chunk_size: int = 5000) -> int:
+        """
+        DataFrame 컬럼 단위 일괄 삽입 (행별 dict/ORM 객체 생성 없음), 삽입 건수 반환
+        - column_map: {DataFrame 컬럼명: 모델 컬럼명}, 매핑에 없는 컬럼은 제외
+        - date_columns: 모델 날짜 컬럼명, '' / '-' 등 파싱 불가 값은 NULL
+        - NaN/NaT는 None으로 변환 후 insert(model) executemany를 chunk_size 단위로 실행, 마지막에 1회 커밋
+        """
+        if df.empty:
+            return 0
+        frame = df[list(column_map)].rename(columns=column_map)
+        for col in date_columns:
+            frame[col] = _date_key(frame[col]).dt.date
+        frame = frame.astype(object).where(frame.notna(), None)
+        records = frame.to_dict("records")
+        try:
+            stmt = insert(self.model)
+            for start in range(0, len(records), chunk_size):
+                self.conn.execute(stmt, records[start:start + chunk_size])
+            self.conn.commit()
+            return len(records)
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"DB Error {e}")
+            raise DataBaseError(message="데이터베이스 에러 발생")
+
     def update(self, instance: T, **data) -> T:
         for key, value in data.items():
             setattr(instance, key, value)
@@ -79,6 +178,46 @@ class BaseQueryFactory(Generic[T]):
         self.conn.refresh(instance)
         return instance
     
+    def bulk_update(self, pairs: Iterable[Tuple[object, Dict[str, object]]], key: Optional[str] = None,
+                    batch_size: int = 500) -> int:
+        """
+        (키 값, {컬럼: 값}) 목록 일괄 갱신, 실제 갱신된 행 수 반환
+        - key: 키 컬럼명 (기본: 기본키)
+        - 변경 컬럼 구성이 같은 항목끼리 묶어 batch_size 단위 UPDATE ... FROM (VALUES ...) 1문장씩 실행
+        - 전체를 단일 트랜잭션으로 처리 (실패 시 전체 롤백 후 DataBaseError)
+        """
+        table = self.model.__table__
+        key = key or table.primary_key.columns.values()[0].name
+        groups = defaultdict(list)
+        for key_value, changes in pairs:
+            if changes:
+                groups[tuple(sorted(changes))].append((key_value, changes))
+        if not groups:
+            return 0
+
+        updated = 0
+        try:
+            for columns, items in groups.items():
+                for start in range(0, len(items), batch_size):
+                    batch = items[start:start + batch_size]
+                    data = values(
+                        column("_KEY", table.c[key].type),
+                        *[column(name, table.c[name].type) for name in columns],
+                        name="bulk_update",
+                    ).data([(key_value, *[changes[name] for name in columns]) for key_value, changes in batch])
+                    stmt = (
+                        update(table)
+                        .where(table.c[key] == cast(data.c["_KEY"], table.c[key].type))
+                        .values({name: cast(data.c[name], table.c[name].type) for name in columns})
+                    )
+                    updated += self.conn.execute(stmt).rowcount
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"DB Error {e}")
+            raise DataBaseError(message="데이터베이스 에러 발생")
+        return updated
+
     def get_columns_by_names(self, *column_names: str):
         """
         하나 또는 여러 개의 컬럼명을 입력받아 해당 컬럼 객체(들)를 반환
@@ -88,4 +227,65 @@ class BaseQueryFactory(Generic[T]):
         columns = [getattr(self.model, name) for name in column_names if hasattr(self.model, name)]
         if len(column_names) == 1:
             return columns[0] if columns else None
-        return columns
\ No newline at end of file
+        return columns
+
+    def find_key_frame(self, column_names: List[str], date_column: Optional[str] = None,
+                       date_from=None, date_to=None, in_filters: Optional[Dict[str, list]] = None) -> pd.DataFrame:
+        """
+        키 컬럼만 조회하여 DataFrame 반환 (ORM 객체/전체 컬럼 적재 없음)
+        - date_column 지정 시 date_from ~ date_to 범위 + 날짜가 NULL인 행만 조회
+        - in_filters: {컬럼명: 값 리스트} IN 조건
+        """
+        try:
+            query = self.conn.query(*[getattr(self.model, name) for name in column_names])
+            if date_column and date_from is not None and date_to is not None:
+                date_col = getattr(self.model, date_column)
+                query = query.filter(or_(date_col.between(date_from, date_to), date_col.is_(None)))
+            for name, in_values in (in_filters or {}).items():
+                query = query.filter(getattr(self.model, name).in_(list(in_values)))
+            return pd.DataFrame(query.all(), columns=column_names)
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"DB Error {e}")
+            raise DataBaseError(message="데이터베이스 에러 발생")
+
+    def filter_new_rows(self, df: pd.DataFrame, key_map: Dict[str, str], date_column: Optional[str] = None) -> pd.DataFrame:
+        """
+        수집 DataFrame 중 DB에 없는 행만 반환 (키 컬럼 다중 merge + indicator anti-join)
+        - key_map: {DataFrame 컬럼명: 모델 컬럼명}
+        - date_column: 날짜 키의 모델 컬럼명, 지정 시 수집분의 최소~최대 날짜 범위만 DB에서 조회
+        - date_column이 없거나 수집분에 해석 가능한 날짜가 없으면 첫 번째 비날짜 키의 수집 값으로 IN 조회
+          → 어느 경우든 비교 비용이 테이블 이력이 아닌 수집 건수에 비례 (전체 키 스캔 없음)
+        - 키 비교는 문자열(앞뒤 공백 제거) 기준, 날짜 키는 YYYY-MM-DD로 정규화 (빈 값/'-'는 NULL과 동일 취급)
+        """
+        if df.empty:
+            return df.reset_index(drop=True)
+
+        model_keys = list(key_map.values())
+        left = pd.DataFrame(index=df.index)
+        date_from = date_to = None
+        for df_col, model_col in key_map.items():
+            if model_col == date_column:
+                dates = _date_key(df[df_col])
+                if dates.notna().any():
+                    date_from, date_to = dates.min().date(), dates.max().date()
+                left[model_col] = dates.dt.strftime("%Y-%m-%d").fillna("")
+            else:
+                left[model_col] = _text_key(df[df_col])
+
+        in_filters = None
+        if date_from is None:
+            first_key = next((key for key in model_keys if key != date_column), model_keys[0])
+            in_filters = {first_key: [v for v in left[first_key].unique() if v]}
+
+        right = self.find_key_frame(model_keys, date_column=date_column, date_from=date_from, date_to=date_to, in_filters=in_filters)
+        for model_col in model_keys:
+            if model_col == date_column:
+                right[model_col] = _date_key(right[model_col]).dt.strftime("%Y-%m-%d").fillna("")
+            else:
+                right[model_col] = _text_key(right[model_col])
+        right = right.drop_duplicates()
+
+        merged = left.merge(right, on=model_keys, how="left", indicator=True)
+        is_new = (merged["_merge"] == "left_only").to_numpy()
+        return df.loc[is_new].reset_index(drop=True)
@@ -1,13 +1,13 @@
 import pandas as pd
-import time
 import datetime
 from datetime import timedelta
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from infrastructure.queryFactory.base_orm import BaseQueryFactory
+from infrastructure.kind.stock_code_resolver import StockCodeResolver
+from infrastructure.kind.browser_pool import get_browser_pool
+from infrastructure.kind.navigation import KindNavigator
+from infrastructure.kind.http_client import KindHttpClient, cell_text, cell_link
 from setting.database_orm import SessionLocal
 from db.public.models import *
 from Logger import logger 
@@ -17,26 +17,23 @@ from error.email.email_logger import attach_error_email_handler
     * TB_DELISTING(상장폐지)
         - 상장폐지 기업 정보를 크롤링하여 DB에 저장하는 스케줄러
         - 스케줄러 주기: 매일
+        - 수집 : 셀레니움(기본), use_http=True면 KIND 검색 폼 직접 전송(실험적, 실제 응답으로 폼 파라미터 미검증) 후 실패 시 셀레니움
         - 이전상장 및 시장 상장의 경우 코스닥->코스피(코스피->코스닥)로 이전된 것으로 기업 테이블에서 IS_ACTIVE=False로 업데이트 하지 않음
         - 상장폐지된 기업의 경우 기업 테이블에서 IS_ACTIVE 칼럼의 값을 FALSE로 업데이트
 """
 
 class SchedulerServiceTBDelisting:
-    def __init__(self, from_date=None, to_date=None):
-        """ 셀레니움 크롤러 초기화 (오늘 날짜로 검색) """
-        options = Options()
-
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")  
-        options.add_argument("--remote-debugging-port=9222")  
-
-
-        self.driver = webdriver.Chrome(options=options)
+    def __init__(self, from_date=None, to_date=None, use_http=False):
+        """ 크롤러 초기화 (오늘 날짜로 검색, 기본 셀레니움 수집, use_http=True면 HTTP(실험적) 우선) """
+        self.use_http = use_http
+        self.driver = None
+        self.wait = None
+        self.nav = None
+        self.browser = None
         self.url = "https://kind.krx.co.kr/investwarn/delcompany.do?method=searchDelCompanyMain"
-        self.wait = WebDriverWait(self.driver, 20)
         self.data = []
+        # TB_COMPANY 기반 종목코드 해석기 (미스일 때만 팝업 조회)
+        self.resolver = StockCodeResolver()
 
         # 날짜 및 연도 설정
         today = datetime.datetime.today()
@@ -53,10 +50,26 @@ class SchedulerServiceTBDelisting:
             self.to_date = to_date if isinstance(to_date, str) else to_date.strftime("%Y%m%d")
         attach_error_email_handler(logger, service_name='WEB:DELISTING 스케줄러')
 
+    def start_driver(self):
+        """셀레니움 드라이버 대여 (공용 브라우저 풀)"""
+        self.browser = get_browser_pool().acquire()
+        self.driver = self.browser.driver
+        self.wait = self.browser.wait
+        self.nav = KindNavigator(self.driver, self.wait)
+
+    def release_driver(self):
+        """브라우저 풀에 드라이버 반납 (종료하지 않고 다음 작업에서 재사용)"""
+        if self.browser is not None:
+            self.browser.release()
+        self.browser = None
+        self.driver = None
+        self.wait = None
+        self.nav = None
+
     def open_page(self):
-        """ 페이지 열기 """
-        self.driver.get(self.url)
-        time.sleep(2)
+        """ 페이지 열기 (로드 완료까지 대기) """
+        self.nav.open(self.url)
+        self.browser.count_page()
 
     def set_date_range(self):
         """ 기간 설정 """
@@ -68,8 +81,6 @@ class SchedulerServiceTBDelisting:
             self.driver.execute_script("arguments[0].value = '';", to_input)
             from_input.send_keys(self.from_date)
             to_input.send_keys(self.to_date)
-            
-            time.sleep(2)
         except Exception as e:
             logger.error(f"[TB_DELISTING : 상장폐지] -----> ERROR(기간 설정 실패) : {e}", exc_info=True)
 
@@ -79,25 +90,24 @@ class SchedulerServiceTBDelisting:
             search_button = self.wait.until(EC.element_to_be_clickable(
                 (By.XPATH, "//a[@class='btn-sprite type-00 vmiddle search-btn' and @title='검색']")
             ))
-            self.driver.execute_script("arguments[0].click();", search_button)  
-            time.sleep(5)
+            self.nav.click_and_wait(search_button)
         except Exception as e:
             logger.error(f"[TB_DELISTING : 상장폐지] -----> ERROR(검색 버튼 클릭 실패) : {e}", exc_info=True)
 
-    def click_next_page(self):
-        """ 다음 페이지 버튼 클릭 """
+    def click_next_page(self, page):
+        """ 페이지 이동 (목록 교체까지 대기) """
         try:
-            next_button = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//a[@class='next']")))
-            next_button.click()
-            time.sleep(3)
+            self.nav.go_to_page(page)
+            self.browser.count_page()
             return True
         except Exception as e:
-            logger.error(f"[TB_DELISTING : 상장폐지] -----> ERROR(다음 페이지가 없습니다.) : {e}", exc_info=True)
+            logger.error(f"[TB_DELISTING : 상장폐지] -----> ERROR({page} 페이지 이동 실패) : {e}", exc_info=True)
+            return False
 
     def scraping(self):
         """ 표 데이터 수집 및 종목코드 가져오기 """
         try:
-            rows = self.wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "table.list.type-00 tbody tr")))
+            rows = self.nav.rows()
             current_page_data = []
             main_window = self.driver.current_window_handle  # 현재 창 핸들 저장
 
@@ -107,33 +117,33 @@ class SchedulerServiceTBDelisting:
                     continue
 
                 company_name = cols[1].text.strip()
-                stock_code = None
-
-                # 기업명 클릭하여 새 창 열기
-                try:
-                    link = cols[1].find_element(By.TAG_NAME, "a")
-                    self.driver.execute_script("arguments[0].click();", link)
-                    time.sleep(2)
+                stock_code = self.resolver.lookup(company_name)
 
-                    # 새 창으로 전환
-                    self.wait.until(EC.number_of_windows_to_be(2))
-                    new_window = [w for w in self.driver.window_handles if w != main_window][0]
-                    self.driver.switch_to.window(new_window)
-
-                    # 종목코드 가져오기
+                # 인덱스에 없는 경우에만 기업명 클릭하여 새 창 열기
+                if not stock_code:
                     try:
-                        stock_code_element = self.wait.until(EC.presence_of_element_located(
-                            (By.XPATH, "//th[contains(text(), '종목코드')]/following-sibling::td")
-                        ))
-                        stock_code = stock_code_element.text.strip()
-                    except Exception as e:
-                        logger.error(f"[TB_DELISTING : 상장폐지] -----> ERROR(종목코드 가져오기 실패) : {e}", exc_info=True)
-                    # 새 창 닫고 원래 창으로 복귀
-                    self.driver.close()
-                    self.driver.switch_to.window(main_window)
+                        link = cols[1].find_element(By.TAG_NAME, "a")
+                        handles_before = set(self.driver.window_handles)
+                        self.driver.execute_script("arguments[0].click();", link)
+
+                        # 새 창이 열리면 전환
+                        self.driver.switch_to.window(self.nav.wait_new_window(handles_before))
+
+                        # 종목코드 가져오기
+                        try:
+                            stock_code_element = self.wait.until(EC.presence_of_element_located(
+                                (By.XPATH, "//th[contains(text(), '종목코드')]/following-sibling::td")
+                            ))
+                            stock_code = stock_code_element.text.strip()
+                            self.resolver.remember(company_name, stock_code)
+                        except Exception as e:
+                            logger.error(f"[TB_DELISTING : 상장폐지] -----> ERROR(종목코드 가져오기 실패) : {e}", exc_info=True)
+                        # 새 창 닫고 원래 창으로 복귀
+                        self.driver.close()
+                        self.driver.switch_to.window(main_window)
 
-                except Exception as e:
-                    logger.error(f"[TB_DELISTING : 상장폐지] -----> ERROR(링크 클릭 실패) : {e}", exc_info=True)
+                    except Exception as e:
+                        logger.error(f"[TB_DELISTING : 상장폐지] -----> ERROR(링크 클릭 실패) : {e}", exc_info=True)
 
                 item = {
                     "번호": cols[0].text.strip(),
@@ -151,33 +161,60 @@ class SchedulerServiceTBDelisting:
             return []
 
 
-    def run(self):
-        """ 크롤링 시작 """
+    def scraping_http(self):
+        """ 검색 폼 직접 전송(HTTP, 실험적)으로 전체 페이지 수집 """
+        client = KindHttpClient()
+        try:
+            form = client.build_form("TB_DELISTING", from_date=self.from_date, to_date=self.to_date)
+            data = []
+            for rows in client.iter_pages("TB_DELISTING", form):
+                for cols in rows:
+                    if len(cols) < 5:
+                        continue
+                    company_name = cell_text(cols[1])
+                    stock_code = client.resolve_stock_code(self.resolver, company_name, cell_link(cols[1]))
+                    data.append({
+                        "번호": cell_text(cols[0]),
+                        "기업명": company_name,
+                        "폐지일자": cell_text(cols[2]),
+                        "폐지사유": cell_text(cols[3]),
+                        "비고": cell_text(cols[4]),
+                        "종목코드": stock_code if stock_code else "N/A"
+                    })
+            return data
+        finally:
+            client.close()
+
+    def crawl_selenium(self):
+        """ 셀레니움 크롤링 (기본 수집 경로, use_http=True면 HTTP 실패 시 대체) """
+        self.start_driver()
         try:
             self.open_page()
             self.set_date_range()
             self.click_search_button()
 
-            page = 1
-            previous_page_data = None
-            
-            while True:
-                current_page_data = self.scraping()
-                
-                if not current_page_data or current_page_data == previous_page_data:
+            # 검색 직후 전체 페이지 수 확인 → 정확한 횟수만큼 이동
+            total_pages = self.nav.total_pages()
+            for page in range(1, total_pages + 1):
+                if page > 1 and not self.click_next_page(page):
                     break
-                
-                self.data.extend(current_page_data)
-                previous_page_data = current_page_data
-                
-                if not self.click_next_page():
-                    break
-                
-                page += 1
+                self.data.extend(self.scraping())
 
         finally:
-            if self.driver:
-                self.driver.quit()
+            self.release_driver()
+
+    def run(self):
+        """ 크롤링 시작 (기본 셀레니움, use_http=True면 HTTP 우선 후 실패 시 셀레니움) """
+        crawled = False
+        if self.use_http:
+            try:
+                self.data = self.scraping_http()
+                crawled = True
+            except Exception as e:
+                logger.warn(f"[TB_DELISTING : 상장폐지] -----> HTTP 수집 실패, 셀레니움으로 대체 : {e}")
+                self.data = []
+        if not crawled:
+            self.crawl_selenium()
 
         self.crud()
         return pd.DataFrame(self.data)
@@ -191,11 +228,8 @@ class SchedulerServiceTBDelisting:
             try:
                 query_factory = BaseQueryFactory(conn=conn, model=TB_DELISTING)
                 query_factory_company = BaseQueryFactory(conn=conn, model=TB_COMPANY)
-                balance_sheets = query_factory.find_all()
-                tb_delisting = pd.DataFrame([row.__dict__ for row in balance_sheets])
-
-                diff = set(df['종목코드'].astype(str)) - set(tb_delisting['STOCK_CODE'].astype(str))
-                insert_df = df.loc[df['종목코드'].isin(diff)].reset_index(drop=True)
+                # 수집된 종목코드만 IN 조회하여 신규 상장폐지 종목 선별
+                insert_df = query_factory.filter_new_rows(df, {'종목코드': 'STOCK_CODE'})
 
                 # 이전상장, 시장 상장의 경우 종목코드가 변하지 않으므로 기업 테이블에서 IS_ACTIVE를 기존의 TRUE로 유지
                 update_company = insert_df.loc[
@@ -204,30 +238,22 @@ class SchedulerServiceTBDelisting:
                     (~insert_df['폐지사유'].str.contains("시장 상장", na=False))
                 ]
 
-                instances = []
-                for _, row in insert_df.iterrows():
-                    instance = {
-                    "STOCK_CODE": row['종목코드'],
-                    "CORP_NAME": row['기업명'],
-                    "DATE": row['폐지일자'],
-                    "REASON": row['폐지사유'],
-                    "RM": row['비고'],
-                    }
-
-                    instances.append(TB_DELISTING(**instance))
-
-                if instances:
+                if not insert_df.empty:
                     try:
-                        query_factory.insert_multi_row(instances)
+                        inserted = query_factory.insert_frame(
+                            insert_df,
+                            {'종목코드': 'STOCK_CODE', '기업명': 'CORP_NAME', '폐지일자': 'DATE', '폐지사유': 'REASON', '비고': 'RM'},
+                            date_columns=['DATE'],
+                        )
                         # TB_COMPANY에 IS_ACTIVE=False 업데이트
                         stock_codes = update_company['종목코드'].dropna().replace("N/A", pd.NA).dropna().tolist()
-                        tb_company = query_factory_company.find_all_in(column_name="STOCK_CODE", values=stock_codes)
-                        [query_factory.update(company, IS_ACTIVE=False) for company in tb_company]
-                        logger.info(f"[TB_DELISTING : 상장폐지] -----> 삽입 : {len(instances)}건 적재 완료")
+                        deactivated = query_factory_company.bulk_update([(code, {"IS_ACTIVE": False}) for code in stock_codes])
+                        logger.info(f"[TB_DELISTING : 상장폐지] -----> TB_COMPANY 비활성화 : {deactivated}건")
+                        logger.info(f"[TB_DELISTING : 상장폐지] -----> 삽입 : {inserted}건 적재 완료")
                     except Exception as e:
                         logger.error(f"[TB_DELISTING : 상장폐지] -----> ERROR : Insert failed: {e}", exc_info=True)
                         raise 
-            except:
+            except Exception as e:
                 logger.error(f"[TB_DELISTING : 상장폐지] -----> ERROR : DB 처리 실패: {e}", exc_info=True)
         else:
             logger.info("[TB_DELISTING : 상장폐지] -----> 조회된 데이터가 없습니다.")
@@ -1,13 +1,13 @@
 import pandas as pd
-import time
 import datetime
 from datetime import timedelta
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from infrastructure.queryFactory.base_orm import BaseQueryFactory
+from infrastructure.kind.stock_code_resolver import StockCodeResolver
+from infrastructure.kind.browser_pool import get_browser_pool
+from infrastructure.kind.navigation import KindNavigator
+from infrastructure.kind.http_client import KindHttpClient, cell_text, cell_link
 from setting.database_orm import SessionLocal
 from db.public.models import *
 from Logger import logger 
@@ -16,23 +16,22 @@ from error.email.email_logger import attach_error_email_handler
     * TB_EMBEZZLEMENT(횡령)
         - 횡령 정보를 크롤링하여 DB에 저장하는 스케줄러
         - 스케줄러 주기: 매일
+        - 수집 : 셀레니움(기본), use_http=True면 KIND 검색 폼 직접 전송(실험적, 실제 응답으로 폼 파라미터 미검증) 후 실패 시 셀레니움
 """
 
 class SchedulerServiceTBEmbezzlement:
     """오늘 날짜 횡령 공시 크롤러"""
-    def __init__(self, from_date=None, to_date=None):
-        """오늘 날짜 횡령 공시 크롤러 초기화"""
-        options = Options()
-       
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")  
-        options.add_argument("--remote-debugging-port=9222")  
-        self.driver = webdriver.Chrome(options=options)
+    def __init__(self, from_date=None, to_date=None, use_http=False):
+        """오늘 날짜 횡령 공시 크롤러 초기화 (기본 셀레니움 수집, use_http=True면 HTTP(실험적) 우선)"""
+        self.use_http = use_http
+        self.driver = None
+        self.wait = None
+        self.nav = None
+        self.browser = None
         self.url = "https://kind.krx.co.kr/investwarn/investattentEmbezzlement.do?method=searchInvestAttentEmbezzlementMain"
-        self.wait = WebDriverWait(self.driver, 20)
         self.data = []
+        # TB_COMPANY 기반 종목코드 해석기 (미스일 때만 팝업 조회)
+        self.resolver = StockCodeResolver()
 
         # 날짜 설정 (기본: 최근 7일, 필요 시 파라미터로 오버라이드)
         today = datetime.datetime.today()
@@ -51,10 +50,26 @@ class SchedulerServiceTBEmbezzlement:
         self.today_year = today.strftime("%Y")
         attach_error_email_handler(logger, service_name='WEB:EMBEZZLEMENT 스케줄러')
         
+    def start_driver(self):
+        """셀레니움 드라이버 대여 (공용 브라우저 풀)"""
+        self.browser = get_browser_pool().acquire()
+        self.driver = self.browser.driver
+        self.wait = self.browser.wait
+        self.nav = KindNavigator(self.driver, self.wait)
+
+    def release_driver(self):
+        """브라우저 풀에 드라이버 반납 (종료하지 않고 다음 작업에서 재사용)"""
+        if self.browser is not None:
+            self.browser.release()
+        self.browser = None
+        self.driver = None
+        self.wait = None
+        self.nav = None
+
     def open_page(self):
-        """웹 페이지 열기"""
-        self.driver.get(self.url)
-        time.sleep(2)
+        """웹 페이지 열기 (로드 완료까지 대기)"""
+        self.nav.open(self.url)
+        self.browser.count_page()
 
     def set_today_date(self):
         """오늘 날짜로 조회 설정"""
@@ -66,7 +81,6 @@ class SchedulerServiceTBEmbezzlement:
             self.driver.execute_script("arguments[0].value = '';", to_input)
             from_input.send_keys(self.from_date_str)
             to_input.send_keys(self.to_date_str)
-            time.sleep(2)
         except Exception as e:
             logger.error(f"[TB_EMBEZZLEMENT : 횡령] -----> ERROR(날짜 설정 실패) : {e}", exc_info=True)
             return False
@@ -77,27 +91,25 @@ class SchedulerServiceTBEmbezzlement:
             search_button = self.wait.until(EC.element_to_be_clickable(
                 (By.XPATH, "//a[@class='btn-sprite type-00 vmiddle search-btn' and @title='검색']")
             ))
-            self.driver.execute_script("arguments[0].click();", search_button)
-            time.sleep(5)
+            self.nav.click_and_wait(search_button)
         except Exception as e:
             logger.error(f"[TB_EMBEZZLEMENT : 횡령] -----> ERROR(검색 버튼 클릭 실패) : {e}", exc_info=True)
             False
 
-    def click_next_page(self):
-        """다음 페이지 버튼 클릭"""
+    def click_next_page(self, page):
+        """페이지 이동 (목록 교체까지 대기)"""
         try:
-            next_button = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//a[@href='#nextPage' and contains(@class, 'next')]")))
-            self.driver.execute_script("arguments[0].click();", next_button)
-            time.sleep(3)
+            self.nav.go_to_page(page)
+            self.browser.count_page()
             return True
         except Exception as e:
-            logger.error(f"[TB_EMBEZZLEMENT : 횡령] -----> ERROR(다음 페이지가 존재하지 않습니다.) : {e}", exc_info=True)
+            logger.error(f"[TB_EMBEZZLEMENT : 횡령] -----> ERROR({page} 페이지 이동 실패) : {e}", exc_info=True)
             return False
         
     def scrape_table(self):
         """표 데이터 수집"""
         try:
-            rows = self.wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "table.list.type-00 tbody tr")))
+            rows = self.nav.rows()
             current_page_data = []
             main_window = self.driver.current_window_handle  # 현재 창 핸들 저장
 
@@ -111,33 +123,35 @@ class SchedulerServiceTBEmbezzlement:
                 company_name = company_element.text.strip()
                 stock_code = "N/A"  # 기본값 설정
 
-                try:
-                    # 기업명 클릭하여 새 창 열기
-                    self.driver.execute_script("arguments[0].click();", company_element)
-                    time.sleep(2)
+                stock_code = self.resolver.lookup(company_name) or stock_code
+                # 인덱스에 없는 경우에만 팝업으로 종목코드 조회
+                if stock_code == "N/A":
+                    try:
+                        # 기업명 클릭하여 새 창 열기
+                        handles_before = set(self.driver.window_handles)
+                        self.driver.execute_script("arguments[0].click();", company_element)
 
-                    # 새 창으로 전환
-                    self.wait.until(EC.number_of_windows_to_be(2))
-                    new_window = [w for w in self.driver.window_handles if w != main_window][0]
-                    self.driver.switch_to.window(new_window)
+                        # 새 창이 열리면 전환
+                        self.driver.switch_to.window(self.nav.wait_new_window(handles_before))
 
-                    # 종목코드 가져오기
-                    try:
-                        stock_code_element = self.wait.until(EC.presence_of_element_located(
-                            (By.XPATH, "//th[contains(text(), '종목코드')]/following-sibling::td")
-                        ))
-                        stock_code = stock_code_element.text.strip()
-                    except Exception as e:
-                        logger.error(f"[TB_EMBEZZLEMENT : 횡령] -----> ERROR(종목코드 가져오기 실패) : {e}", exc_info=True)
-                        return False
+                        # 종목코드 가져오기
+                        try:
+                            stock_code_element = self.wait.until(EC.presence_of_element_located(
+                                (By.XPATH, "//th[contains(text(), '종목코드')]/following-sibling::td")
+                            ))
+                            stock_code = stock_code_element.text.strip()
+                            self.resolver.remember(company_name, stock_code)
+                        except Exception as e:
+                            logger.error(f"[TB_EMBEZZLEMENT : 횡령] -----> ERROR(종목코드 가져오기 실패) : {e}", exc_info=True)
+                            return False
 
-                    # 새 창 닫고 원래 창으로 복귀
-                    self.driver.close()
-                    self.driver.switch_to.window(main_window)
+                        # 새 창 닫고 원래 창으로 복귀
+                        self.driver.close()
+                        self.driver.switch_to.window(main_window)
 
-                except Exception as e:
-                    logger.error(f"[TB_EMBEZZLEMENT : 횡령] -----> ERROR(링크 클릭 실패) : {e}", exc_info=True)
-                    return False
+                    except Exception as e:
+                        logger.error(f"[TB_EMBEZZLEMENT : 횡령] -----> ERROR(링크 클릭 실패) : {e}", exc_info=True)
+                        return False
 
                 # 공시제목 가져오기
                 public_notice = cols[3].find_element(By.TAG_NAME, "a").get_attribute("title").strip()
@@ -156,31 +170,64 @@ class SchedulerServiceTBEmbezzlement:
             logger.error(f"[TB_EMBEZZLEMENT : 횡령] -----> ERROR(데이터 수집 실패) : {e}", exc_info=True)
             return []
     
-    def run(self):
-        """오늘 날짜 크롤링 시작"""
+    def scrape_http(self):
+        """검색 폼 직접 전송(HTTP, 실험적)으로 전체 페이지 수집"""
+        client = KindHttpClient()
+        try:
+            form = client.build_form("TB_EMBEZZLEMENT", from_date=self.from_date_str, to_date=self.to_date_str)
+            data = []
+            for rows in client.iter_pages("TB_EMBEZZLEMENT", form):
+                for cols in rows:
+                    if len(cols) < 4:
+                        continue
+                    company_name = cell_text(cols[2])
+                    stock_code = client.resolve_stock_code(self.resolver, company_name, cell_link(cols[2]))
+                    notice_link = cell_link(cols[3])
+                    public_notice = (notice_link.get("title") if notice_link is not None else None) or cell_text(cols[3])
+                    data.append({
+                        "번호": cell_text(cols[0]),
+                        "공시일자": cell_text(cols[1]),
+                        "기업명": company_name,
+                        "종목코드": stock_code or "N/A",
+                        "공시제목": public_notice.strip(),
+                    })
+            return data
+        finally:
+            client.close()
+
+    def crawl_selenium(self):
+        """셀레니움 크롤링 (기본 수집 경로, use_http=True면 HTTP 실패 시 대체)"""
+        self.start_driver()
         self.open_page()
         self.set_today_date()
         self.click_search_button()
         
-        page = 1
-        previous_page_data = None
-        
-        while True:
+        # 검색 직후 전체 페이지 수 확인 → 정확한 횟수만큼 이동
+        total_pages = self.nav.total_pages()
+        for page in range(1, total_pages + 1):
+            if page > 1 and not self.click_next_page(page):
+                break
             current_page_data = self.scrape_table()
-
-            # 동일한 페이지 데이터가 반복될 경우 크롤링 종료
-            if not current_page_data or current_page_data == previous_page_data:
+            if not current_page_data:
                 break
-
             self.data.extend(current_page_data)
-            previous_page_data = current_page_data
 
-            if not self.click_next_page():
-                break
-            
-            page += 1
+    def run(self):
+        """오늘 날짜 크롤링 시작 (기본 셀레니움, use_http=True면 HTTP 우선 후 실패 시 셀레니움)"""
+        crawled = False
+        if self.use_http:
+            try:
+                self.data = self.scrape_http()
+                crawled = True
+            except Exception as e:
+                logger.warn(f"[TB_EMBEZZLEMENT : 횡령] -----> HTTP 수집 실패, 셀레니움으로 대체 : {e}")
+                self.data = []
+        if not crawled:
+            try:
+                self.crawl_selenium()
+            finally:
+                self.release_driver()
 
-        self.driver.quit()
         self.crud()
         return pd.DataFrame(self.data)
     
@@ -193,30 +240,19 @@ class SchedulerServiceTBEmbezzlement:
 
             try:
                 query_factory = BaseQueryFactory(conn=conn, model=TB_EMBEZZLEMENT)
-                balance_sheets = query_factory.find_all()
-                tb_embezzlement = pd.DataFrame([row.__dict__ for row in balance_sheets])
-
-                diff = set(zip(tb_embezzlement['STOCK_CODE'].astype(str), tb_embezzlement['DATE'].astype(str)))
-                df[['종목코드','공시일자']] = df[['종목코드','공시일자']].astype(str)
-                insert_df = df.loc[
-                    ~df.apply(lambda row: (row['종목코드'], row['공시일자']) in diff, axis=1)
-                ].reset_index(drop=True)
-
-
-                instances = []
-                for _, row in insert_df.iterrows():
-                    instance = {
-                    "STOCK_CODE": row['종목코드'],
-                    "CORP_NAME": row['기업명'],
-                    "TITLE": row['공시제목'],
-                    "DATE": row['공시일자'],
-                    }
-
-                    instances.append(TB_EMBEZZLEMENT(**instance))
-
-                if instances:
-                    query_factory.insert_multi_row(instances)
-                    logger.info(f"[TB_EMBEZZLEMENT : 횡령] -----> 삽입 : {len(instances)}건 적재 완료")
+                # 수집 공시일자 범위의 키 컬럼만 조회하여 신규 행만 선별
+                insert_df = query_factory.filter_new_rows(
+                    df, {'종목코드': 'STOCK_CODE', '공시일자': 'DATE'}, date_column='DATE'
+                )
+
+                inserted = query_factory.insert_frame(
+                    insert_df,
+                    {'종목코드': 'STOCK_CODE', '기업명': 'CORP_NAME', '공시제목': 'TITLE', '공시일자': 'DATE'},
+                    date_columns=['DATE'],
+                )
+
+                if inserted:
+                    logger.info(f"[TB_EMBEZZLEMENT : 횡령] -----> 삽입 : {inserted}건 적재 완료")
                 else:
                     logger.info("[TB_EMBEZZLEMENT : 횡령] -----> 조회된 데이터가 없습니다.")
                 
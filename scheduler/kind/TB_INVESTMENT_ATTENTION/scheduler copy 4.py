@@ -1,12 +1,12 @@
 import pandas as pd
-import time
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
 from infrastructure.queryFactory.base_orm import BaseQueryFactory
+from infrastructure.kind.stock_code_resolver import StockCodeResolver
+from infrastructure.kind.browser_pool import get_browser_pool
+from infrastructure.kind.navigation import KindNavigator
+from infrastructure.kind.http_client import KindHttpClient, cell_text, cell_link
 from setting.database_orm import SessionLocal
 from db.public.models import *
 from Logger import logger 
@@ -15,30 +15,48 @@ from error.email.email_logger import attach_error_email_handler
     * TB_INVESTMENT_ATTENTION(투자주의환기종목)
         - 투자주의환기 정보를 크롤링하여 DB에 저장하는 스케줄러
         - 스케줄러 주기: 매일
+        - 수집 : 셀레니움(기본), use_http=True면 KIND 검색 폼 직접 전송(실험적, 실제 응답으로 폼 파라미터 미검증) 후 실패 시 셀레니움
 """
 
 class SchedulerServiceTBInvestmentAttention:
-    def __init__(self):
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")  
-        self.driver = webdriver.Chrome(options=options)
+    def __init__(self, use_http=False):
+        # 기본은 셀레니움 수집, use_http=True면 HTTP(실험적) 우선 후 실패 시 셀레니움
+        self.use_http = use_http
+        self.driver = None
+        self.wait = None
+        self.nav = None
+        self.browser = None
         self.url = "https://kind.krx.co.kr/investwarn/hwangiissue.do?method=searchHwangiIssueMain"
-        self.wait = WebDriverWait(self.driver, 20)
         self.data = []
+        # TB_COMPANY 기반 종목코드 해석기 (미스일 때만 새 탭 조회)
+        self.resolver = StockCodeResolver()
         attach_error_email_handler(logger, service_name='WEB:INVESTMENT_ATTENTION 스케줄러')
         
+    def start_driver(self):
+        """셀레니움 드라이버 대여 (공용 브라우저 풀)"""
+        self.browser = get_browser_pool().acquire()
+        self.driver = self.browser.driver
+        self.wait = self.browser.wait
+        self.nav = KindNavigator(self.driver, self.wait)
+
+    def release_driver(self):
+        """브라우저 풀에 드라이버 반납 (종료하지 않고 다음 작업에서 재사용)"""
+        if self.browser is not None:
+            self.browser.release()
+        self.browser = None
+        self.driver = None
+        self.wait = None
+        self.nav = None
+
     def open_page(self):
-        """웹 페이지 열기"""
-        self.driver.get(self.url)
-        time.sleep(2)
+        """웹 페이지 열기 (로드 완료 및 목록 표 표시까지 대기)"""
+        self.nav.open(self.url, wait_table=True)
+        self.browser.count_page()
 
     def scraping(self):
         new_data = []
         try:
-            rows = self.wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "table.list.type-00 tbody tr")))
+            rows = self.nav.rows()
             for row in rows:
                 cols = row.find_elements(By.TAG_NAME, "td")
                 if len(cols) < 3:
@@ -53,20 +71,24 @@ class SchedulerServiceTBInvestmentAttention:
                 try:
                     link = corp_cell.find_element(By.TAG_NAME, "a")
                     corp_name = link.text.strip()
+                    stock_code = self.resolver.lookup(corp_name)
 
-                    # 새 탭 열기 및 전환
-                    link.send_keys(Keys.CONTROL + Keys.RETURN)
-                    self.driver.switch_to.window(self.driver.window_handles[-1])
-                    time.sleep(1)
+                    # 인덱스에 없는 경우에만 새 탭 열기 및 전환
+                    if not stock_code:
+                        main_window = self.driver.current_window_handle
+                        handles_before = set(self.driver.window_handles)
+                        link.send_keys(Keys.CONTROL + Keys.RETURN)
+                        self.driver.switch_to.window(self.nav.wait_new_window(handles_before))
 
-                    stock_code_element = self.wait.until(EC.presence_of_element_located(
-                        (By.XPATH, "//th[contains(text(), '종목코드')]/following-sibling::td")
-                    ))
-                    stock_code = stock_code_element.text.strip()
+                        stock_code_element = self.wait.until(EC.presence_of_element_located(
+                            (By.XPATH, "//th[contains(text(), '종목코드')]/following-sibling::td")
+                        ))
+                        stock_code = stock_code_element.text.strip()
+                        self.resolver.remember(corp_name, stock_code)
 
-                    # 탭 닫고 메인 탭으로 전환
-                    self.driver.close()
-                    self.driver.switch_to.window(self.driver.window_handles[0])
+                        # 탭 닫고 메인 탭으로 전환
+                        self.driver.close()
+                        self.driver.switch_to.window(main_window)
 
                 except Exception as e:
                     logger.error(f"[TB_INVESTMENT_ATTENTION : 투자주의환기] -----> ERROR : 종목코드 추출 실패 ({corp_name})", exc_info=True)
@@ -83,26 +105,59 @@ class SchedulerServiceTBInvestmentAttention:
 
         return new_data
 
-    def crawler(self):
+    def crawler_http(self):
+        """검색 폼 직접 전송(HTTP, 실험적)으로 전체 페이지 수집"""
+        client = KindHttpClient()
+        try:
+            form = client.build_form("TB_INVESTMENT_ATTENTION")
+            data = []
+            for rows in client.iter_pages("TB_INVESTMENT_ATTENTION", form):
+                for cols in rows:
+                    if len(cols) < 3:
+                        continue
+                    link = cell_link(cols[0])
+                    corp_name = cell_text(link) if link is not None else cell_text(cols[0])
+                    data.append({
+                        "CORP_NAME": corp_name,
+                        "STOCK_CODE": client.resolve_stock_code(self.resolver, corp_name, link),
+                        "DATE": cell_text(cols[1]),
+                        "REASON": cell_text(cols[2]),
+                    })
+            return data
+        finally:
+            client.close()
+
+    def crawler_selenium(self):
+        """셀레니움 크롤링 (기본 수집 경로, use_http=True면 HTTP 실패 시 대체)"""
+        self.start_driver()
         self.open_page()
-        page = 1
-        previous_page_data = None
-        while True:
-            new_data = self.scraping()
-            if not new_data or new_data == previous_page_data:
-                break
-            self.data.extend(new_data)
-            previous_page_data = new_data
+        # 전체 페이지 수 확인 → 정확한 횟수만큼 이동
+        total_pages = self.nav.total_pages()
+        for page in range(1, total_pages + 1):
+            if page > 1:
+                try:
+                    self.nav.go_to_page(page)
+                    self.browser.count_page()
+                except Exception as e:
+                    logger.error(f"[TB_INVESTMENT_ATTENTION : 투자주의환기] -----> ERROR : 다음 페이지 이동 실패: {e}", exc_info=True)
+                    break
+            self.data.extend(self.scraping())
 
+    def crawler(self):
+        """크롤링 시작 (기본 셀레니움, use_http=True면 HTTP 우선 후 실패 시 셀레니움)"""
+        crawled = False
+        if self.use_http:
             try:
-                page += 1
-                self.driver.execute_script(f"fnPageGo('{page}')")
-                time.sleep(2)
+                self.data = self.crawler_http()
+                crawled = True
             except Exception as e:
-                logger.error(f"[TB_INVESTMENT_ATTENTION : 투자주의환기] -----> ERROR : 다음 페이지 이동 실패: {e}", exc_info=True)
-                break
-
-        self.driver.quit()
+                logger.warn(f"[TB_INVESTMENT_ATTENTION : 투자주의환기] -----> HTTP 수집 실패, 셀레니움으로 대체 : {e}")
+                self.data = []
+        if not crawled:
+            try:
+                self.crawler_selenium()
+            finally:
+                self.release_driver()
         return self.data
         
     def run(self):
@@ -114,29 +169,19 @@ class SchedulerServiceTBInvestmentAttention:
 
             try:
                 base_query_factory = BaseQueryFactory(conn, TB_INVESTMENT_ATTENTION)
-                balance_sheets = base_query_factory.find_all()
-                investment_df = pd.DataFrame([row.__dict__ for row in balance_sheets])
-
-                diff = set(zip(investment_df['STOCK_CODE'].astype(str), investment_df['DATE'].astype(str)))
-                investment_api[['STOCK_CODE','DATE']] = investment_api[['STOCK_CODE','DATE']].astype(str)
-                insert_df = investment_api.loc[~investment_api.apply(lambda row: (row['STOCK_CODE'], row['DATE']) in diff, axis=1)].reset_index(drop=True)
-         
-
-                instances = []
-
-                for _, row in insert_df.iterrows():
-                  instance = {
-                  "STOCK_CODE": row['STOCK_CODE'],
-                  "CORP_NAME": row['CORP_NAME'],
-                  "DATE": row['DATE'],
-                  "REASON": row['REASON'],
-                  }
-
-                  instances.append(TB_INVESTMENT_ATTENTION(**instance))
-
-                if instances:
-                    base_query_factory.insert_multi_row(instances)
-                    logger.info(f"[TB_INVESTMENT_ATTENTION : 투자주의환기] -----> 삽입 : {len(instances)}건 적재 완료")
+                # 수집 일자 범위의 키 컬럼만 조회하여 신규 행만 선별
+                insert_df = base_query_factory.filter_new_rows(
+                    investment_api, {'STOCK_CODE': 'STOCK_CODE', 'DATE': 'DATE'}, date_column='DATE'
+                )
+
+                inserted = base_query_factory.insert_frame(
+                    insert_df,
+                    {'STOCK_CODE': 'STOCK_CODE', 'CORP_NAME': 'CORP_NAME', 'DATE': 'DATE', 'REASON': 'REASON'},
+                    date_columns=['DATE'],
+                )
+
+                if inserted:
+                    logger.info(f"[TB_INVESTMENT_ATTENTION : 투자주의환기] -----> 삽입 : {inserted}건 적재 완료")
                 else:
                     logger.info("[TB_INVESTMENT_ATTENTION : 투자주의환기] -----> 조회된 데이터가 없습니다.")
             except Exception as e:
@@ -1,13 +1,14 @@
 import pandas as pd
-from datetime import timedelta
 import datetime
-import time
-from selenium import webdriver
+import copy
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from infrastructure.queryFactory.base_orm import BaseQueryFactory
+from infrastructure.kind.stock_code_resolver import StockCodeResolver
+from infrastructure.kind.browser_pool import get_browser_pool
+from infrastructure.kind.navigation import KindNavigator
+from infrastructure.kind.http_client import KindHttpClient, WARNING_MENU_INDEX, cell_text, cell_link
 from setting.database_orm import SessionLocal
 from db.public.models import *
 from Logger import logger 
@@ -16,27 +17,45 @@ from error.email.email_logger import attach_error_email_handler
     * TB_INVESTMENT_WARNING(투자주의/경고/위험종목)
         - 투자주의/경고/위험종목 정보를 크롤링하여 DB에 저장하는 스케줄러
         - 스케줄러 주기: 매일
+        - 수집 : 셀레니움(기본), use_http=True면 KIND 검색 폼 직접 전송(실험적, 실제 응답으로 폼 파라미터 미검증) 후 실패 시 셀레니움
 """
 
 class SchedulerServiceTBInvestmentWarning:
-    def __init__(self):
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")  
-        self.driver = webdriver.Chrome(options=options)
+    def __init__(self, use_http=False):
+        # 기본은 셀레니움 수집, use_http=True면 HTTP(실험적) 우선 후 실패 시 셀레니움
+        self.use_http = use_http
+        self.driver = None
+        self.wait = None
+        self.nav = None
+        self.browser = None
         # 날짜 및 연도 설정
         self.today = datetime.datetime.today().strftime("%Y-%m-%d")
         self.lastweek = (datetime.datetime.today() - datetime.timedelta(days=7)).strftime("%Y-%m-%d")
         self.url = "https://kind.krx.co.kr/investwarn/investattentwarnrisky.do?method=investattentwarnriskyMain#"
-        self.wait = WebDriverWait(self.driver, 20)
         self.data = []
+        # TB_COMPANY 기반 종목코드 해석기 (미스일 때만 팝업 조회)
+        self.resolver = StockCodeResolver()
         attach_error_email_handler(logger, service_name='WEB:INVESTMENT_WARNING 스케줄러')
+    def start_driver(self):
+        """셀레니움 드라이버 대여 (공용 브라우저 풀)"""
+        self.browser = get_browser_pool().acquire()
+        self.driver = self.browser.driver
+        self.wait = self.browser.wait
+        self.nav = KindNavigator(self.driver, self.wait)
+
+    def release_driver(self):
+        """브라우저 풀에 드라이버 반납 (종료하지 않고 다음 작업에서 재사용)"""
+        if self.browser is not None:
+            self.browser.release()
+        self.browser = None
+        self.driver = None
+        self.wait = None
+        self.nav = None
+
     def open_page(self):
-        """웹 페이지 열기"""
-        self.driver.get(self.url)
-        time.sleep(3)
+        """웹 페이지 열기 (로드 완료까지 대기)"""
+        self.nav.open(self.url)
+        self.browser.count_page()
 
     def set_today_date(self):
       """오늘 날짜로 조회 설정"""
@@ -50,7 +69,6 @@ class SchedulerServiceTBInvestmentWarning:
           to_input.clear()
           from_input.send_keys(self.lastweek)
           to_input.send_keys(self.today)
-          time.sleep(2)
       except Exception as e:
           pass
       
@@ -60,17 +78,15 @@ class SchedulerServiceTBInvestmentWarning:
             search_button = self.wait.until(EC.element_to_be_clickable(
                 (By.XPATH, "//a[@class='btn-sprite type-00 vmiddle search-btn' and @title='검색']")
             ))
-            self.driver.execute_script("arguments[0].click();", search_button)
-            time.sleep(5)
+            self.nav.click_and_wait(search_button)
         except Exception as e:
             pass
         
-    def click_next_page(self, category):
-        """다음 페이지 버튼 클릭"""
+    def click_next_page(self, page):
+        """페이지 이동 (목록 교체까지 대기)"""
         try:
-            next_button = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//a[@href='#nextPage' and contains(@class, 'next')]")))
-            self.driver.execute_script("arguments[0].click();", next_button)
-            time.sleep(3)
+            self.nav.go_to_page(page)
+            self.browser.count_page()
             return True
         except Exception:
             return False
@@ -86,9 +102,7 @@ class SchedulerServiceTBInvestmentWarning:
             tab_button = self.wait.until(EC.element_to_be_clickable(
                 (By.XPATH, f"//li/a[@title='{category_map[category]}']")
             ))
-            tab_button.click()
-            time.sleep(3)
-            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table.list.type-00 tbody tr")))
+            self.nav.click_and_wait(tab_button)
             return True
         except Exception as e:
             return False
@@ -96,7 +110,7 @@ class SchedulerServiceTBInvestmentWarning:
     def parser(self, category):
         """현재 페이지의 데이터를 크롤링"""
         try:
-            rows = self.wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "table.list.type-00 tbody tr")))
+            rows = self.nav.rows()
             current_page_data = []
             main_window = self.driver.current_window_handle  # 현재 창 핸들 저장
 
@@ -110,32 +124,34 @@ class SchedulerServiceTBInvestmentWarning:
                 stock_name = company_element.text.strip()
                 stock_code = "N/A"  # 기본값 설정
 
-                try:
-                    # 종목명 클릭하여 새 창 열기
-                    self.driver.execute_script("arguments[0].click();", company_element)
-                    time.sleep(2)
-
-                    # 새 창으로 전환
-                    self.wait.until(EC.number_of_windows_to_be(2))
-                    new_window = [w for w in self.driver.window_handles if w != main_window][0]
-                    self.driver.switch_to.window(new_window)
-
-                    # 종목코드 가져오기
+                stock_code = self.resolver.lookup(stock_name) or stock_code
+                # 인덱스에 없는 경우에만 팝업으로 종목코드 조회
+                if stock_code == "N/A":
                     try:
-                        stock_code_element = self.wait.until(EC.presence_of_element_located(
-                            (By.XPATH, "//th[contains(text(), '종목코드')]/following-sibling::td")
-                        ))
-                        stock_code = stock_code_element.text.strip()
+                        # 종목명 클릭하여 새 창 열기
+                        handles_before = set(self.driver.window_handles)
+                        self.driver.execute_script("arguments[0].click();", company_element)
+
+                        # 새 창이 열리면 전환
+                        self.driver.switch_to.window(self.nav.wait_new_window(handles_before))
+
+                        # 종목코드 가져오기
+                        try:
+                            stock_code_element = self.wait.until(EC.presence_of_element_located(
+                                (By.XPATH, "//th[contains(text(), '종목코드')]/following-sibling::td")
+                            ))
+                            stock_code = stock_code_element.text.strip()
+                            self.resolver.remember(stock_name, stock_code)
+                        except Exception as e:
+                            pass
+
+                        # 새 창 닫고 원래 창으로 복귀
+                        self.driver.close()
+                        self.driver.switch_to.window(main_window)
+
                     except Exception as e:
                         pass
 
-                    # 새 창 닫고 원래 창으로 복귀
-                    self.driver.close()
-                    self.driver.switch_to.window(main_window)
-
-                except Exception as e:
-                    pass
-
                 # 데이터 항목 구성
                 if category == "주의":
                     item = {
@@ -166,34 +182,100 @@ class SchedulerServiceTBInvestmentWarning:
         except Exception as e:
             return []
 
-    def crawler(self):
-        """오늘 날짜 크롤링 시작"""
+    def build_item(self, category, cols, stock_name, stock_code):
+        """카테고리별 행 → 데이터 항목 (HTTP 수집용, parser와 동일 구성)"""
+        texts = [cell_text(c) for c in cols]
+        if category == "주의":
+            return {
+                "번호": texts[0],
+                "종목": stock_name,
+                "유형": texts[2],
+                "공시일": texts[3],
+                "지정일": texts[4],
+                "해제일": "",
+                "카테고리": category,
+                "종목코드": stock_code
+            }
+        return {
+            "번호": texts[0],
+            "종목": stock_name,
+            "유형": "",
+            "공시일": texts[2],
+            "지정일": texts[3],
+            "해제일": texts[4] if texts[4] else "해제되지 않음",
+            "카테고리": category,
+            "종목코드": stock_code
+        }
+
+    def crawler_http(self, category):
+        """검색 폼 직접 전송(HTTP, 실험적)으로 카테고리 전체 페이지 수집 (카테고리별 세션)"""
+        client = KindHttpClient()
+        try:
+            data = []
+            form = client.build_form(
+                "TB_INVESTMENT_WARNING", from_date=self.lastweek, to_date=self.today,
+                menuIndex=WARNING_MENU_INDEX[category]
+            )
+            for rows in client.iter_pages("TB_INVESTMENT_WARNING", form):
+                for cols in rows:
+                    if len(cols) < 5:
+                        continue
+                    stock_name = cell_text(cols[1])
+                    stock_code = client.resolve_stock_code(self.resolver, stock_name, cell_link(cols[1])) or "N/A"
+                    data.append(self.build_item(category, cols, stock_name, stock_code))
+            return data
+        finally:
+            client.close()
+
+    def crawler_selenium(self, category):
+        """셀레니움 크롤링 (기본 수집 경로, 카테고리별 드라이버)"""
+        data = []
+        self.start_driver()
         self.open_page()
         self.set_today_date()
         self.click_search_button()
 
-        categories = ["주의", "경고", "위험"]
-        for category in categories:
-            if not self.select_category(category):
-                continue
+        if not self.select_category(category):
+            return data
 
-            previous_page_data = None  # 이전 페이지 데이터 저장
+        # 카테고리 선택 직후 전체 페이지 수 확인 → 정확한 횟수만큼 이동
+        total_pages = self.nav.total_pages()
+        for page in range(1, total_pages + 1):
+            if page > 1 and not self.click_next_page(page):
+                break
+            data.extend(self.parser(category))
+        return data
 
-            while True:
-                page_data = self.parser(category)
-
-                # 이전 페이지 데이터와 현재 데이터가 동일하면 종료
-                if page_data == previous_page_data:
-                    break
-
-                self.data.extend(page_data)
-                previous_page_data = page_data  # 이전 페이지 데이터 갱신
+    def crawl_category(self, category):
+        """카테고리 1개 수집 (기본 셀레니움, use_http=True면 HTTP 우선 후 실패 시 셀레니움)"""
+        if self.use_http:
+            try:
+                return self.crawler_http(category)
+            except Exception as e:
+                logger.warn(f"[TB_INVESTMENT_WARNING : 투자주의/경고/위험] -----> HTTP 수집 실패({category}), 셀레니움으로 대체 : {e}")
 
-                if not self.click_next_page(category):
-                    break
+        # 드라이버 상태(driver/wait/nav)는 작업자별로 분리
+        worker = copy.copy(self)
+        try:
+            return worker.crawler_selenium(category)
+        except Exception as e:
+            logger.error(f"[TB_INVESTMENT_WARNING : 투자주의/경고/위험] -----> ERROR : {category} 수집 실패: {e}", exc_info=True)
+            return []
+        finally:
+            worker.release_driver()
 
-        self.driver.quit()
-        return pd.DataFrame(self.data)
+    def crawler(self):
+        """오늘 날짜 크롤링 시작 (주의/경고/위험 카테고리 병렬 수집 후 병합)"""
+        categories = list(WARNING_MENU_INDEX)
+        with ThreadPoolExecutor(max_workers=len(categories)) as executor:
+            results = executor.map(self.crawl_category, categories)
+            self.data = [item for items in results for item in items]
+
+        df = pd.DataFrame(self.data)
+        if df.empty:
+            return df
+        # 카테고리 간 중복 제거 (DB 비교 키와 동일)
+        return df.drop_duplicates(subset=["종목코드", "공시일", "카테고리", "유형"], keep="first").reset_index(drop=True)
         
     def run(self):
         logger.info("[TB_INVESTMENT_WARNING : 투자주의/경고/위험] -----> 스케줄러 시작")
@@ -204,32 +286,22 @@ class SchedulerServiceTBInvestmentWarning:
 
             try:
                 base_query_factory = BaseQueryFactory(conn, TB_INVESTMENT_WARNING)
-                balance_sheets = base_query_factory.find_all()
-                investment_df = pd.DataFrame([row.__dict__ for row in balance_sheets])
-
-                diff = set(zip(investment_df['STOCK_CODE'].astype(str), investment_df['POST_DATE'].astype(str), investment_df['CATEGORY'], investment_df['TYPE']))
-                investment_api[['종목코드','공시일','카테고리','유형']] = investment_api[['종목코드','공시일','카테고리','유형']].astype(str)
-                insert_df = investment_api.loc[~investment_api.apply(lambda row: (row['종목코드'], row['공시일'], row['카테고리'], row['유형']) in diff, axis=1)].reset_index(drop=True)
-
-                instances = []
-
-                for _, row in insert_df.iterrows():
-                  instance = {
-                  "STOCK_CODE": row['종목코드'],
-                  "CORP_NAME": row['종목'],
-                  "TYPE": row['유형'],
-                  "POST_DATE": row['공시일'] if row['공시일'] not in ["", "-", None] else None,
-                  "DESIGNATED_DATE": row['지정일'] if row['지정일'] not in ["", "-", None] else None,
-                  "CANCLE_DATE": row['해제일'] if row['해제일'] not in ["", "-", None] else None,
-                  "CATEGORY": row['카테고리'],
-                  }
-
-                  
-                  instances.append(TB_INVESTMENT_WARNING(**instance))
-
-                if instances:
-                    base_query_factory.insert_multi_row(instances)
-                    logger.info(f"[TB_INVESTMENT_WARNING : 투자주의/경고/위험] -----> 삽입 : {len(instances)}건 적재 완료")
+                # 수집 공시일 범위의 키 컬럼만 조회하여 신규 행만 선별
+                insert_df = base_query_factory.filter_new_rows(
+                    investment_api,
+                    {'종목코드': 'STOCK_CODE', '공시일': 'POST_DATE', '카테고리': 'CATEGORY', '유형': 'TYPE'},
+                    date_column='POST_DATE',
+                )
+
+                inserted = base_query_factory.insert_frame(
+                    insert_df,
+                    {'종목코드': 'STOCK_CODE', '종목': 'CORP_NAME', '유형': 'TYPE', '공시일': 'POST_DATE',
+                     '지정일': 'DESIGNATED_DATE', '해제일': 'CANCLE_DATE', '카테고리': 'CATEGORY'},
+                    date_columns=['POST_DATE', 'DESIGNATED_DATE', 'CANCLE_DATE'],
+                )
+
+                if inserted:
+                    logger.info(f"[TB_INVESTMENT_WARNING : 투자주의/경고/위험] -----> 삽입 : {inserted}건 적재 완료")
                 else:
                     logger.info("[TB_INVESTMENT_WARNING : 투자주의/경고/위험] -----> 조회된 데이터가 없습니다.")
             except Exception as e:
@@ -1,13 +1,12 @@
-import time
 import pandas as pd
 import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 
 from infrastructure.queryFactory.base_orm import BaseQueryFactory
+from infrastructure.kind.browser_pool import get_browser_pool
+from infrastructure.kind.navigation import KindNavigator
+from infrastructure.kind.http_client import KindHttpClient, cell_text
 from setting.database_orm import SessionLocal
 from db.public.models import TB_MANAGEMENT
 from Logger import logger 
@@ -16,25 +15,40 @@ from error.email.email_logger import attach_error_email_handler
     * TB_MANAGEMENT(관리종목)
         - 관리종목 지정 기업 정보를 크롤링하여 DB(TB_MANAGEMENT)에 저장하는 스케줄러
         - 스케줄러 주기: 매일
+        - 수집 : 셀레니움(기본), use_http=True면 KIND 검색 폼 직접 전송(실험적, 실제 응답으로 폼 파라미터 미검증) 후 실패 시 셀레니움
 """
 
 class SchedulerServiceTBManagement:
-    def __init__(self):
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--remote-debugging-port=9222")
-
-        self.driver = webdriver.Chrome(options=options)
+    def __init__(self, use_http=False):
+        # 기본은 셀레니움 수집, use_http=True면 HTTP(실험적) 우선 후 실패 시 셀레니움
+        self.use_http = use_http
+        self.driver = None
+        self.wait = None
+        self.nav = None
+        self.browser = None
         self.url = "https://kind.krx.co.kr/investwarn/adminissue.do?method=searchAdminIssueList"
-        self.wait = WebDriverWait(self.driver, 20)
         self.data = []
         attach_error_email_handler(logger, service_name='WEB:MANAGEMENT 스케줄러')
+    def start_driver(self):
+        """셀레니움 드라이버 대여 (공용 브라우저 풀)"""
+        self.browser = get_browser_pool().acquire()
+        self.driver = self.browser.driver
+        self.wait = self.browser.wait
+        self.nav = KindNavigator(self.driver, self.wait)
+
+    def release_driver(self):
+        """브라우저 풀에 드라이버 반납 (종료하지 않고 다음 작업에서 재사용)"""
+        if self.browser is not None:
+            self.browser.release()
+        self.browser = None
+        self.driver = None
+        self.wait = None
+        self.nav = None
+
     def open_page(self):
-        self.driver.get(self.url)
-        time.sleep(2)
+        # 로드 완료 및 목록 표 표시까지 대기
+        self.nav.open(self.url, wait_table=True)
+        self.browser.count_page()
 
     def scrape_table(self):
         try:
@@ -72,13 +86,48 @@ class SchedulerServiceTBManagement:
             logger.error(f"[TB_MANAGEMENT] -----> 테이블 파싱 실패: {e}", exc_info=True)
             return []
 
-    def run(self):
+    def scrape_http(self):
+        """검색 폼 직접 전송(HTTP, 실험적)으로 전체 페이지 수집"""
+        client = KindHttpClient()
         try:
-            self.open_page()
-            self.data.extend(self.scrape_table())
+            form = client.build_form("TB_MANAGEMENT")
+            page_data = []
+            for rows in client.iter_pages("TB_MANAGEMENT", form):
+                for cols in rows:
+                    if len(cols) < 3:
+                        continue
+                    date_str = cell_text(cols[1])
+                    try:
+                        date = pd.to_datetime(date_str)
+                    except Exception as e:
+                        logger.error(f"[TB_MANAGEMENT] -----> 날짜 파싱 실패: {date_str} / {e}", exc_info=True)
+                        continue
+                    page_data.append({
+                        "CORP_NAME": cell_text(cols[0]),
+                        "DATE": date,
+                        "REASON": cell_text(cols[2]),
+                    })
+            return page_data
         finally:
-            if self.driver:
-                self.driver.quit()
+            client.close()
+
+    def run(self):
+        crawled = False
+        if self.use_http:
+            try:
+                self.data = self.scrape_http()
+                crawled = True
+            except Exception as e:
+                logger.warn(f"[TB_MANAGEMENT] -----> HTTP 수집 실패, 셀레니움으로 대체 : {e}")
+                self.data = []
+
+        if not crawled:
+            self.start_driver()
+            try:
+                self.open_page()
+                self.data.extend(self.scrape_table())
+            finally:
+                self.release_driver()
 
         self.crud()
         return pd.DataFrame(self.data)
@@ -99,25 +148,16 @@ class SchedulerServiceTBManagement:
         conn = SessionLocal()
         try:
             factory = BaseQueryFactory(conn=conn, model=TB_MANAGEMENT)
-            db_rows = factory.find_all()
-            existing_keys = set((r.CORP_NAME, r.DATE.date() if hasattr(r.DATE, "date") else r.DATE) for r in db_rows)
 
             df = df.drop_duplicates(subset=["CORP_NAME", "DATE_ONLY"], keep="first").copy()
-            df["__KEY__"] = list(zip(df["CORP_NAME"], df["DATE_ONLY"]))
-            df_new = df.loc[~df["__KEY__"].isin(existing_keys)].copy()
-
-            instances = []
-            for _, row in df_new.iterrows():
-                instance = TB_MANAGEMENT(
-                    CORP_NAME=row["CORP_NAME"],
-                    DATE=row["DATE"],
-                    REASON=row["REASON"],
-                )
-                instances.append(instance)
-
-            if instances:
-                factory.insert_multi_row(instances)
-                logger.info(f"[TB_MANAGEMENT] -----> 삽입 완료: {len(instances)}건")
+            # 지정일 범위의 키 컬럼만 조회하여 신규 행만 선별
+            df_new = factory.filter_new_rows(df, {"CORP_NAME": "CORP_NAME", "DATE_ONLY": "DATE"}, date_column="DATE")
+
+            inserted = factory.insert_frame(
+                df_new, {"CORP_NAME": "CORP_NAME", "DATE_ONLY": "DATE", "REASON": "REASON"}, date_columns=["DATE"]
+            )
+            if inserted:
+                logger.info(f"[TB_MANAGEMENT] -----> 삽입 완료: {inserted}건")
 
         except Exception as e:
             logger.error(f"[TB_MANAGEMENT] -----> Insert 실패: {e}", exc_info=True)
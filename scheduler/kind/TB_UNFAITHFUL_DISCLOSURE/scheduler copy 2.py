@@ -1,13 +1,13 @@
 import pandas as pd
-import time
 import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 
 from infrastructure.queryFactory.base_orm import BaseQueryFactory
+from infrastructure.kind.stock_code_resolver import StockCodeResolver
+from infrastructure.kind.browser_pool import get_browser_pool
+from infrastructure.kind.navigation import KindNavigator
+from infrastructure.kind.http_client import KindHttpClient, cell_text, cell_link
 from setting.database_orm import SessionLocal
 from db.public.models import *
 from Logger import logger 
@@ -17,31 +17,48 @@ from error.email.email_logger import attach_error_email_handler
     * TB_UNFAITHFUL_DISCLOSURE(불성실공시)
         - 불성실공시 지정 기업 정보를 크롤링하여 DB(TB_UNFAITHFUL_DISCLOSURE)에 저장하는 스케줄러
         - 스케줄러 주기: 매일
+        - 수집 : 셀레니움(기본), use_http=True면 KIND 검색 폼 직접 전송(실험적, 실제 응답으로 폼 파라미터 미검증) 후 실패 시 셀레니움
         - 수집 항목: 번호, 기업명, 종목코드, 벌점, 제재금, 공시책임자교체, 불성실유형, 지정일, 지정사유
 """
 
 
 
 class SchedulerServiceTBUnfaithfulDisclosure:
-    def __init__(self):
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--remote-debugging-port=9222")
-
-        self.driver = webdriver.Chrome(options=options)
+    def __init__(self, use_http=False):
+        # 기본은 셀레니움 수집, use_http=True면 HTTP(실험적) 우선 후 실패 시 셀레니움
+        self.use_http = use_http
+        self.driver = None
+        self.wait = None
+        self.nav = None
+        self.browser = None
         self.url = "https://kind.krx.co.kr/investwarn/undisclosure.do?method=searchUnfaithfulDisclosureCorpList"
-        self.wait = WebDriverWait(self.driver, 20)
         self.data = []
+        # TB_COMPANY 기반 종목코드 해석기 (미스일 때만 팝업 조회)
+        self.resolver = StockCodeResolver()
 
         today = datetime.datetime.today()
         self.today_year = today.strftime("%Y")
         attach_error_email_handler(logger, service_name='WEB:UNFAITHFUL_DISCLOSURE 스케줄러')
+    def start_driver(self):
+        """셀레니움 드라이버 대여 (공용 브라우저 풀)"""
+        self.browser = get_browser_pool().acquire()
+        self.driver = self.browser.driver
+        self.wait = self.browser.wait
+        self.nav = KindNavigator(self.driver, self.wait)
+
+    def release_driver(self):
+        """브라우저 풀에 드라이버 반납 (종료하지 않고 다음 작업에서 재사용)"""
+        if self.browser is not None:
+            self.browser.release()
+        self.browser = None
+        self.driver = None
+        self.wait = None
+        self.nav = None
+
     def open_page(self):
-        self.driver.get(self.url)
-        time.sleep(2)
+        # 로드 완료 및 목록 표 표시까지 대기
+        self.nav.open(self.url, wait_table=True)
+        self.browser.count_page()
 
     def scrape_table(self):
         try:
@@ -60,27 +77,30 @@ class SchedulerServiceTBUnfaithfulDisclosure:
                 stock_code = "N/A"
 
                 # 종목명 클릭 → 새 창에서 종목코드 가져오기
-                try:
-                    link = cols[1].find_element(By.TAG_NAME, "a")
-                    self.driver.execute_script("arguments[0].click();", link)
-                    time.sleep(2)
-
-                    self.wait.until(EC.number_of_windows_to_be(2))
-                    new_window = [w for w in self.driver.window_handles if w != main_window][0]
-                    self.driver.switch_to.window(new_window)
-
-                    stock_code_element = self.wait.until(
-                        EC.presence_of_element_located(
-                            (By.XPATH, "//th[contains(text(), '종목코드')]/following-sibling::td")
+                stock_code = self.resolver.lookup(company_name) or stock_code
+                # 인덱스에 없는 경우에만 팝업으로 종목코드 조회
+                if stock_code == "N/A":
+                    try:
+                        link = cols[1].find_element(By.TAG_NAME, "a")
+                        handles_before = set(self.driver.window_handles)
+                        self.driver.execute_script("arguments[0].click();", link)
+
+                        # 새 창이 열리면 전환
+                        self.driver.switch_to.window(self.nav.wait_new_window(handles_before))
+
+                        stock_code_element = self.wait.until(
+                            EC.presence_of_element_located(
+                                (By.XPATH, "//th[contains(text(), '종목코드')]/following-sibling::td")
+                            )
                         )
-                    )
-                    stock_code = stock_code_element.text.strip()
+                        stock_code = stock_code_element.text.strip()
+                        self.resolver.remember(company_name, stock_code)
 
-                    self.driver.close()
-                    self.driver.switch_to.window(main_window)
+                        self.driver.close()
+                        self.driver.switch_to.window(main_window)
 
-                except Exception as e:
-                    logger.error(f"[TB_UNFAITHFUL_DISCLOSURE] -----> 종목코드 가져오기 실패: {e}", exc_info=True)
+                    except Exception as e:
+                        logger.error(f"[TB_UNFAITHFUL_DISCLOSURE] -----> 종목코드 가져오기 실패: {e}", exc_info=True)
 
                 item = {
                     "번호": cols[0].text.strip(),
@@ -101,15 +121,52 @@ class SchedulerServiceTBUnfaithfulDisclosure:
             logger.error(f"[TB_UNFAITHFUL_DISCLOSURE] -----> 데이터 수집 실패: {e}", exc_info=True)
             return []
 
-    def run(self):
-        """첫 페이지 데이터만 크롤링"""
+    def scrape_http(self):
+        """검색 폼 직접 전송(HTTP, 실험적)으로 첫 페이지 수집"""
+        client = KindHttpClient()
         try:
-            self.open_page()
-            # 첫 페이지만 수집
-            self.data.extend(self.scrape_table())
+            form = client.build_form("TB_UNFAITHFUL_DISCLOSURE")
+            data = []
+            for rows in client.iter_pages("TB_UNFAITHFUL_DISCLOSURE", form, max_pages=1):
+                for cols in rows:
+                    if len(cols) < 8:
+                        continue
+                    company_name = cell_text(cols[1])
+                    stock_code = client.resolve_stock_code(self.resolver, company_name, cell_link(cols[1]))
+                    data.append({
+                        "번호": cell_text(cols[0]),
+                        "기업명": company_name,
+                        "종목코드": stock_code or "N/A",
+                        "벌점": cell_text(cols[2]),
+                        "제재금": cell_text(cols[3]),
+                        "공시책임자교체": cell_text(cols[4]),
+                        "불성실유형": cell_text(cols[5]),
+                        "지정일": cell_text(cols[6]),
+                        "지정사유": cell_text(cols[7]),
+                    })
+            return data
         finally:
-            if self.driver:
-                self.driver.quit()
+            client.close()
+
+    def run(self):
+        """첫 페이지 데이터만 크롤링 (기본 셀레니움, use_http=True면 HTTP 우선 후 실패 시 셀레니움)"""
+        crawled = False
+        if self.use_http:
+            try:
+                self.data = self.scrape_http()
+                crawled = True
+            except Exception as e:
+                logger.warn(f"[TB_UNFAITHFUL_DISCLOSURE] -----> HTTP 수집 실패, 셀레니움으로 대체 : {e}")
+                self.data = []
+
+        if not crawled:
+            self.start_driver()
+            try:
+                self.open_page()
+                # 첫 페이지만 수집
+                self.data.extend(self.scrape_table())
+            finally:
+                self.release_driver()
 
         self.crud()
         return pd.DataFrame(self.data)
@@ -126,42 +183,30 @@ class SchedulerServiceTBUnfaithfulDisclosure:
         # Normalize DATE column
         df["DATE"] = pd.to_datetime(df["지정일"], errors='coerce')
         df["DATE_ONLY"] = df["DATE"].dt.date
-        df["__KEY__"] = list(zip(df["종목코드"], df["불성실유형"], df["DATE_ONLY"]))
 
         conn = SessionLocal()
         try:
             query_factory = BaseQueryFactory(conn=conn, model=TB_UNFAITHFUL_DISCLOSURE)
-            existing_rows = query_factory.find_all()
-            existing_keys = set((r.STOCK_CODE, r.TYPE, r.DATE.date() if hasattr(r.DATE, "date") else r.DATE) for r in existing_rows)
 
             # Drop duplicates inside the batch
             df = df.drop_duplicates(subset=["종목코드","불성실유형","DATE_ONLY"], keep="first")
 
-            # Filter out existing keys
-            df_new = df.loc[~df["__KEY__"].isin(existing_keys)].copy()
+            # Filter out existing keys (지정일 범위의 키 컬럼만 조회)
+            df_new = query_factory.filter_new_rows(
+                df, {"종목코드": "STOCK_CODE", "불성실유형": "TYPE", "DATE_ONLY": "DATE"}, date_column="DATE"
+            )
 
             if df_new.empty:
                 logger.info("[TB_UNFAITHFUL_DISCLOSURE] -----> 스케줄러 종료")
                 return
 
-            instances = []
-
-            for _, row in df_new.iterrows():
-                instance = TB_UNFAITHFUL_DISCLOSURE(
-                    STOCK_CODE=row.get('종목코드'),
-                    CORP_NAME=row.get('기업명'),
-                    DEMERIT=row.get('벌점'),
-                    SANCTIONS_AMT=row.get('제재금'),
-                    OFFICER_CHANGE=row.get('공시책임자교체'),
-                    TYPE=row.get('불성실유형'),
-                    DATE=row.get('지정일'),
-                    REASON=row.get('지정사유'),
-                )
-                instances.append(instance)
-
-            if instances:
-                query_factory.insert_multi_row(instances)
-                logger.info(f"[TB_UNFAITHFUL_DISCLOSURE] -----> 삽입 완료: {len(instances)}건")
+            inserted = query_factory.insert_frame(
+                df_new,
+                {"종목코드": "STOCK_CODE", "기업명": "CORP_NAME", "벌점": "DEMERIT", "제재금": "SANCTIONS_AMT",
+                 "공시책임자교체": "OFFICER_CHANGE", "불성실유형": "TYPE", "DATE_ONLY": "DATE", "지정사유": "REASON"},
+                date_columns=["DATE"],
+            )
+            logger.info(f"[TB_UNFAITHFUL_DISCLOSURE] -----> 삽입 완료: {inserted}건")
 
         except Exception as e:
             logger.error(f"[TB_UNFAITHFUL_DISCLOSURE] -----> Insert 실패: {e}", exc_info=True)
@@ -4,26 +4,57 @@ from uuid import uuid4
 from db.public.models import *
 from setting.inject import provision_inject_orm
 from datetime import datetime, timedelta
+from typing import Optional
+import warnings
 from infrastructure.queryFactory.base_orm import BaseQueryFactory
-import requests
+from infrastructure.krx.fetcher import KrxFetcher, date_range, DEFAULT_WORKERS
+from infrastructure.krx.columns import parse_krx_numbers
+from infrastructure.krx.partitions import ensure_year_partitions
 import pandas as pd
 from error.email.email_logger import attach_error_email_handler
 """
     * TB_KRX(한국거래소)
         - 코스피, 코스닥 일별 매매 정보를 DB에 저장하는 스케줄러
         - 스케줄러 주기 : 매일
+        - (기준일, 시장) 쌍을 병렬 요청(KrxFetcher)하고 도착하는 순서대로 DB와 키 비교 후 적재
 """
 
+# KRX API 컬럼 → TB_KRX 컬럼
+KRX_COLUMN_MAP = {
+    "ISU_CD": "STOCK_CODE",
+    "BAS_DD": "BAS_DD",
+    "ISU_NM": "ISU_NM",
+    "MKT_NM": "MKT_NM",
+    "SECT_TP_NM": "SECT_TP_NM",
+    "TDD_CLSPRC": "TDD_CLSPRC",
+    "CMPPREVDD_PRC": "CMPPREVDD_PRC",
+    "FLUC_RT": "FLUC_RT",
+    "TDD_OPNPRC": "TDD_OPNPRC",
+    "TDD_HGPRC": "TDD_HGPRC",
+    "TDD_LWPRC": "TDD_LWPRC",
+    "ACC_TRDVOL": "ACC_TRDVOL",
+    "ACC_TRDVAL": "ACC_TRDVAL",
+    "MKTCAP": "MKTCAP",
+    "LIST_SHRS": "LIST_SHRS",
+}
+
 class SchedulerServiceTBKrx:
-    def __init__(self, from_date=None, to_date=None, lookback_days: int = 7):
+    def __init__(self, from_date=None, to_date=None, max_workers: int = DEFAULT_WORKERS, lookback_days: Optional[int] = None):
         # logger request_context내 UUID 직접 할당
         request_context.request_id = str(uuid4())
+        # lookback_days(구 DB 비교 기간)는 더 이상 사용하지 않음 → 기존 호출 호환을 위해 인자만 유지
+        # (DB 비교는 수집한 기준일의 키만 조회하므로 조회 범위는 from_date/to_date로 지정)
+        self.lookback_days = lookback_days
+        if lookback_days is not None:
+            warnings.warn(
+                "SchedulerServiceTBKrx(lookback_days=...)는 더 이상 사용되지 않습니다. 조회 범위는 from_date/to_date로 지정하세요.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            logger.warning(f"[TB_KRX] lookback_days({lookback_days})는 무시됩니다. (from_date/to_date 사용)")
         self.provision = provision_inject_orm()
         self.krx_api_key = self.provision.KRX_API_KEY
-        self.BASE_URLS = {  
-            "KOSPI": "http://data-dbg.krx.co.kr/svc/apis/sto/stk_bydd_trd",
-            "KOSDAQ": "http://data-dbg.krx.co.kr/svc/apis/sto/ksq_bydd_trd",
-        }
+        self.max_workers = max_workers
         # 조회 날짜 범위 설정
         today = datetime.today()
         default_to = (today - timedelta(days=1))
@@ -49,115 +80,65 @@ class SchedulerServiceTBKrx:
             logger.warning(f"[TB_KRX] from_date({self.from_date})가 to_date({self.to_date})보다 커서 스왑합니다.")
             self.from_date, self.to_date = self.to_date, self.from_date
 
-        self.lookback_days = int(lookback_days) if isinstance(lookback_days, int) else 7
         attach_error_email_handler(logger, service_name='WEB:KRX 스케줄러')
     def request(self, bas_dd):
-      result = []
-      for market in ['KOSPI', 'KOSDAQ']:
-        headers = {"AUTH_KEY": self.krx_api_key}
-        params = {"basDd": bas_dd}
-        response = requests.get(self.BASE_URLS[market], headers=headers, params=params)
+      """단일 기준일 코스피/코스닥 조회 (run은 KrxFetcher.iter_frames로 병렬 수집)"""
+      fetcher = KrxFetcher(self.krx_api_key)
+      try:
+          frames = [api for _, _, api in fetcher.iter_frames([bas_dd])]
+      finally:
+          fetcher.close()
+      if not frames:
+          logger.warning(f"[TB_KRX] -----> {bas_dd} 데이터가 없습니다.")
+          return pd.DataFrame()
+      return pd.concat(frames, ignore_index=True)
 
-        data = response.json()
-        result.extend(data.get("OutBlock_1"))
+    def load(self, base_query_factory, api):
+      """수집분 1건(기준일·시장) 적재: DB 키 비교 → 우선주 제외 → 삽입, 삽입 건수 반환"""
+      api['BAS_DD'] = api['BAS_DD'].astype(str)
+      api['ISU_CD'] = api['ISU_CD'].astype(str)
+      insert_df = base_query_factory.filter_new_rows(api, {'BAS_DD': 'BAS_DD', 'ISU_CD': 'STOCK_CODE'}, date_column='BAS_DD')
 
-      api = pd.DataFrame(result)
-      if api.empty:
-          logger.warning(f"[TB_KRX] -----> {bas_dd} 데이터가 없습니다.")
-          return api
-      api.columns = api.columns.str.upper()
-      print(api.columns.tolist())  
-      return api
+      # 우선주에 해당하는 기업은 제외
+      regex = ['5', '7', '9'] + [chr(c) for c in range(ord('K'), ord('Z') + 1)] 
+      insert_df = insert_df[~insert_df['ISU_CD'].astype(str).str[-1].isin(regex)]
+
+      # 가격/거래량/시가총액 콤마 제거 후 숫자 변환 (BIGINT/NUMERIC 컬럼)
+      insert_df = parse_krx_numbers(insert_df)
+
+      return base_query_factory.insert_frame(insert_df, KRX_COLUMN_MAP, date_columns=['BAS_DD'])
         
     def run(self):
         logger.info("[TB_KRX : 한국거래소] -----> 스케줄러 시작")
-        start_date = datetime.strptime(self.from_date, "%Y%m%d")
-        end_date = datetime.strptime(self.to_date, "%Y%m%d")
-        date_list = [(start_date + timedelta(days=i)).strftime("%Y%m%d") for i in range((end_date - start_date).days + 1)]
-        combined = []
-        try:
-            for date in date_list:
-                logger.info(f"[TB_KRX] -----> {date} 데이터 요청 중...")
-                api_part = self.request(date)
-                if not api_part.empty:
-                    combined.append(api_part)
-
-            if not combined:
-                logger.info("[TB_KRX] -----> 조회된 데이터가 없습니다.")
-                return
-
-            api = pd.concat(combined, ignore_index=True)
-        except Exception as e:
-            logger.error("[TB_KRX : 한국거래소] -----> ERROR : API 요청 실패", exc_info=True)
-            logger.info("[KRX : 한국거래소] -----> 스케줄러 종료")
-            return
-
+        date_list = date_range(self.from_date, self.to_date)
+        fetcher = KrxFetcher(self.krx_api_key, max_workers=self.max_workers)
+        total = 0
         try:
           with SessionLocal() as conn:
               base_query_factory = BaseQueryFactory(conn, TB_KRX)
+              # 수집 연도 파티션 사전 생성 (BAS_DD 연도별 RANGE 파티션)
+              ensure_year_partitions(conn, {int(bas_dd[:4]) for bas_dd in date_list})
 
-              # KRX 테이블에서 최신 1주일 데이터 쿼리
-              a_week_ago = (datetime.strptime(self.to_date, "%Y%m%d") - timedelta(days=self.lookback_days)).strftime("%Y%m%d")
-              balance_sheets = conn.query(TB_KRX).filter(TB_KRX.BAS_DD >= a_week_ago).all()
-              if balance_sheets:
-                  db = pd.DataFrame([row.__dict__ for row in balance_sheets])
-                  if "_sa_instance_state" in db.columns:
-                        db = db.drop(columns=["_sa_instance_state"])
-              else:
-                  db = pd.DataFrame(columns=['BAS_DD', 'STOCK_CODE'])
-
-              if not db.empty:
-                    db["BAS_DD"] = pd.to_datetime(db["BAS_DD"], errors="coerce").dt.strftime("%Y%m%d")
-                    db["STOCK_CODE"] = db["STOCK_CODE"].astype(str)
-                    diff = set(zip(db["BAS_DD"], db["STOCK_CODE"]))      
-              else:
-                  diff = set()
-
-              api['BAS_DD'] = api['BAS_DD'].astype(str)
-              api['ISU_CD'] = api['ISU_CD'].astype(str)    
-              db = pd.DataFrame([row.__dict__ for row in balance_sheets])
-
-              insert_df = api.loc[~api.apply(lambda row: (row['BAS_DD'], row['ISU_CD']) in diff, axis=1)].reset_index(drop=True)
-
-              # 우선주에 해당하는 기업은 제외
-              regex = ['5', '7', '9'] + [chr(c) for c in range(ord('K'), ord('Z') + 1)] 
-              insert_df = insert_df[~insert_df['ISU_CD'].astype(str).str[-1].isin(regex)]
-
-              instances = []
-
-              for _, row in insert_df.iterrows():
-                instance = {
-                "STOCK_CODE": row['ISU_CD'],
-                "BAS_DD": row['BAS_DD'],
-                "ISU_NM": row['ISU_NM'],
-                "MKT_NM": row['MKT_NM'],
-                "SECT_TP_NM": row['SECT_TP_NM'],
-                "TDD_CLSPRC": row['TDD_CLSPRC'],
-                "CMPPREVDD_PRC": row['CMPPREVDD_PRC'],
-                "FLUC_RT": row['FLUC_RT'],
-                "TDD_OPNPRC": row['TDD_OPNPRC'],
-                "TDD_HGPRC": row['TDD_HGPRC'],
-                "TDD_LWPRC": row['TDD_LWPRC'],
-                "ACC_TRDVOL": row['ACC_TRDVOL'],
-                "ACC_TRDVAL": row['ACC_TRDVAL'],
-                "MKTCAP": row['MKTCAP'],
-                "LIST_SHRS": row['LIST_SHRS'],
-                }
-
-                instances.append(TB_KRX(**instance))
-
-              if instances:
+              # (기준일, 시장) 병렬 요청 → 도착하는 순서대로 적재
+              for bas_dd, market, api in fetcher.iter_frames(date_list):
                   try:
-                      base_query_factory.insert_multi_row(instances)
-                      logger.info(f"[KRX : 한국거래소] -----> 삽입 : {len(instances)}건 적재 완료")
-
+                      inserted = self.load(base_query_factory, api)
+                      total += inserted
+                      logger.info(f"[KRX : 한국거래소] -----> {bas_dd} {market} 삽입 : {inserted}건 적재 완료")
                   except Exception as e:
-                      logger.error(f"[KRX : 한국거래소] -----> ERROR : Insert failed: {e}", exc_info=True)
+                      logger.error(f"[KRX : 한국거래소] -----> ERROR : {bas_dd} {market} Insert failed: {e}", exc_info=True)
                       raise
-              else:
-                  logger.info("[KRX : 한국거래소] -----> 조회된 데이터가 없습니다")
+
+          if fetcher.failed:
+              logger.warning(f"[KRX : 한국거래소] -----> 요청 실패 {len(fetcher.failed)}건 : {sorted(fetcher.failed)}")
+          if total:
+              logger.info(f"[KRX : 한국거래소] -----> 삽입 : 총 {total}건 적재 완료")
+          else:
+              logger.info("[KRX : 한국거래소] -----> 조회된 데이터가 없습니다")
 
         except Exception as e:
             logger.error(f"[KRX : 한국거래소] -----> ERROR : {e}", exc_info=True)
+        finally:
+            fetcher.close()
 
-        logger.info("[KRX : 한국거래소] -----> 스케줄러 종료")
\ No newline at end of file
+        logger.info("[KRX : 한국거래소] -----> 스케줄러 종료")
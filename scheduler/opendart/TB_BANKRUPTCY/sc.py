@@ -5,99 +5,157 @@ from infrastructure.opendart.api.service import opendart_bankruptcy_api
 from infrastructure.queryFactory.TB_COMPANY.queryFactory import TBCompanyQueryFactory
 from db.public.models import TB_BANKRUPTCY
 from setting.inject import provision_inject_orm
-from datetime import datetime
+from datetime import date, datetime
 from infrastructure.queryFactory.base_orm import BaseQueryFactory
+from infrastructure.opendart.run_state import RunCheckpoint, COMPLETE, FAILED, SUCCESS, NO_DATA, FAIL
 from error.opendart.errors import OPENDART_ERROR_MESSAGES
 from error.email.email_logger import attach_error_email_handler
 
 """
     * TB_BANKRUPTCY(부도발생)
         - 부도발생 정보를 DB에 저장하는 스케줄러
+        - 기업 flush_every곳마다 적재 + 체크포인트(TB_RUN_STATE) 커밋 → 중단 시 당일 재실행은 남은 기업부터 재개
+        - 조회 성공(SUCCESS) 기록은 해당 기업의 데이터가 적재된 뒤(_flush)에만 남김
+          → 예외로 중단되면 미커밋 기록을 롤백한 뒤 실행 상태만 FAILED로 저장 (버퍼에 남은 기업은 다음 실행에서 재처리)
+        - API 호출은 timeout 적용, 요청/응답 파싱 실패는 해당 기업만 FAIL 기록 후 계속 진행
         - 스케줄러 주기 : 매일
 """
 
 class SchedulerServiceTBBankruptcy:
-    def __init__(self):
+    def __init__(self, resume: bool = True, only_failed: bool = False, flush_every: int = 100, api_timeout: float = 30):
         # logger request_context내 UUID 직접 할당
         request_context.request_id = str(uuid4())
         self.provision = provision_inject_orm()
         self.openDart_api_key = self.provision.OPENDART_API_KEY
         attach_error_email_handler(logger, service_name='WEB:BANKRUPTCY 스케줄러')
+        # resume: 중단된 당일 실행 이어받기, only_failed: 당일 실행의 실패 기업만 재처리
+        self.resume = resume
+        self.only_failed = only_failed
+        self.flush_every = flush_every
+        self.api_timeout = api_timeout
         
+    def _to_instances(self, items: list, existing_keys: set) -> list:
+        instances = []
+        for item in items:
+            key = (item['corp_code'], item['rcept_no'])
+            if key in existing_keys:
+                logger.info(f"Skipping duplicate: {key}")
+                continue
+
+            dfd_value = item['dfd']
+            
+            dfd = None
+            if dfd_value not in ('-', ''):
+                try:
+                    dfd = datetime.strptime(dfd_value, '%Y년 %m월 %d일').date()
+                except ValueError:
+                    logger.warning(f"Invalid date format for {key}: {dfd_value}")
+
+            instance = {
+                "CORP_CODE": item['corp_code'],
+                "RCEPT_NO": item['rcept_no'],
+                "CORP_CLS": item['corp_cls'],
+                "CORP_NAME": item['corp_name'],
+                "DF_CN": item['df_cn'],
+                "DF_AMT": item['df_amt'],
+                "DF_BNK": item['df_bnk'],
+                "DFD": dfd,
+                "DF_RS": item['df_rs'],
+            }
+
+            instances.append(TB_BANKRUPTCY(**instance))
+            existing_keys.add(key)
+        return instances
+
+    def _flush(self, base_query_factory: BaseQueryFactory, checkpoint: RunCheckpoint, instances: list, corp_codes: list) -> int:
+        """버퍼 적재 성공 후 버퍼에 담긴 기업의 SUCCESS 기록 + 커밋 (적재 실패 시 기록하지 않고 예외 전파)"""
+        if instances:
+            try:
+                base_query_factory.insert_multi_row(instances)
+                logger.info(f"[TB_BANKRUPTCY : 부도발생] -----> 삽입 : {len(instances)}건 적재 완료")
+            except Exception as e:
+                logger.error(f"[TB_BANKRUPTCY : 부도발생] -----> ERROR : Insert failed: {e}", exc_info=True)
+                raise
+        for code in corp_codes:
+            checkpoint.record(code, SUCCESS)
+        base_query_factory.conn.commit()
+        return len(instances)
+
     def run(self):
         logger.info("[TB_BANKRUPTCY : 부도발생] -----> 스케줄러 시작")
-        result = []
-        log_errors = set()
+        inserted = 0
 
         with SessionLocal() as conn:
             company_query_factory = TBCompanyQueryFactory(conn)
             base_query_factory = BaseQueryFactory(conn, TB_BANKRUPTCY)
-            corp_codes = [code[0] for code in company_query_factory.corp_code()]
+            # 조회 기간이 당일로 고정 → 체크포인트 대상도 당일
+            checkpoint = RunCheckpoint(conn, job="TB_BANKRUPTCY", bas_dd=date.today())
+            corp_codes = checkpoint.start(
+                [code[0] for code in company_query_factory.corp_code()], resume=self.resume, only_failed=self.only_failed
+            )
             # 중복 체크
-            existing_keys = {(row.CORP_CODE, row.RCEPT_NO) for row in base_query_factory.find_all()}
+            existing_keys = set()
+            for chunk in base_query_factory.iter_key_chunks("CORP_CODE", "RCEPT_NO"):
+                existing_keys.update(chunk)
 
-            for code in corp_codes:
-                json_data = opendart_bankruptcy_api(api_key=self.openDart_api_key, corp_code=code)
-                status = json_data.get("status", "900") # (column, default_value)
-                
-                if status == "000":
-                    result.extend(json_data.get("list"))
+            instances = []
+            # 조회 성공 후 적재 대기 중인 기업 (적재 성공 시 SUCCESS 기록)
+            buffered_codes = []
+            run_status = FAILED
+            try:
+                for index, code in enumerate(corp_codes, start=1):
+                    try:
+                        json_data = opendart_bankruptcy_api(api_key=self.openDart_api_key, corp_code=code, timeout=self.api_timeout)
+                        status = json_data.get("status", "900") # (column, default_value)
+                    except Exception as e:
+                        # 요청 timeout/응답 파싱 실패 : 해당 기업만 실패 처리 후 계속
+                        logger.warning(f"[TB_BANKRUPTCY : 부도발생] -----> WARNING : {code} 조회 실패: {e}")
+                        checkpoint.record(code, FAIL, str(e))
+                        status = None
+                    
+                    if status is None:
+                        pass
 
-                # API 요청 횟수가 초과된 경우 종료
-                elif status == "020":
-                    logger.error(f"[TB_BANKRUPTCY : 부도발생] -----> ERROR : {OPENDART_ERROR_MESSAGES[status]}", exc_info=True)
-                    break             
+                    elif status == "000":
+                        instances.extend(self._to_instances(json_data.get("list"), existing_keys))
+                        buffered_codes.append(code)
 
-                # API가 정상적으로 호출되지 않은 경우
-                else:
-                    msg = OPENDART_ERROR_MESSAGES.get(status, "Unknown error")
+                    elif status == "013":
+                        checkpoint.record(code, NO_DATA)
+
+                    # API 요청 횟수가 초과된 경우 종료
+                    elif status == "020":
+                        logger.error(f"[TB_BANKRUPTCY : 부도발생] -----> ERROR : {OPENDART_ERROR_MESSAGES[status]}", exc_info=True)
+                        checkpoint.record(code, FAIL, status)
+                        break             
 
-                    # 📌 여기에 이메일 발송 여부 구분 코드 삽입
-                    if status in {"900", "999"}:   # 메일 보내고 싶은 에러 코드
-                        logger.error(f"[TB_BANKRUPTCY : 부도발생] -----> ERROR : {msg}", exc_info=True)
+                    # API가 정상적으로 호출되지 않은 경우
                     else:
-                        logger.warning(f"[TB_BANKRUPTCY : 부도발생] -----> WARNING : {msg}")
-                
-            instances = []
+                        msg = OPENDART_ERROR_MESSAGES.get(status, "Unknown error")
+                        checkpoint.record(code, FAIL, status)
 
-            for item in result:
-                key = (item['corp_code'], item['rcept_no'])
-                if key in existing_keys:
-                    logger.info(f"Skipping duplicate: {key}")
-                    continue
+                        # 📌 여기에 이메일 발송 여부 구분 코드 삽입
+                        if status in {"900", "999"}:   # 메일 보내고 싶은 에러 코드
+                            logger.error(f"[TB_BANKRUPTCY : 부도발생] -----> ERROR : {msg}", exc_info=True)
+                        else:
+                            logger.warning(f"[TB_BANKRUPTCY : 부도발생] -----> WARNING : {msg}")
 
-                dfd_value = item['dfd']
-                
-                dfd = None
-                if dfd_value not in ('-', ''):
-                    try:
-                        dfd = datetime.strptime(dfd_value, '%Y년 %m월 %d일').date()
-                    except ValueError:
-                        logger.warning(f"Invalid date format for {key}: {dfd_value}")
-
-                instance = {
-                    "CORP_CODE": item['corp_code'],
-                    "RCEPT_NO": item['rcept_no'],
-                    "CORP_CLS": item['corp_cls'],
-                    "CORP_NAME": item['corp_name'],
-                    "DF_CN": item['df_cn'],
-                    "DF_AMT": item['df_amt'],
-                    "DF_BNK": item['df_bnk'],
-                    "DFD": dfd,
-                    "DF_RS": item['df_rs'],
-                }
-
-                instances.append(TB_BANKRUPTCY(**instance))
-
-            if instances:
-                try:
-                    base_query_factory.insert_multi_row(instances)
-                    logger.info(f"[TB_BANKRUPTCY : 부도발생] -----> 삽입 : {len(instances)}건 적재 완료")
+                    # flush_every 기업마다 적재 + 체크포인트 커밋
+                    if index % self.flush_every == 0:
+                        inserted += self._flush(base_query_factory, checkpoint, instances, buffered_codes)
+                        instances, buffered_codes = [], []
+                else:
+                    run_status = COMPLETE
+
+                inserted += self._flush(base_query_factory, checkpoint, instances, buffered_codes)
+            except Exception:
+                # 적재되지 않은 기업의 기록이 finish 커밋에 포함되지 않도록 롤백
+                conn.rollback()
+                raise
+            finally:
+                checkpoint.finish(run_status)
 
-                except Exception as e:
-                    logger.error(f"[TB_BANKRUPTCY : 부도발생] -----> ERROR : Insert failed: {e}", exc_info=True)
-                    raise
-            else:
+            if not inserted:
                 logger.info("[TB_BANKRUPTCY : 부도발생] -----> 조회된 데이터가 없습니다")
 
-        logger.info("[TB_BANKRUPTCY : 부도발생] -----> 스케줄러 종료")
\ No newline at end of file
+        logger.info("[TB_BANKRUPTCY : 부도발생] -----> 스케줄러 종료")
@@ -60,10 +60,10 @@ class SchedulerServiceTBCompany:
 
         with SessionLocal() as conn:
             base_query_factory = BaseQueryFactory(conn, TB_COMPANY)
-            balance_sheets = base_query_factory.find_all()
-            company_tb = pd.DataFrame([row.__dict__ for row in balance_sheets])
-
-            diff = set(company_df.corp_code) - set(company_tb.CORP_CODE) 
+            # 고유번호 컬럼만 청크 단위로 스트리밍하여 기존 기업 제외
+            diff = set(company_df.corp_code)
+            for chunk in base_query_factory.iter_key_chunks("CORP_CODE"):
+                diff.difference_update(corp_code for (corp_code,) in chunk)
 
             insert_df = company_df.loc[company_df['corp_code'].isin(diff)].reset_index(drop=True)
 
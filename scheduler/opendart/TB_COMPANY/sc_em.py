@@ -9,7 +9,8 @@ from error.opendart.errors import OPENDART_ERROR_MESSAGES
 
 from infrastructure.queryFactory.base_orm import BaseQueryFactory
 from infrastructure.queryFactory.TB_COMPANY.queryFactory import TBCompanyQueryFactory
-from setting.database_orm import SessionLocal
+from db.session import unit_of_work
+from infrastructure.opendart.run_state import RunCheckpoint, COMPLETE, FAILED, SUCCESS, NO_DATA, SKIP, FAIL
 from setting.inject import provision_inject_orm
 from db.public.models import TB_COMPANY
 from Logger import logger 
@@ -17,17 +18,29 @@ from error.email.email_logger import attach_error_email_handler
 """
     * TB_COMPANY(직원수)
         - OpenDART 보고서에서 '직원' 키워드 데이터를 조회하여 TB_COMPANY.EMPLOYEE 업데이트
+        - 실행 단위 세션(unit_of_work) 1개 사용, 현재 직원 수는 시작 시 1회 조회, 변경분은 batch_size 단위 bulk_update로 일괄 반영 (기업별 UPDATE 제거)
+        - 반영 실패 시 변경분은 버퍼에 유지 후 재시도(max_flush_retries, 실행 종료 시 마지막 1회), 초과 시 FAIL 기록 후 폐기
+          (현재 직원 수 캐시는 반영 성공 후에만 갱신)
+        - 기업별 처리 상태를 RunCheckpoint(TB_RUN_STATE)에 기록 → 중단 시 다음 실행은 남은 기업부터, only_failed로 실패 기업만 재처리
         - 스케줄러 주기: 
 """
 
+# _process_one_corp 결과 → 체크포인트 상태
+CHECKPOINT_STATUS = {"SUCCESS": SUCCESS, "SKIP": SKIP, "NO_DATA": NO_DATA, "INVALID_VALUE": NO_DATA, "FAIL": FAIL}
+
 class SchedulerServiceTBCompanyEmployee:
-    def __init__(self, target_year: Optional[int] = None):
+    def __init__(self, target_year: Optional[int] = None, batch_size: int = 200,
+                 resume: bool = True, only_failed: bool = False, max_flush_retries: int = 3):
         self.provision = provision_inject_orm()
         self.api_key = self.provision.OPENDART_API_KEY2
 
         self.year = target_year or datetime.today().year
         self.month = datetime.today().month
         self.reprt_code = self._decide_reprt_code_for_month(self.month)
+        self.batch_size = batch_size
+        self.resume = resume
+        self.only_failed = only_failed
+        self.max_flush_retries = max_flush_retries
         attach_error_email_handler(logger, service_name='WEB:TB_COMPANY_EMPLOYEE 스케줄러')
         
     def _decide_reprt_code_for_month(self, month: int) -> str:
@@ -70,11 +83,56 @@ class SchedulerServiceTBCompanyEmployee:
             return last_two if last_two == rest else sum(values)
         return sum(values)
 
-    def _fetch_active_corp_codes(self):
-        with SessionLocal() as session:
-            factory = TBCompanyQueryFactory(conn=session)
-            rows = factory.corp_code() or []
-            return [r[0] for r in rows]
+    def _fetch_active_corp_codes(self, session):
+        factory = TBCompanyQueryFactory(conn=session)
+        rows = factory.corp_code() or []
+        return [r[0] for r in rows]
+
+    def _load_employees(self) -> dict:
+        """CORP_CODE → 현재 EMPLOYEE 값 (기업별 find_one 대신 1회 조회)"""
+        df = self._factory.find_frame("CORP_CODE", "EMPLOYEE")
+        return dict(zip(df["CORP_CODE"], df["EMPLOYEE"]))
+
+    def _queue_update(self, corp_code: str, emp_val: int) -> None:
+        """변경분을 버퍼에 적재 (같은 기업은 마지막 값으로 덮어씀), batch_size 도달 시 반영"""
+        self._pending[corp_code] = emp_val
+        if len(self._pending) >= self.batch_size:
+            self._flush_updates()
+
+    def _flush_updates(self, final: bool = False) -> int:
+        """
+        버퍼의 직원 수 변경분을 CORP_CODE 기준 bulk_update로 일괄 반영
+        - 성공 시에만 캐시(_employees) 갱신 후 버퍼 비움
+        - 실패 시 버퍼 유지 → 다음 반영 시점에 재시도, max_flush_retries 초과 또는 final이면 FAIL 기록 후 폐기
+        """
+        if not self._pending:
+            return 0
+        pairs = [(corp_code, {"EMPLOYEE": emp_val}) for corp_code, emp_val in self._pending.items()]
+        try:
+            # 완료 기록을 같은 트랜잭션에 포함 → 반영 실패 시 함께 롤백
+            for corp_code in self._pending:
+                self._checkpoint.record(corp_code, SUCCESS)
+            updated = self._factory.bulk_update(pairs, key="CORP_CODE", batch_size=self.batch_size)
+        except Exception as e:
+            self._flush_failures += 1
+            if not final and self._flush_failures <= self.max_flush_retries:
+                logger.error(
+                    f"[EMP] 직원 수 일괄 업데이트 실패({len(pairs)}건 보류, 재시도 {self._flush_failures}/{self.max_flush_retries}): {e}",
+                    exc_info=True,
+                )
+                return 0
+            logger.error(f"[EMP] 직원 수 일괄 업데이트 실패({len(pairs)}건 폐기): {e}", exc_info=True)
+            for corp_code in self._pending:
+                self._checkpoint.record(corp_code, FAIL, str(e))
+            self._pending = {}
+            self._flush_failures = 0
+            return 0
+
+        self._employees.update(self._pending)
+        self._pending = {}
+        self._flush_failures = 0
+        logger.info(f"[EMP] 직원 수 일괄 업데이트: {updated}건")
+        return updated
 
     def _process_one_corp(self, corp_code: str, year: int, reprt_code: str, retry: bool = False):
         try:
@@ -90,7 +148,8 @@ class SchedulerServiceTBCompanyEmployee:
             if status != "000" or "list" not in jo:
                 msg = OPENDART_ERROR_MESSAGES.get(status, jo.get("message", "Unknown error"))
                 logger.info(f"[EMP] {corp_code} {year}-{reprt_code} 데이터 없음/에러: {msg} (status={status})")
-                return "NO_DATA"
+                # 한도 초과는 재개/재처리 대상
+                return "FAIL" if status == "020" else "NO_DATA"
 
             df = pd.DataFrame(jo["list"])
             if df.empty:
@@ -102,34 +161,43 @@ class SchedulerServiceTBCompanyEmployee:
                 logger.warning(f"[EMP] {corp_code} {year}-{reprt_code} sm 파싱 실패")
                 return "INVALID_VALUE"
 
-            with SessionLocal() as session:
-                factory = BaseQueryFactory(conn=session, model=TB_COMPANY)
-                company = factory.find_one(CORP_CODE=corp_code)
+            if emp_val == 0 and not retry and corp_code in self._employees:
+                # 0명은 먼저 이전 분기 확인 → 유효치가 있으면 0을 버퍼에 넣지 않음 (기존 값 위에 0이 반영되지 않도록)
+                py, pr = self._previous_report(year, reprt_code)
+                logger.info(f"[EMP] {corp_code} {year}-{reprt_code} 유효치 미확보 → 이전 분기 재시도: {py}-{pr}")
+                result = self._process_one_corp(corp_code, py, pr, retry=True)
+                if result in ("SUCCESS", "SKIP"):
+                    return result
+                logger.info(f"[EMP] {corp_code} 이전 분기 유효치 없음 → {year}-{reprt_code} 값(0) 반영")
+                retry = True
 
-                if company is None:
-                    factory.insert_single_row(CORP_CODE=corp_code, EMPLOYEE=emp_val)
-                    logger.info(f"[EMP] [{corp_code}][{year}] 신규 삽입: {emp_val}명")
+            if corp_code not in self._employees:
+                self._factory.insert_single_row(CORP_CODE=corp_code, EMPLOYEE=emp_val)
+                self._employees[corp_code] = emp_val
+                logger.info(f"[EMP] [{corp_code}][{year}] 신규 삽입: {emp_val}명")
+            else:
+                # 반영 대기 중인 값이 있으면 그 값과 비교 (캐시는 반영 성공 후에만 갱신)
+                current = self._pending.get(corp_code, self._employees[corp_code])
+                if current in [None, "", "-"]:
+                    self._queue_update(corp_code, emp_val)
+                    logger.info(f"[EMP] [{corp_code}][{year}] 업데이트 대기(무효값→{emp_val})")
                 else:
-                    if company.EMPLOYEE in [None, "", "-"]:
-                        factory.update(company, EMPLOYEE=emp_val)
-                        logger.info(f"[EMP] [{corp_code}][{year}] 업데이트(무효값→{emp_val})")
+                    try:
+                        old_val = int(str(current).replace(",", ""))
+                    except Exception:
+                        old_val = None
+
+                    if old_val is None or old_val != emp_val:
+                        self._queue_update(corp_code, emp_val)
+                        logger.info(f"[EMP] [{corp_code}][{year}] 변경 대기: {old_val} → {emp_val}")
                     else:
-                        try:
-                            old_val = int(str(company.EMPLOYEE).replace(",", ""))
-                        except Exception:
-                            old_val = None
-
-                        if old_val is None or old_val != emp_val:
-                            factory.update(company, EMPLOYEE=emp_val)
-                            logger.info(f"[EMP] [{corp_code}][{year}] 변경: {old_val} → {emp_val}")
-                        else:
-                            logger.info(f"[EMP] {corp_code} 직원 수 동일 → 건너뜀")
-                            return "SKIP"
-
-                if (emp_val in [None, 0]) and (not retry):
-                    py, pr = self._previous_report(year, reprt_code)
-                    logger.info(f"[EMP] {corp_code} {year}-{reprt_code} 유효치 미확보 → 이전 분기 재시도: {py}-{pr}")
-                    return self._process_one_corp(corp_code, py, pr, retry=True)
+                        logger.info(f"[EMP] {corp_code} 직원 수 동일 → 건너뜀")
+                        return "SKIP"
+
+            if (emp_val in [None, 0]) and (not retry):
+                py, pr = self._previous_report(year, reprt_code)
+                logger.info(f"[EMP] {corp_code} {year}-{reprt_code} 유효치 미확보 → 이전 분기 재시도: {py}-{pr}")
+                return self._process_one_corp(corp_code, py, pr, retry=True)
 
             return "SUCCESS"
 
@@ -153,20 +221,42 @@ class SchedulerServiceTBCompanyEmployee:
     def run(self, throttle_every: int = 1000, sleep_sec: int = 60, call_cap: int = 20000):
         logger.info(f"[EMP] 스케줄러 시작: year={self.year}, month={self.month}, reprt_code={self.reprt_code}")
 
-        corp_codes = self._fetch_active_corp_codes()
-        logger.info(f"[EMP] 대상 기업 수: {len(corp_codes)}")
+        # 실행 단위 세션 1개로 대상 조회 → 처리 → 일괄 반영까지 수행
+        with unit_of_work() as session:
+            self._checkpoint = RunCheckpoint(session, job="TB_COMPANY_EMPLOYEE", bsns_year=str(self.year), reprt_code=self.reprt_code)
+            corp_codes = self._checkpoint.start(
+                self._fetch_active_corp_codes(session), resume=self.resume, only_failed=self.only_failed
+            )
+            logger.info(f"[EMP] 대상 기업 수: {len(corp_codes)}")
+
+            self._factory = BaseQueryFactory(conn=session, model=TB_COMPANY)
+            self._employees = self._load_employees()
+            self._pending = {}
+            self._flush_failures = 0
 
-        total_calls = 0
-        for corp in corp_codes:
-            if total_calls >= call_cap:
-                logger.error(f"[EMP] API 호출 상한({call_cap}) 도달 → 중단", exc_info=True)
-                break
+            total_calls = 0
+            run_status = FAILED
+            try:
+                for corp in corp_codes:
+                    if total_calls >= call_cap:
+                        logger.error(f"[EMP] API 호출 상한({call_cap}) 도달 → 중단", exc_info=True)
+                        break
 
-            _ = self._process_one_corp(corp, self.year, self.reprt_code)
-            total_calls += 1
+                    status = self._process_one_corp(corp, self.year, self.reprt_code)
+                    total_calls += 1
+                    # 업데이트 대기 중인 기업은 반영 시점(_flush_updates)에 기록
+                    if corp not in self._pending:
+                        self._checkpoint.record(corp, CHECKPOINT_STATUS.get(status, FAIL), status if status == "INVALID_VALUE" else None)
 
-            if throttle_every and (total_calls % throttle_every == 0):
-                logger.info(f"[EMP] {throttle_every}건 처리 완료 → {sleep_sec}s 대기")
-                time.sleep(sleep_sec)
+                    if throttle_every and (total_calls % throttle_every == 0):
+                        # 대기 전에 버퍼 반영 → 대기 중 트랜잭션/잠금 유지하지 않음
+                        self._flush_updates()
+                        logger.info(f"[EMP] {throttle_every}건 처리 완료 → {sleep_sec}s 대기")
+                        time.sleep(sleep_sec)
+                else:
+                    run_status = COMPLETE
+            finally:
+                self._flush_updates(final=True)
+                self._checkpoint.finish(run_status)
 
         logger.info("[EMP] 스케줄러 완료")
\ No newline at end of file
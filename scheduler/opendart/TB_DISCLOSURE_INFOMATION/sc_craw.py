@@ -1,6 +1,7 @@
 from setting.database_orm import SessionLocal
 from infrastructure.queryFactory.base_orm import BaseQueryFactory
 from db.public.models import TB_DISCLOSURE_INFORMATION
+from sqlalchemy import or_
 from Logger import logger , request_context
 from uuid import uuid4
 from datetime import datetime, timedelta
@@ -114,15 +115,18 @@ class SchedulerServiceTBDisclosureCrawler:
         with SessionLocal() as conn:
             try:
                 query_factory = BaseQueryFactory(conn, TB_DISCLOSURE_INFORMATION)
-                queryInfo = conn.query(TB_DISCLOSURE_INFORMATION).filter(TB_DISCLOSURE_INFORMATION.RCEPT_DT >= self.three_days_ago).all()
-                df = pd.DataFrame([row.__dict__ for row in queryInfo])
+                # 주석 HTML 본문은 조회하지 않고 미수집 여부만 DB에서 판단
+                df = query_factory.find_frame(
+                    "RCEPT_NO", "REPORT_NM",
+                    where=[
+                        TB_DISCLOSURE_INFORMATION.RCEPT_DT >= self.three_days_ago,
+                        or_(TB_DISCLOSURE_INFORMATION.CFS_COMMENT.is_(None), TB_DISCLOSURE_INFORMATION.OFS_COMMENT.is_(None)),
+                    ],
+                )
                 if df.empty:
-                    logger.info("[TB_DISCLOSURE_INFORMATION] -----> 최근 3일 데이터 없음")
+                    logger.info("[TB_DISCLOSURE_INFORMATION] -----> 최근 3일 주석 미수집 데이터 없음")
                     return
-                df.columns = [c.upper() for c in df.columns]
-                report = df.loc[
-                        df['REPORT_NM'].str.contains("분기보고서|반기보고서|사업보고서", na=False) & 
-                        (df['CFS_COMMENT'].isna() | df['OFS_COMMENT'].isna())].reset_index(drop=True)
+                report = df.loc[df['REPORT_NM'].str.contains("분기보고서|반기보고서|사업보고서", na=False)].reset_index(drop=True)
 
                 for reportNum in report.RCEPT_NO:
                     comment = self.document_link(reportNum)
@@ -108,17 +108,22 @@ class SchedulerServiceTBDisclosureCrawlerCRTCVT:
         with SessionLocal() as conn:
             try:
                 query_factory = BaseQueryFactory(conn, TB_DISCLOSURE_INFORMATION)
-                queryInfo = conn.query(TB_DISCLOSURE_INFORMATION).filter(TB_DISCLOSURE_INFORMATION.RCEPT_DT >= self.three_days_ago).all()
-                df = pd.DataFrame([row.__dict__ for row in queryInfo])
+                # 본문 컬럼은 조회하지 않고 미수집(CRT_CVT_COMMENT IS NULL) 여부만 DB에서 판단
+                df = query_factory.find_frame(
+                    "RCEPT_NO", "REPORT_NM",
+                    where=[
+                        TB_DISCLOSURE_INFORMATION.RCEPT_DT >= self.three_days_ago,
+                        TB_DISCLOSURE_INFORMATION.CRT_CVT_COMMENT.is_(None),
+                    ],
+                )
                 if df.empty:
-                    logger.info("[TB_DISCLOSURE_INFORMATION] -----> 최근 3일 데이터 없음")
+                    logger.info("[TB_DISCLOSURE_INFORMATION] -----> 최근 3일 미수집 데이터 없음")
                     return
-                df.columns = [c.upper() for c in df.columns]
                 report = df.loc[
                         df['REPORT_NM'].str.contains(
                             "감사보고서|합병등종료보고서|회사합병결정|투자설명서",
                             na=False
-                        ) & (df['CRT_CVT_COMMENT'].isna())
+                        )
                     ].reset_index(drop=True)
 
                 for _, row in report.iterrows():
@@ -0,0 +1,374 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+import requests
+
+from infrastructure.opendart.api.service import opendart_financial_api
+from infrastructure.opendart.financial.opendart_pre import FinancialDataProcessor
+from infrastructure.opendart.report_filter import new_report_targets
+from infrastructure.opendart.run_state import RunCheckpoint, COMPLETE, FAILED, SUCCESS, NO_DATA, FAIL
+from infrastructure.queryFactory.TB_COMPANY.queryFactory import TBCompanyQueryFactory
+from infrastructure.queryFactory.TB_FINANCIAL_VARIABLE.queryFactory import TBFINANCIALQueryFactory
+from setting.database_orm import SessionLocal
+from db.public.models import TB_FINANCIAL_STATEMENTS, TB_FINANCIAL_VARIABLE, TB_DISCLOSURE_INFORMATION, TB_KRX
+from error.opendart.errors import OPENDART_ERROR_MESSAGES
+from Logger import logger
+
+"""
+    * TB_FINANCIAL_STATEMENTS 통합 수집 엔진 (OFS/CFS)
+        - 기업 목록을 1회 순회하며 기업별로 fs_divs(OFS, CFS)를 동시에 요청
+        - 중복 판단 키는 (RCEPT_NO, FS_DIV) : 같은 접수번호의 OFS/CFS가 서로를 건너뛰지 않도록 구분
+        - 기존 (RCEPT_NO, ACCOUNT_NM) 변수 키, 연도별 시가총액(TB_KRX)은 실행 시작/최초 사용 시 1회 조회 후 재사용
+        - 기업별 원본(OFS+CFS) + TB_FINANCIAL_VARIABLE 가공 결과를 단일 트랜잭션으로 커밋 (실패 시 해당 기업만 롤백)
+        - TB_FINANCIAL_VARIABLE 가공은 process_fs_divs(기본 OFS) 결과만 대상 (기존 sc_ofs 동작과 동일)
+        - 처리 상태를 RunCheckpoint에 (기업, "BSNS_YEAR:REPRT_CODE") 건 단위로 기록 → 중단(한도 초과/예외) 후 다음 실행은
+          남은 건부터 재개, only_failed는 직전 실행의 실패 건만 재처리 (같은 기업의 다른 건이 FAIL을 덮어쓰지 않음)
+          (자동 모드의 체크포인트 대상은 12월 결산 기준 보고서코드/연도, 수동 모드는 manual_year/manual_quarter)
+        - changed_only(자동 모드 기본) : 최근 lookback_days 동안 TB_DISCLOSURE_INFORMATION에 접수된 미적재 정기보고서의
+          (기업, 사업연도, 보고서코드)만 요청 → 변경 없는 기업의 API 호출 생략 (수동 모드는 전체 기업 대상)
+"""
+
+FS_DIVS = ("OFS", "CFS")
+TAG = "[TB_FINANCIAL_STATEMENTS]"
+
+
+def choose_report_by_acc_mt(acc_mt: int | None, today: datetime) -> tuple[str, str]:
+    try:
+        if acc_mt is None:
+            acc = 12
+        elif isinstance(acc_mt, str):
+            acc = int(acc_mt.strip() or 12)
+        else:
+            acc = int(acc_mt)
+    except Exception:
+        acc = 12
+    if acc < 1 or acc > 12:
+        acc = 12
+    month = getattr(today, "month", None) or datetime.today().month
+    rel = ((month - acc - 1) % 12) + 1
+    if month > acc:
+        year_of_last_fy_end = today.year
+        year_of_current_fy_end = today.year + 1
+    else:
+        year_of_last_fy_end = today.year - 1
+        year_of_current_fy_end = today.year
+    if 1 <= rel <= 3:
+        return "11011", str(year_of_last_fy_end)
+    elif 4 <= rel <= 6:
+        return "11013", str(year_of_current_fy_end)
+    elif 7 <= rel <= 9:
+        return "11012", str(year_of_current_fy_end)
+    else:
+        return "11014", str(year_of_current_fy_end)
+
+
+class FinancialStatementsEngine:
+    def __init__(self, provision, fs_divs: Iterable[str] = FS_DIVS, process_fs_divs: Iterable[str] = ("OFS",),
+                 manual_year: Optional[str] = None, manual_quarter: Optional[str] = None,
+                 retries: int = 3, retry_sleep: int = 60, resume: bool = True, only_failed: bool = False,
+                 changed_only: bool = True, lookback_days: int = 7):
+        self.provision = provision
+        self.api_key = provision.OPENDART_API_KEY3
+        self.fs_divs = tuple(fs_divs)
+        self.process_fs_divs = set(process_fs_divs) & set(self.fs_divs)
+        self.manual_year = manual_year
+        self.manual_quarter = manual_quarter
+        self.retries = retries
+        self.retry_sleep = retry_sleep
+        self.resume = resume
+        self.only_failed = only_failed
+        self.changed_only = changed_only
+        self.lookback_days = lookback_days
+        self.quota_exhausted = False
+        self.error_codes: Set[str] = set()
+        self._key_lock = threading.Lock()
+        self._marketcap_cache: Dict[Tuple[int, ...], pd.DataFrame] = {}
+
+    # ---------- 요청 ----------
+    def _switch_to_spare_key(self, used_key: str) -> bool:
+        """한도 초과(020) 시 예비키 전환 (동시 요청 중 한 스레드만 전환), 전환/이미 전환됨 여부 반환"""
+        with self._key_lock:
+            if self.api_key != used_key:
+                return True
+            if used_key == self.provision.OPENDART_API_KEY3:
+                self.api_key = self.provision.OPENDART_API_KEY4
+                return True
+            return False
+
+    def fetch(self, corp_code: str, bsns_year: str, reprt_code: str, fs_div: str,
+              existing: Set[Tuple[str, str]]) -> Optional[List[dict]]:
+        """기업 1곳의 fs_div 재무제표 조회 (데이터 없음/이미 적재된 (RCEPT_NO, FS_DIV)면 빈 리스트, 조회 실패 시 None)"""
+        for attempt in range(self.retries):
+            api_key = self.api_key
+            try:
+                json_data = opendart_financial_api(
+                    api_key=api_key,
+                    corp_code=corp_code,
+                    bsns_year=bsns_year,
+                    reprt_code=reprt_code,
+                    fs_div=fs_div,
+                )
+            except requests.exceptions.RequestException:
+                logger.info(f"{TAG} -----> {fs_div} 재시도 {attempt+1}회 실패")
+                if attempt < self.retries - 1:
+                    time.sleep(self.retry_sleep)
+                continue
+
+            status = json_data.get("status", "900")
+            if status == "000":
+                rows = json_data.get("list") or []
+                if not rows or (rows[0].get("rcept_no"), fs_div) in existing:
+                    return []
+                return rows
+            if status == "013":
+                logger.info(f"{TAG} -----> {fs_div} {OPENDART_ERROR_MESSAGES[status]}")
+                return []
+            if status == "020":
+                self.error_codes.add(status)
+                logger.warning(f"{TAG} -----> ERROR : {OPENDART_ERROR_MESSAGES[status]}")
+                if self._switch_to_spare_key(api_key):
+                    time.sleep(5)
+                    continue  # 예비키로 재시도
+                logger.warning(f"{TAG} -----> 예비 키도 한도 초과, 스킵")
+                self.quota_exhausted = True
+                return None
+            self.error_codes.add(status)
+            logger.warning(f"{TAG} -----> {fs_div} {OPENDART_ERROR_MESSAGES.get(status, 'Unknown error')} (status={status})")
+            return None
+
+        logger.warning(f"{TAG} -----> ERROR : {corp_code} {fs_div} {self.retries}회 시도 후 실패")
+        return None
+
+    # ---------- 가공 ----------
+    def _marketcap(self, conn, years: List[int], stock_codes: List[str]) -> list:
+        """연도 조합별 시가총액을 1회 조회 후 캐시, 기업의 종목코드 행만 반환"""
+        key = tuple(years)
+        if key not in self._marketcap_cache:
+            data = TBFINANCIALQueryFactory(conn, TB_KRX).get_krx_marketcap_data(years=years)
+            frame = pd.DataFrame(data, columns=["BAS_DD", "STOCK_CODE", "MKTCAP"])
+            frame["STOCK_CODE"] = frame["STOCK_CODE"].astype(str).str.zfill(6)
+            self._marketcap_cache[key] = frame
+        frame = self._marketcap_cache[key]
+        return frame.loc[frame["STOCK_CODE"].isin(stock_codes)].to_dict("records")
+
+    def build_variables(self, conn, rows: List[dict], fs_div: str, existing_pairs: Set[Tuple[str, str]]) -> list:
+        """원본 행 → FinancialDataProcessor 파이프라인 → 신규 TB_FINANCIAL_VARIABLE 인스턴스"""
+        fs_data = pd.DataFrame(rows)
+        fs_data.columns = fs_data.columns.str.upper()
+        if "FS_DIV" not in fs_data.columns:
+            fs_data["FS_DIV"] = fs_div
+        processor = FinancialDataProcessor(fs_data, session=conn)
+
+        df = processor.apply_keyword_mapping()
+        df = processor.fill_missing_accounts(df)
+        df = processor.keep_latest_rcept_by_account(df)
+        df = processor.deduplicate_by_std_account(df)
+        df = processor.clean_amount_zero_if_ord_exists(df)
+        df = processor.merge_with_company_info(df)
+
+        # 공시 플래그
+        df = processor.add_disclosure_flags_as_rows(df, TBFINANCIALQueryFactory(conn, TB_DISCLOSURE_INFORMATION))
+
+        # 시가총액
+        if not df.empty:
+            years = sorted(map(int, df["BSNS_YEAR"].dropna().unique().tolist()))
+            stock_codes = df["STOCK_CODE"].dropna().astype(str).str.zfill(6).unique().tolist()
+            df = processor.append_marketcap_fast(self._marketcap(conn, years, stock_codes), df)
+
+        # LLM 플래그 → 평균자기자본 → DB 스키마
+        df = processor.mark_note_extraction_target(df)
+        df = processor.add_avg_equity(df)
+        final_df = processor.format_for_database(df)
+        if final_df.empty:
+            return []
+
+        final_df = final_df.drop_duplicates(subset=["RCEPT_NO", "ACCOUNT_NM"], keep="last")
+        mask_new = [
+            (rcept_no, account_nm) not in existing_pairs
+            for rcept_no, account_nm in zip(final_df["RCEPT_NO"], final_df["ACCOUNT_NM"])
+        ]
+        to_insert = final_df.loc[mask_new].fillna({"ACCOUNT_AMOUNT": 0})
+        return [
+            TB_FINANCIAL_VARIABLE(
+                CORP_CODE=row["CORP_CODE"],
+                RCEPT_NO=row["RCEPT_NO"],
+                REPRT_CODE=row["REPRT_CODE"],
+                BSNS_YEAR=row["BSNS_YEAR"],
+                ACCOUNT_NM=row["ACCOUNT_NM"],
+                ACCOUNT_AMOUNT=str(row["ACCOUNT_AMOUNT"]),
+                IS_LLM=bool(row.get("IS_LLM", False)),
+                IS_COMPLETE=bool(row.get("IS_COMPLETE", False)),
+            )
+            for _, row in to_insert.iterrows()
+        ]
+
+    @staticmethod
+    def to_statements(rows: List[dict], fs_div: str) -> list:
+        return [
+            TB_FINANCIAL_STATEMENTS(
+                RCEPT_NO=row.get("rcept_no"),
+                REPRT_CODE=row.get("reprt_code"),
+                BSNS_YEAR=row.get("bsns_year"),
+                CORP_CODE=row.get("corp_code"),
+                SJ_DIV=row.get("sj_div"),
+                SJ_NM=row.get("sj_nm"),
+                ACCOUNT_ID=row.get("account_id"),
+                ACCOUNT_NM=row.get("account_nm"),
+                ACCOUNT_DETAIL=row.get("account_detail"),
+                THSTRM_NM=row.get("thstrm_nm"),
+                THSTRM_AMOUNT=row.get("thstrm_amount"),
+                FRMTRM_NM=row.get("frmtrm_nm"),
+                FRMTRM_AMOUNT=row.get("frmtrm_amount"),
+                BFEFRMTRM_NM=row.get("bfefrmtrm_nm"),
+                BFEFRMTRM_AMOUNT=row.get("bfefrmtrm_amount"),
+                ORD=row.get("ord"),
+                CURRENCY=row.get("currency"),
+                FS_DIV=fs_div,
+            )
+            for row in rows
+        ]
+
+    # ---------- 실행 ----------
+    def _report_for(self, acc_mt) -> Tuple[str, str]:
+        if self.manual_year and self.manual_quarter:
+            return self.manual_quarter, self.manual_year
+        return choose_report_by_acc_mt(acc_mt, today=datetime.today())
+
+    @staticmethod
+    def item_key(bsns_year: str, reprt_code: str) -> str:
+        """체크포인트 건 구분 키"""
+        return f"{bsns_year}:{reprt_code}"
+
+    @staticmethod
+    def parse_item_key(item_key: str) -> Tuple[str, str]:
+        """item_key → (REPRT_CODE, BSNS_YEAR)"""
+        bsns_year, reprt_code = item_key.split(":", 1)
+        return reprt_code, bsns_year
+
+    def _job(self, item, acc_mts: Dict[str, object]) -> Tuple[str, str, str, str]:
+        """
+        체크포인트 item → (CORP_CODE, ITEM_KEY, REPRT_CODE, BSNS_YEAR)
+        - ITEM_KEY 없이 기록된 이전 실행의 기업 단위 item은 결산월 기준 보고서로 처리 (기록도 같은 item으로 덮어씀)
+        """
+        if isinstance(item, tuple) and item[1]:
+            return (item[0], item[1], *self.parse_item_key(item[1]))
+        corp_code = item[0] if isinstance(item, tuple) else item
+        return (corp_code, "", *self._report_for(acc_mts.get(corp_code)))
+
+    def plan(self, conn, acc_mts: Dict[str, object], existing: Set[Tuple[str, str]]) -> Dict[str, List[Tuple[str, str]]]:
+        """기업별 요청 대상 [(REPRT_CODE, BSNS_YEAR), ...] (changed_only면 새 정기보고서가 접수된 기업만)"""
+        manual = bool(self.manual_year and self.manual_quarter)
+        if manual or not self.changed_only:
+            return {code: [self._report_for(acc_mt)] for code, acc_mt in acc_mts.items()}
+
+        # 요청한 fs_div 중 하나라도 적재된 접수번호는 제외 (CFS가 없는 기업의 재요청 방지)
+        loaded = {rcept_no for rcept_no, fs_div in existing if fs_div in self.fs_divs}
+        filings = new_report_targets(conn, since=date.today() - timedelta(days=self.lookback_days), loaded=loaded)
+        plan = {
+            code: [(reprt_code, bsns_year) for bsns_year, reprt_code in filings[code]]
+            for code in acc_mts if code in filings
+        }
+        logger.info(f"{TAG} -----> 신규 정기보고서 접수 기업: {len(plan)} / {len(acc_mts)}")
+        return plan
+
+    def checkpoint(self, conn) -> RunCheckpoint:
+        reprt_code, bsns_year = self._report_for(12)
+        return RunCheckpoint(
+            conn, job="TB_FINANCIAL_STATEMENTS", bsns_year=bsns_year, reprt_code=reprt_code, fs_div=",".join(self.fs_divs)
+        )
+
+    def run(self) -> Dict[str, int]:
+        """전체 기업 1회 순회, {fs_div: 원본 삽입 건수, "VARIABLE": 변수 삽입 건수} 반환"""
+        inserted = {fs_div: 0 for fs_div in self.fs_divs}
+        inserted["VARIABLE"] = 0
+
+        with SessionLocal() as conn, ThreadPoolExecutor(max_workers=len(self.fs_divs)) as executor:
+            acc_mts = dict(TBCompanyQueryFactory(conn).corp_code())
+            existing = set(
+                conn.query(TB_FINANCIAL_STATEMENTS.RCEPT_NO, TB_FINANCIAL_STATEMENTS.FS_DIV).distinct().all()
+            )
+            checkpoint = self.checkpoint(conn)
+            if self.only_failed:
+                # 직전 실행의 실패 건(기업, 사업연도, 보고서코드)을 그대로 재처리
+                items = None
+            else:
+                plan = self.plan(conn, acc_mts, existing)
+                items = [
+                    (code, self.item_key(bsns_year, reprt_code))
+                    for code, reports in plan.items() for reprt_code, bsns_year in reports
+                ]
+            targets = checkpoint.start(items, resume=self.resume, only_failed=self.only_failed)
+            jobs = [self._job(item, acc_mts) for item in targets]
+            existing_pairs = set(
+                conn.query(TB_FINANCIAL_VARIABLE.RCEPT_NO, TB_FINANCIAL_VARIABLE.ACCOUNT_NM).distinct().all()
+            )
+            logger.info(
+                f"{TAG} -----> 대상 기업 수: {len({job[0] for job in jobs})} (요청 {len(jobs)}건), "
+                f"구분: {', '.join(self.fs_divs)}"
+            )
+
+            run_status = COMPLETE
+            for corp_code, item_key, reprt_code, bsns_year in jobs:
+                logger.info(f"{TAG} -----> {corp_code} 보고서코드: {reprt_code}, 연도: {bsns_year}")
+
+                futures = {
+                    fs_div: executor.submit(self.fetch, corp_code, bsns_year, reprt_code, fs_div, existing)
+                    for fs_div in self.fs_divs
+                }
+                results = {fs_div: future.result() for fs_div, future in futures.items()}
+                failed = [fs_div for fs_div, rows in results.items() if rows is None]
+                if failed:
+                    # 일부 구분만 실패해도 기업 전체를 FAIL로 기록 → 재개/재처리 시 (RCEPT_NO, FS_DIV) 중복 판단으로 성공분은 건너뜀
+                    results = {fs_div: rows for fs_div, rows in results.items() if rows}
+                if not any(results.values()):
+                    checkpoint.record(corp_code, FAIL if failed else NO_DATA, ",".join(failed) or None, item_key=item_key)
+                    if self.quota_exhausted:
+                        logger.warning(f"{TAG} -----> API 한도 초과로 중단 (다음 실행에서 {corp_code} {item_key}부터 재개)")
+                        run_status = FAILED
+                        break
+                    continue
+
+                try:
+                    statements = []
+                    variables = []
+                    for fs_div, rows in results.items():
+                        if not rows:
+                            continue
+                        statements.extend(self.to_statements(rows, fs_div))
+                        if fs_div in self.process_fs_divs:
+                            variables.extend(self.build_variables(conn, rows, fs_div, existing_pairs))
+
+                    conn.add_all(statements + variables)
+                    checkpoint.record(corp_code, FAIL if failed else SUCCESS, ",".join(failed) or None, item_key=item_key)
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    logger.error(f"{TAG} -----> ERROR : {corp_code} 적재 실패: {e}", exc_info=True)
+                    checkpoint.record(corp_code, FAIL, str(e), item_key=item_key)
+                    continue
+
+                for fs_div, rows in results.items():
+                    if rows:
+                        existing.add((rows[0].get("rcept_no"), fs_div))
+                        inserted[fs_div] += len(rows)
+                existing_pairs.update((v.RCEPT_NO, v.ACCOUNT_NM) for v in variables)
+                inserted["VARIABLE"] += len(variables)
+                logger.info(
+                    f"{TAG} -----> {corp_code} 삽입 : "
+                    + ", ".join(f"{fs_div} {len(rows)}건" for fs_div, rows in results.items())
+                    + f", 변수 {len(variables)}건"
+                )
+                if self.quota_exhausted:
+                    logger.warning(f"{TAG} -----> API 한도 초과로 중단")
+                    run_status = FAILED
+                    break
+
+            checkpoint.finish(run_status)
+
+        if self.error_codes:
+            logger.error(f"{TAG} -----> 에러 코드 요약: {', '.join(sorted(self.error_codes))}")
+        return inserted
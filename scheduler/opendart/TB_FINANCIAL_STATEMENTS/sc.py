@@ -0,0 +1,40 @@
+from setting.inject import provision_inject_orm
+from scheduler.opendart.TB_FINANCIAL_STATEMENTS.engine import FinancialStatementsEngine, FS_DIVS
+from Logger import logger , request_context
+from uuid import uuid4
+from error.email.email_logger import attach_error_email_handler
+
+"""
+    * TB_FINANCIAL_STATEMENTS (OFS + CFS 통합 수집)
+        - 기업 목록 1회 순회, 기업별 OFS/CFS 동시 요청 후 원본 + 변수 테이블을 단일 트랜잭션으로 적재
+        - sc_ofs / sc_cfs 두 스케줄러를 이 스케줄러 1개로 대체
+"""
+
+class SchedulerServiceTBFinancialStatements:
+    def __init__(self, manual_year: str | None = None, manual_quarter: str | None = None,
+                 resume: bool = True, only_failed: bool = False, changed_only: bool = True, fs_divs=FS_DIVS):
+        request_context.request_id = str(uuid4())
+        self.provision = provision_inject_orm()
+        attach_error_email_handler(logger, service_name='WEB:FINANCIAL_STATES 스케줄러')
+        self.manual_year = manual_year
+        self.manual_quarter = manual_quarter
+        # resume: 중단된 직전 실행 이어받기, only_failed: 직전 실행의 실패 기업만 재처리
+        self.resume = resume
+        self.only_failed = only_failed
+        # changed_only: 새 정기보고서가 접수된 기업만 요청 (False면 전체 기업)
+        self.changed_only = changed_only
+        self.fs_divs = tuple(fs_divs)
+
+    def run(self):
+        logger.info(f"[TB_FINANCIAL_STATEMENTS] -----> 스케줄러 시작 ({', '.join(self.fs_divs)})")
+        engine = FinancialStatementsEngine(
+            self.provision,
+            fs_divs=self.fs_divs,
+            manual_year=self.manual_year,
+            manual_quarter=self.manual_quarter,
+            resume=self.resume,
+            only_failed=self.only_failed,
+            changed_only=self.changed_only,
+        )
+        inserted = engine.run()
+        logger.info(f"[TB_FINANCIAL_STATEMENTS] -----> 스케줄러 종료 (삽입: {inserted})")
@@ -0,0 +1,77 @@
+import re
+from collections import defaultdict
+from typing import Dict, List, Iterable
+
+"""
+    * LLM 키워드 위치 인덱스
+        - LLM_Keywords.json의 모든 키워드를 하나의 정규식(트라이 기반 alternation)으로 미리 컴파일
+        - 주석 문서를 1회만 스캔하여 키워드별 등장 위치 인덱스를 생성
+        - 계정별 스니펫 윈도우는 이 인덱스에서 바로 계산 (계정/키워드마다 전체 문서를 재탐색하지 않음)
+"""
+
+
+def _build_trie(words: Iterable[str]) -> dict:
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True  # 종료 표시
+    return trie
+
+
+def _trie_to_regex(node: dict) -> str:
+    """트라이를 정규식으로 변환 (같은 위치에서는 가장 긴 키워드가 먼저 매칭되도록 greedy 구성)"""
+    terminal = "" in node
+    branches = [re.escape(ch) + _trie_to_regex(child) for ch, child in sorted(node.items()) if ch != ""]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if terminal:
+        body = ("(?:" + body + ")?") if len(branches) == 1 else body + "?"
+    return body
+
+
+class KeywordIndex:
+    def __init__(self, account_keywords: Dict[str, List[str]]):
+        """
+        account_keywords: 계정명 → 키워드 리스트 매핑(LLM_Keywords.json)
+        """
+        vocabulary = set()
+        for account, keywords in account_keywords.items():
+            vocabulary.add(account)
+            vocabulary.update(kw for kw in (keywords or []) if kw)
+        vocabulary.discard("")
+        self.vocabulary = frozenset(vocabulary)
+
+        # 매칭된 (가장 긴) 키워드 → 같은 시작 위치에서 함께 매칭되는 접두 키워드 목록
+        self._prefixes = {
+            kw: [p for p in self.vocabulary if kw.startswith(p)]
+            for kw in self.vocabulary
+        }
+        self.pattern = re.compile(_trie_to_regex(_build_trie(self.vocabulary))) if self.vocabulary else None
+
+    def build(self, text: str) -> Dict[str, List[int]]:
+        """문서를 1회 스캔하여 {키워드: [시작 위치, ...]} 인덱스 생성"""
+        positions: Dict[str, List[int]] = defaultdict(list)
+        if not text or self.pattern is None:
+            return positions
+        for match in self.pattern.finditer(text):
+            start, end = match.span()
+            self._add(positions, match.group(), start)
+            # 매칭 구간 내부에서 시작하는 (겹치는) 키워드 보완 탐색
+            for idx in range(start + 1, end):
+                inner = self.pattern.match(text, idx)
+                if inner:
+                    self._add(positions, inner.group(), idx)
+        return positions
+
+    def _add(self, positions: Dict[str, List[int]], matched: str, idx: int) -> None:
+        for kw in self._prefixes[matched]:
+            positions[kw].append(idx)
+
+    def positions(self, index: Dict[str, List[int]], text: str, keyword: str) -> List[int]:
+        """인덱스에서 키워드 위치 조회 (사전에 없는 키워드는 개별 탐색으로 대체)"""
+        if keyword in self.vocabulary:
+            return index.get(keyword, [])
+        return [m.start() for m in re.finditer(re.escape(keyword), text)]
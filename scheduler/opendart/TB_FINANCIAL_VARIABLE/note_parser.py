@@ -0,0 +1,184 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Union
+
+import lxml.html
+
+"""
+    * 재무제표 주석 전처리
+        - TB_DISCLOSURE_INFORMATION.OFS_COMMENT(prettify된 HTML)를 lxml로 1회 파싱
+        - 주석 번호 제목("5. 매출채권" 등) 기준으로 섹션 분리
+        - <table>은 탭 구분(TSV) 행으로 변환하고 단위(천원/백만원 등)를 표 앞에 함께 표기
+        - LLM 입력에서 태그/속성 토큰을 제거하여 호출당 입력 토큰을 축소
+"""
+
+DOCUMENT_SEPARATOR = "\n---\n"
+UNIT_RE = re.compile(r"단위\s*[:：]\s*(?:[A-Z]{3}\s*,?\s*)?(원|천\s*원|백만\s*원|억\s*원)")
+HEADING_RE = re.compile(r"^\s*\d{1,2}\.\s*[^\d\s]")
+BLOCK_TAGS = {"p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "pre", "caption"}
+SKIP_TAGS = {"script", "style", "head", "title"}
+CONTAINER_XPATH = ".//table|.//div|" + "|".join(f".//{tag}" for tag in sorted(BLOCK_TAGS))
+
+
+@dataclass
+class NoteTable:
+    rows: List[List[str]]
+    unit: Optional[str] = None
+    header_rows: int = 0
+
+
+@dataclass
+class NoteSection:
+    title: str
+    blocks: List[Union[str, NoteTable]] = field(default_factory=list)
+
+    @property
+    def tables(self) -> List[NoteTable]:
+        return [b for b in self.blocks if isinstance(b, NoteTable)]
+
+
+def _normalize(text: Optional[str]) -> str:
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def find_unit(text: str) -> Optional[str]:
+    """'(단위 : 천원)' 표기에서 단위 추출 (공백 제거된 형태: 원/천원/백만원/억원)"""
+    match = UNIT_RE.search(text or "")
+    return match.group(1).replace(" ", "") if match else None
+
+
+def _is_heading(el, text: str) -> bool:
+    if el.tag in {"h1", "h2", "h3", "h4", "h5", "h6"}:
+        return True
+    if "SECTION" in (el.get("class") or "").upper():
+        return True
+    return len(text) <= 60 and bool(HEADING_RE.match(text)) and not re.search(r"\d{1,3},\d{3}", text)
+
+
+def _span(cell, name: str) -> int:
+    value = str(cell.get(name, "1")).strip()
+    return max(1, int(value)) if value.isdigit() else 1
+
+
+def _table_grid(table) -> NoteTable:
+    """rowspan/colspan을 펼쳐 2차원 셀 텍스트 그리드로 변환"""
+    grid: List[List[str]] = []
+    spans = {}  # (row, col) → rowspan으로 채워질 텍스트
+    header_rows = 0
+    counting_header = True
+
+    for r, tr in enumerate(table.iter("tr")):
+        row: List[str] = []
+        col = 0
+        cells = tr.xpath("./th|./td")
+        is_header = bool(cells) and (
+            all(c.tag == "th" for c in cells) or tr.getparent().tag == "thead"
+        )
+        for cell in cells:
+            while (r, col) in spans:
+                row.append(spans.pop((r, col)))
+                col += 1
+            text = _normalize(cell.text_content())
+            colspan, rowspan = _span(cell, "colspan"), _span(cell, "rowspan")
+            for c in range(colspan):
+                row.append(text)
+                for dr in range(1, rowspan):
+                    spans[(r + dr, col + c)] = text
+            col += colspan
+        while (r, col) in spans:
+            row.append(spans.pop((r, col)))
+            col += 1
+
+        if counting_header and is_header:
+            header_rows += 1
+        elif row:
+            counting_header = False
+        grid.append(row)
+
+    # 완전히 빈 행 제거
+    kept, kept_header = [], 0
+    for i, row in enumerate(grid):
+        if any(cell for cell in row):
+            kept.append(row)
+            if i < header_rows:
+                kept_header += 1
+    return NoteTable(rows=kept, header_rows=kept_header)
+
+
+class _SectionBuilder:
+    def __init__(self):
+        self.sections: List[NoteSection] = [NoteSection(title="")]
+        self.last_unit: Optional[str] = None
+
+    @property
+    def current(self) -> NoteSection:
+        return self.sections[-1]
+
+    def add_text(self, el, text: str) -> None:
+        if not text:
+            return
+        if _is_heading(el, text):
+            self.sections.append(NoteSection(title=text))
+            self.last_unit = None
+            return
+        unit = find_unit(text)
+        if unit:
+            self.last_unit = unit
+        self.current.blocks.append(text)
+
+    def add_table(self, table_el) -> None:
+        table = _table_grid(table_el)
+        if not table.rows:
+            return
+        width = max(len(r) for r in table.rows)
+        flat = " ".join(cell for row in table.rows for cell in row)
+        # 1칸짜리 표(레이아웃/단위 표기용)는 텍스트로 취급
+        if width <= 1 or (len(table.rows) == 1 and width <= 2):
+            self.add_text(table_el, _normalize(flat))
+            return
+        table.unit = find_unit(flat) or self.last_unit
+        self.current.blocks.append(table)
+
+    def walk(self, el) -> None:
+        if not isinstance(el.tag, str) or el.tag in SKIP_TAGS:
+            return
+        if el.tag == "table":
+            self.add_table(el)
+        elif el.tag in BLOCK_TAGS or not el.xpath(CONTAINER_XPATH):
+            # 블록 요소 또는 인라인 요소만 포함한 컨테이너는 한 줄 텍스트로 취급
+            self.add_text(el, _normalize(el.text_content()))
+        else:
+            self.add_text(el, _normalize(el.text))
+            for child in el:
+                self.walk(child)
+                if isinstance(child.tag, str):
+                    self.add_text(el, _normalize(child.tail))
+
+
+def parse_note_html(html_text: str) -> List[NoteSection]:
+    """주석 HTML(여러 문서가 '---'로 연결된 형태 포함)을 섹션 리스트로 변환"""
+    builder = _SectionBuilder()
+    for part in (html_text or "").split(DOCUMENT_SEPARATOR):
+        if not part.strip():
+            continue
+        root = lxml.html.document_fromstring(part)
+        body = root.find("body")
+        builder.walk(body if body is not None else root)
+    return [s for s in builder.sections if s.title or s.blocks]
+
+
+def render_table(table: NoteTable) -> str:
+    lines = [f"[표] (단위: {table.unit})" if table.unit else "[표]"]
+    lines.extend("\t".join(row) for row in table.rows)
+    return "\n".join(lines)
+
+
+def render_sections(sections: List[NoteSection]) -> str:
+    """섹션 리스트를 LLM 입력용 압축 텍스트로 변환"""
+    out: List[str] = []
+    for section in sections:
+        if section.title:
+            out.append(f"## {section.title}")
+        for block in section.blocks:
+            out.append(render_table(block) if isinstance(block, NoteTable) else block)
+    return "\n".join(out)
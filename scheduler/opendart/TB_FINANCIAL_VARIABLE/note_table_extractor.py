@@ -0,0 +1,172 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from scheduler.opendart.TB_FINANCIAL_VARIABLE.note_parser import NoteSection, NoteTable
+
+"""
+    * 주석 표 기반 규칙 추출 (LLM 호출 전 단계)
+        - note_parser로 파싱한 표에서 행 라벨을 계정 키워드(LLM_Keywords.json / keyword.json)와 매칭
+        - 헤더에서 당기/당분기/당반기 열을 선택하고 표 단위(천원/백만원 등)를 원 단위로 환산
+        - 결과마다 신뢰도(confidence)를 부여 → 임계값 미만인 경우에만 LLM 호출
+        - 단기/장기 계정(단기대여금 등)은 별칭에 구분 표기(단기·유동 / 장기·비유동)가 있어야 높은 신뢰도 부여
+          ('대여금'처럼 구분 없는 합계 라벨은 임계값 미만 → LLM 검증)
+"""
+
+UNIT_SCALE = {"원": 1, "천원": 1_000, "백만원": 1_000_000, "억원": 100_000_000}
+
+# 규칙 추출 대상 계정 → 유동(current)/비유동(non_current) 구분
+RULE_ACCOUNTS = {
+    "매출채권": "current",
+    "매입채무": "current",
+    "미수금": "current",
+    "단기대여금": "current",
+    "장기대여금": "non_current",
+}
+
+CURRENT_PERIOD_RE = re.compile(r"당\)?\s*(?:분|반)?\s*기")
+NOTE_REF_RE = re.compile(r"\(\s*주\s*석?\s*[\d,\s]*\)|주석\s*\d+")
+NUMBER_RE = re.compile(r"^\(?[-△▲]?\s*[\d,]+(?:\.\d+)?\)?$")
+
+# 단기/장기 구분이 계정명에 포함된 계정 → 별칭에 필요한 구분 표기 (비유동은 유동 판정에서 제외)
+SIDE_QUALIFIERS = {"current": ("단기", "유동"), "non_current": ("장기", "비유동")}
+
+# 신뢰도 가중치
+ALIAS_FACTOR = 0.95
+# 구분 표기 없는 별칭 : rule_confidence 기본값(0.9) 미만 → 단독으로 LLM을 건너뛰지 않음
+UNQUALIFIED_ALIAS_FACTOR = 0.8
+AMBIGUOUS_FACTOR = 0.5
+UNKNOWN_UNIT_FACTOR = 0.6
+
+
+@dataclass
+class TableExtraction:
+    value: int
+    confidence: float
+    label: str
+    unit: Optional[str]
+
+
+def normalize_label(text: str) -> str:
+    """주석 참조 표기 제거 후 한글만 남김 (opendart_pre._clean_korean과 동일 기준)"""
+    return re.sub(r"[^가-힣]", "", NOTE_REF_RE.sub("", text or ""))
+
+
+def has_side_qualifier(label: str, side: str) -> bool:
+    """정규화된 라벨에 계정 구분(단기·유동 / 장기·비유동) 표기가 있는지"""
+    if side == "current":
+        return "단기" in label or "유동" in label.replace("비유동", "")
+    return any(q in label for q in SIDE_QUALIFIERS[side])
+
+
+def parse_amount(text: str) -> Optional[float]:
+    """'1,234' / '(1,234)' / '△1,234' / '-' → 숫자 (표기 불가 시 None)"""
+    value = (text or "").strip().replace(" ", "")
+    if value in {"-", "–", "—"}:
+        return 0.0
+    if not value or not NUMBER_RE.match(value):
+        return None
+    negative = (value.startswith("(") and value.endswith(")")) or value.lstrip("(").startswith(("-", "△", "▲"))
+    digits = re.sub(r"[^\d.]", "", value)
+    if not digits:
+        return None
+    number = float(digits)
+    return -number if negative else number
+
+
+class NoteTableExtractor:
+    def __init__(self, *keyword_maps: Dict[str, List[str]]):
+        """
+        keyword_maps: 계정명 → 후보 라벨 리스트 매핑(LLM_Keywords.json, keyword.json 순서 무관)
+        """
+        self.labels: Dict[str, Dict[str, float]] = {}
+        for account, side in RULE_ACCOUNTS.items():
+            opposite = ("장기", "비유동") if side == "current" else ("단기",)
+            # 계정명에 단기/장기가 있으면 별칭도 같은 구분 표기가 있어야 ALIAS_FACTOR
+            side_named = account.startswith(("단기", "장기"))
+            labels = {normalize_label(account): 1.0}
+            for keyword_map in keyword_maps:
+                for kw in keyword_map.get(account, []) or []:
+                    norm = normalize_label(kw)
+                    if norm and norm not in labels and not any(o in norm for o in opposite):
+                        qualified = not side_named or has_side_qualifier(norm, side)
+                        labels[norm] = ALIAS_FACTOR if qualified else UNQUALIFIED_ALIAS_FACTOR
+            self.labels[account] = labels
+
+    def supports(self, account_name: str) -> bool:
+        return account_name in self.labels
+
+    def _current_columns(self, table: NoteTable) -> List[int]:
+        header_rows = table.rows[: table.header_rows] if table.header_rows else table.rows[:1]
+        width = max(len(r) for r in table.rows)
+        columns = []
+        for j in range(1, width):
+            header = " ".join(r[j] for r in header_rows if j < len(r))
+            if CURRENT_PERIOD_RE.search(header) and "전" not in header:
+                columns.append(j)
+        return columns
+
+    def _pick_column(self, table: NoteTable, columns: List[int], side: str):
+        """당기 열이 여러 개(유동/비유동 분할 등)인 경우 계정 구분에 맞는 열 선택"""
+        if len(columns) == 1:
+            return columns[0], 1.0
+        header_rows = table.rows[: max(table.header_rows, 1)]
+        matched = []
+        for j in columns:
+            header = " ".join(r[j] for r in header_rows if j < len(r))
+            if side == "current" and "유동" in header and "비유동" not in header:
+                matched.append(j)
+            elif side == "non_current" and "비유동" in header:
+                matched.append(j)
+        if len(matched) == 1:
+            return matched[0], 1.0
+        return columns[0], AMBIGUOUS_FACTOR
+
+    def _table_candidates(self, table: NoteTable, account_name: str) -> List[TableExtraction]:
+        labels = self.labels[account_name]
+        columns = self._current_columns(table)
+        if not columns:
+            return []
+        column, confidence = self._pick_column(table, columns, RULE_ACCOUNTS[account_name])
+        scale = UNIT_SCALE.get(table.unit or "")
+        if scale is None:
+            scale, confidence = 1, confidence * UNKNOWN_UNIT_FACTOR
+
+        results = []
+        for row in table.rows[table.header_rows:]:
+            if not row or column >= len(row):
+                continue
+            label = normalize_label(row[0])
+            if label not in labels:
+                continue
+            amount = parse_amount(row[column])
+            if amount is None:
+                continue
+            results.append(TableExtraction(
+                value=int(round(amount * scale)),
+                confidence=confidence * labels[label],
+                label=row[0],
+                unit=table.unit,
+            ))
+        return results
+
+    def extract(self, sections: List[NoteSection], account_name: str) -> Optional[TableExtraction]:
+        """
+        전체 섹션의 표에서 계정 금액을 추출
+        - 후보가 모두 같은 값이면 최고 신뢰도 후보 반환
+        - 서로 다른 값이 섞여 있으면 신뢰도를 낮춰 반환 (LLM 검증 대상)
+        """
+        if not self.supports(account_name):
+            return None
+        candidates = []
+        for section in sections:
+            for table in section.tables:
+                if table.rows:
+                    candidates.extend(self._table_candidates(table, account_name))
+        if not candidates:
+            return None
+
+        best = max(candidates, key=lambda c: c.confidence)
+        if len({c.value for c in candidates}) > 1:
+            best.confidence *= AMBIGUOUS_FACTOR
+        return best
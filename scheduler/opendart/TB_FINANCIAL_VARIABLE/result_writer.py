@@ -0,0 +1,94 @@
+import time
+from typing import List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from infrastructure.queryFactory.base_orm import BaseQueryFactory
+from db.public.models import TB_FINANCIAL_VARIABLE
+from error.errors import DataBaseError
+from Logger import logger
+
+"""
+    * TB_FINANCIAL_VARIABLE LLM 결과 일괄 반영
+        - 추출 결과를 버퍼에 모아 N건 또는 T초마다 BaseQueryFactory.bulk_update로 반영 (UPDATE ... FROM (VALUES ...))
+        - 배치마다 커밋 → 중간 실패/중단 시에도 이전 배치까지는 보존
+        - 반영 실패 시 배치를 나눠 문제 행만 제외, 전체 실패는 max_retries까지 재시도
+        - IS_COMPLETE=False 결과는 ACCOUNT_AMOUNT를 덮어쓰지 않음 (기존 update 동작과 동일)
+"""
+
+
+class LLMResultWriter:
+    def __init__(self, conn: Session, batch_size: int = 50, flush_sec: float = 30.0, max_retries: int = 3):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.flush_sec = flush_sec
+        self.max_retries = max_retries
+        self._pending: List[tuple] = []
+        self._last_flush = time.monotonic()
+        self._retries = 0
+        self.written = 0
+        self.dropped = 0
+
+    def add(self, row_id: int, is_complete: bool, amount: Optional[object] = None) -> None:
+        """결과 1건 적재 (배치 크기/주기 도달 시 자동 반영, 직전 반영 실패 시 flush_sec 동안 자동 반영 보류)"""
+        self._pending.append((
+            row_id,
+            bool(is_complete),
+            str(amount) if is_complete and amount is not None else None,
+        ))
+        elapsed = time.monotonic() - self._last_flush
+        if elapsed >= self.flush_sec or (len(self._pending) >= self.batch_size and not self._retries):
+            self.flush()
+
+    @staticmethod
+    def _pairs(items: List[tuple]) -> list:
+        # 미완료 결과는 IS_COMPLETE만 갱신 → 변경 컬럼 구성별로 묶여 배치당 UPDATE 1문장
+        return [
+            (row_id, {"IS_COMPLETE": True, "ACCOUNT_AMOUNT": amount} if is_complete else {"IS_COMPLETE": False})
+            for row_id, is_complete, amount in items
+        ]
+
+    def _write(self, items: List[tuple]) -> Tuple[List[tuple], List[tuple]]:
+        """
+        items 반영 시도, (반영된 항목, 단건으로도 실패한 항목) 반환
+        - 실패 시 절반씩 나눠 재시도 → 문제 행만 분리 (문장 수 최대 약 2n)
+        """
+        try:
+            BaseQueryFactory(self.conn, TB_FINANCIAL_VARIABLE).bulk_update(self._pairs(items), batch_size=self.batch_size)
+            return items, []
+        except DataBaseError as e:
+            if len(items) == 1:
+                logger.error(f"[LLM] 결과 반영 실패 행 (ID={items[0][0]}): {e}")
+                return [], items
+        mid = len(items) // 2
+        ok_left, bad_left = self._write(items[:mid])
+        ok_right, bad_right = self._write(items[mid:])
+        return ok_left + ok_right, bad_left + bad_right
+
+    def flush(self) -> int:
+        """
+        버퍼 전체를 bulk_update로 반영 후 커밋
+        - 일부 행만 실패 : 실패 행은 제외(로그) 후 나머지 반영 → 문제 행이 이후 반영을 막지 않음
+        - 전체 실패(DB 장애 등) : 버퍼 유지 후 다음 주기에 재시도, max_retries 초과 시 폐기
+          (폐기된 행은 IS_COMPLETE가 갱신되지 않아 다음 실행에서 다시 처리됨)
+        """
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return 0
+
+        written, failed = self._write(self._pending)
+        if failed and not written:
+            self._retries += 1
+            if self._retries <= self.max_retries:
+                logger.error(f"[LLM] 결과 일괄 반영 실패({len(failed)}건 보류, 재시도 {self._retries}/{self.max_retries})")
+                return 0
+            logger.error(f"[LLM] 결과 일괄 반영 재시도 초과 → {len(failed)}건 폐기")
+        elif failed:
+            logger.error(f"[LLM] 반영 실패 행 {len(failed)}건 제외: {[item[0] for item in failed]}")
+
+        self._retries = 0
+        self.dropped += len(failed)
+        self.written += len(written)
+        self._pending = []
+        logger.info(f"[LLM] 결과 일괄 반영: {len(written)}건 (누적 {self.written}건, 제외 누적 {self.dropped}건)")
+        return len(written)
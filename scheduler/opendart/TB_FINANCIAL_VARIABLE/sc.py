@@ -10,6 +10,14 @@ from setting.inject import provision_inject_orm
 from setting.database_orm import SessionLocal
 from infrastructure.queryFactory.base_orm import BaseQueryFactory
 from scheduler.opendart.TB_FINANCIAL_VARIABLE.prompt.prompt_loader import get_prompt_by_account
+from scheduler.opendart.TB_FINANCIAL_VARIABLE.keyword_index import KeywordIndex
+from scheduler.opendart.TB_FINANCIAL_VARIABLE.note_parser import parse_note_html, render_sections
+from scheduler.opendart.TB_FINANCIAL_VARIABLE.note_table_extractor import NoteTableExtractor
+from scheduler.opendart.TB_FINANCIAL_VARIABLE.result_writer import LLMResultWriter
+from scheduler.opendart.TB_FINANCIAL_VARIABLE.token_budget import (
+    MODEL_TOKEN_BUDGETS, budget_for_model, estimate_tokens, truncate_to_tokens,
+    merge_ranges, fallback_ranges, pack_ranges,
+)
 from db.public.models import TB_FINANCIAL_VARIABLE, TB_DISCLOSURE_INFORMATION
 from Logger import logger , request_context
 from error.email.email_logger import attach_error_email_handler
@@ -19,8 +27,36 @@ from error.email.email_logger import attach_error_email_handler
         - 스케줄러 주기: TB_FINANCIAL_STATEMENTS 와 동일
 
 """
+DEFAULT_SYSTEM_PROMPT = (
+    "당신은 재무제표 주석의 숫자 데이터를 정확하게 추출하는 정보 추출 전문가입니다. "
+    "재무제표 주석(표는 탭으로 구분된 행, 표 앞에 단위 표기)에서 특정 항목의 '당기말' 또는 '당기/당분기/당반기' 금액만 숫자로 추출하세요. "
+    "'전기' 금액은 제외합니다. 금액은 항상 '원' 단위로 환산(천원→×1,000 / 백만원→×100,000)하고, "
+    "음수를 의미하는 ((value)) 표기는 반드시 '-' 부호로 반영하세요. "
+    "출력에는 텍스트/단위를 포함하지 말고, 쉼표는 허용됩니다. 하나의 숫자만 반환, 없으면 0을 반환하세요."
+)
+LOAN_SYSTEM_PROMPT = (
+    "당신은 기업의 총차입금 항목을 정확하게 추출하는 금융 정보 추출 전문가입니다. "
+    "재무제표 주석(표는 탭으로 구분된 행, 표 앞에 단위 표기)에서 특정 항목의 '당기말/당기/당분기/당반기' 금액만 숫자로 추출하세요(전기 제외). "
+    "모든 금액은 '원' 단위로 환산하세요(천원×1,000 / 백만원×100,000). "
+    "항목: 단기차입금, 장기차입금, 유동성장기차입금, 사채(유동/비유동), 금융리스부채(유동/비유동). "
+    "아래 JSON 포맷을 정확히 지켜 응답하세요(키/순서 동일, 값은 정수):\n"
+    "{\n"
+    " '단기차입금': 0,\n"
+    " '장기차입금': 0,\n"
+    " '유동성장기차입금': 0,\n"
+    " '사채_유동': 0,\n"
+    " '사채_비유동': 0,\n"
+    " '금융리스부채_유동': 0,\n"
+    " '금융리스부채_비유동': 0,\n"
+    " '금융리스부채_합계': 0\n"
+    "}\n"
+)
+USER_PROMPT_TEMPLATE = "아래는 기업의 재무제표 주석입니다:\n\n{comment}\n\n{prompt}"
+# 입력 예산 산정 시 추정 오차 대비 여유분(토큰)
+TOKEN_RESERVE = 512
+
 class SchedulerServiceTBFinancialVariableLLM:
-    def __init__(self, model_default: str = "gpt-5"):
+    def __init__(self, model_default: str = "gpt-5", rule_confidence: float = 0.9, token_budgets: Optional[Dict[str, int]] = None):
         cfg = provision_inject_orm()
         self.api_key = getattr(cfg, "OPENAI_API_KEY", None) or os.getenv("OPENAI_API_KEY")
         self.model_default = model_default
@@ -40,33 +76,104 @@ class SchedulerServiceTBFinancialVariableLLM:
         except Exception as e:
             logger.warn(f"[LLM] 키워드 맵 로드 실패: {e} → 빈 맵 사용")
             self.account_keywords = {}
+        try:
+            with open(
+                "/app/infrastructure/opendart/financial/map/keyword.json",
+                "r",
+                encoding="utf-8"
+            ) as f:
+                keyword_map = json.load(f)
+        except Exception as e:
+            logger.warn(f"[LLM] 표준계정 키워드 맵 로드 실패: {e} → LLM 키워드만 사용")
+            keyword_map = {}
+        # 전체 키워드를 단일 정규식으로 1회 컴파일 (문서당 1회 스캔)
+        self.keyword_index = KeywordIndex(self.account_keywords)
+        # 주석 표 규칙 추출기: 신뢰도가 rule_confidence 이상이면 LLM 호출 생략
+        self.table_extractor = NoteTableExtractor(self.account_keywords, keyword_map)
+        self.rule_confidence = rule_confidence
+        # 모델별 입력 토큰 예산 (초과 요청은 전송하지 않음)
+        self.token_budgets = {**MODEL_TOKEN_BUDGETS, **(token_budgets or {})}
+        self._llm_calls = 0
         self._loan_cache = {}
+        # 직전 문서(RCEPT_NO) 압축 텍스트/키워드 위치 인덱스/파싱 섹션 캐시
+        self._document_cache = (None, None, None, None)
 
     def _clean_html_text(self, html_text: str) -> str:
         return re.sub(r"\s+", " ", html_text).strip()
 
-    def _extract_snippet_near_keywords(self, text: str, account_name: str, window: int = 1000) -> str:
+    def _compact_note_text(self, html_text: str):
+        """주석 HTML → (섹션/표(TSV) 압축 텍스트, 섹션 리스트) (파싱 실패 시 공백 정리만 수행)"""
+        try:
+            sections = parse_note_html(html_text)
+            compact = render_sections(sections)
+        except Exception as e:
+            logger.warn(f"[LLM] 주석 HTML 파싱 실패 → 원문 사용: {e}")
+            return self._clean_html_text(html_text), []
+        if not compact.strip():
+            return self._clean_html_text(html_text), []
+        return compact, sections
+
+    def _prepare_document(self, comment_html: str, rcept_no: str):
+        """RCEPT_NO 단위로 압축 텍스트, 키워드 위치 인덱스, 파싱 섹션을 1회만 생성"""
+        cached_no, cleaned, index, sections = self._document_cache
+        if cached_no is not None and cached_no == rcept_no:
+            return cleaned, index, sections
+        cleaned, sections = self._compact_note_text(comment_html)
+        logger.info(f"[LLM] 주석 압축: {len(comment_html):,}자 → {len(cleaned):,}자 (RCEPT_NO={rcept_no})")
+        index = self.keyword_index.build(cleaned)
+        self._document_cache = (rcept_no, cleaned, index, sections)
+        return cleaned, index, sections
+
+    def _extract_by_rule(self, sections: list, account_name: str) -> Optional[int]:
+        """주석 표 규칙 추출 (신뢰도 임계값 이상일 때만 값 반환)"""
+        if not sections or not self.table_extractor.supports(account_name):
+            return None
+        found = self.table_extractor.extract(sections, account_name)
+        if found is None:
+            return None
+        if found.confidence < self.rule_confidence:
+            logger.info(f"[RULE] 신뢰도 부족({found.confidence:.2f}) → LLM 위임: {account_name} / {found.label}={found.value}")
+            return None
+        logger.info(f"[RULE] 표 추출: {account_name} / {found.label}={found.value} (단위: {found.unit}, 신뢰도: {found.confidence:.2f})")
+        return found.value
+
+    def _input_budget(self, prompt: str) -> int:
+        """현재 모델 예산에서 시스템/사용자 프롬프트와 여유분을 뺀 주석 본문 토큰 예산"""
+        budget = budget_for_model(self.model_default, self.token_budgets)
+        overhead = estimate_tokens(self._system_prompt(prompt)) + estimate_tokens(USER_PROMPT_TEMPLATE.format(comment="", prompt=prompt))
+        return max(0, budget - overhead - TOKEN_RESERVE)
+
+    def _extract_snippet_near_keywords(self, text: str, account_name: str, window: int = 1000, index: Optional[dict] = None, max_tokens: Optional[int] = None) -> str:
+        """키워드 주변 윈도우를 키워드 밀도 순으로 토큰 예산(max_tokens) 안에 채워 반환"""
         keywords = self.account_keywords.get(account_name, [account_name])
         logger.debug(f"[LLM] 키워드 매핑({account_name}): {keywords}")
-
-        ranges = []
-        for kw in keywords:
-            for match in re.finditer(re.escape(kw), text):
-                idx = match.start()
-                start = max(0, idx - window)
-                end = min(len(text), idx + len(kw) + window)
-                ranges.append((start, end))
-        if not ranges:
+        if index is None:
+            index = self.keyword_index.build(text)
+        if max_tokens is None:
+            max_tokens = self._input_budget("")
+
+        hits = [
+            (idx, len(kw))
+            for kw in keywords
+            for idx in self.keyword_index.positions(index, text, kw)
+        ]
+        if not hits:
             return ""
+        return pack_ranges(text, merge_ranges(hits, window, len(text)), max_tokens)
 
-        ranges.sort()
-        merged = []
-        for s, e in ranges:
-            if not merged or merged[-1][1] < s:
-                merged.append((s, e))
-            else:
-                merged[-1] = (merged[-1][0], max(merged[-1][1], e))
-        return " ".join(text[s:e] for s, e in merged)
+    def _select_chunk(self, text: str, account_name: str, prompt: str, index: Optional[dict] = None, window: int = 1000) -> str:
+        """
+        LLM 입력 본문 선택
+        - 키워드 스니펫을 예산 내로 구성
+        - 스니펫이 없으면 전체 주석 대신 당기/단위/합계 표기 밀도가 높은 구간만 예산 내로 구성
+        """
+        budget = self._input_budget(prompt or "")
+        snippet = self._extract_snippet_near_keywords(text, account_name, window=window, index=index, max_tokens=budget)
+        if snippet.strip():
+            return snippet
+        logger.warn(f"[LLM] 스니펫 없음 ({account_name}) → 표기 밀도 상위 구간 사용")
+        chunk = pack_ranges(text, fallback_ranges(text, 2 * window), budget)
+        return chunk if chunk.strip() else truncate_to_tokens(text, budget)
 
     def _build_chat_kwargs_v5(self, messages: list) -> dict:
         return {
@@ -92,37 +199,24 @@ class SchedulerServiceTBFinancialVariableLLM:
             return self._build_chat_kwargs_v41(messages)
         return self._build_chat_kwargs_v41(messages)
 
+    def _system_prompt(self, prompt: str) -> str:
+        return LOAN_SYSTEM_PROMPT if "총차입금" in prompt else DEFAULT_SYSTEM_PROMPT
+
+    def _build_messages(self, comment_text: str, prompt: str) -> list:
+        # 최종 방어: 예산 초과 본문은 잘라서 전송 (초과 요청 자체를 보내지 않음)
+        budget = self._input_budget(prompt)
+        if estimate_tokens(comment_text) > budget:
+            logger.warn(f"[LLM] 입력 토큰 예산 초과 → {budget:,} 토큰으로 절단 (모델: {self.model_default})")
+            comment_text = truncate_to_tokens(comment_text, budget)
+        return [
+            {"role": "system", "content": self._system_prompt(prompt)},
+            {"role": "user", "content": USER_PROMPT_TEMPLATE.format(comment=comment_text, prompt=prompt)},
+        ]
+
     def _call_llm(self, comment_text: str, prompt: str, retry: int = 0) -> str:
+        self._llm_calls += 1
         try:
-            default_system_prompt = (
-                "당신은 재무제표 주석의 숫자 데이터를 정확하게 추출하는 정보 추출 전문가입니다. "
-                "HTML 형태의 재무제표 주석에서 특정 항목의 '당기말' 또는 '당기/당분기/당반기' 금액만 숫자로 추출하세요. "
-                "'전기' 금액은 제외합니다. 금액은 항상 '원' 단위로 환산(천원→×1,000 / 백만원→×100,000)하고, "
-                "음수를 의미하는 ((value)) 표기는 반드시 '-' 부호로 반영하세요. "
-                "출력에는 텍스트/단위를 포함하지 말고, 쉼표는 허용됩니다. 하나의 숫자만 반환, 없으면 0을 반환하세요."
-            )
-            loan_system_prompt = (
-                "당신은 기업의 총차입금 항목을 정확하게 추출하는 금융 정보 추출 전문가입니다. "
-                "HTML 형태의 재무제표 주석에서 특정 항목의 '당기말/당기/당분기/당반기' 금액만 숫자로 추출하세요(전기 제외). "
-                "모든 금액은 '원' 단위로 환산하세요(천원×1,000 / 백만원×100,000). "
-                "항목: 단기차입금, 장기차입금, 유동성장기차입금, 사채(유동/비유동), 금융리스부채(유동/비유동). "
-                "아래 JSON 포맷을 정확히 지켜 응답하세요(키/순서 동일, 값은 정수):\n"
-                "{\n"
-                " '단기차입금': 0,\n"
-                " '장기차입금': 0,\n"
-                " '유동성장기차입금': 0,\n"
-                " '사채_유동': 0,\n"
-                " '사채_비유동': 0,\n"
-                " '금융리스부채_유동': 0,\n"
-                " '금융리스부채_비유동': 0,\n"
-                " '금융리스부채_합계': 0\n"
-                "}\n"
-            )
-            system_prompt = loan_system_prompt if "총차입금" in prompt else default_system_prompt
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"아래는 기업의 재무제표 주석입니다:\n\n{comment_text}\n\n{prompt}"},
-            ]
+            messages = self._build_messages(comment_text, prompt)
             kwargs = self._build_chat_kwargs(messages)
             resp = self.client.chat.completions.create(**kwargs)
             return resp.choices[0].message.content.strip()
@@ -214,13 +308,12 @@ class SchedulerServiceTBFinancialVariableLLM:
                 fixed[k] = 0
         return json.dumps(fixed, ensure_ascii=False, indent=2)
 
-    def _calculate_total_loan(self, cleaned_html: str) -> Dict[str, object]:
+    def _calculate_total_loan(self, cleaned_html: str, index: Optional[dict] = None) -> Dict[str, object]:
         categories = ["총차입금", "리스부채"]
         merged: dict = {}
         for account in categories:
             prompt_retry = get_prompt_by_account(account)
-            snippet_retry = self._extract_snippet_near_keywords(cleaned_html, account)
-            chunk = snippet_retry if snippet_retry.strip() else cleaned_html
+            chunk = self._select_chunk(cleaned_html, account, prompt_retry, index=index)
             value = self._call_llm(chunk, prompt_retry)
             if not value or not value.strip().startswith("{"):
                 continue
@@ -255,7 +348,7 @@ class SchedulerServiceTBFinancialVariableLLM:
         logger.info(f"[LLM] 총차입금+리스부채 합산: {merged} → 합계: {total}")
         return {"ACCOUNT_AMOUNT": int(total), "IS_COMPLETE": True, "RAW_VALUE": json.dumps(merged, ensure_ascii=False)}
     
-    def _extract_loan_receivable(self, cleaned_html: str, rcept_no: str) -> Dict[str, int]:
+    def _extract_loan_receivable(self, cleaned_html: str, rcept_no: str, index: Optional[dict] = None, sections: Optional[list] = None) -> Dict[str, int]:
         """
         대여금(단기/장기) JSON 1회 추출 캐시:
         - 동일 RCEPT_NO에서 '단기대여금'과 '장기대여금'을 각각 요청하더라도 LLM 호출은 1번만 수행
@@ -266,6 +359,13 @@ class SchedulerServiceTBFinancialVariableLLM:
         if rcept_no in self._loan_cache:
             return self._loan_cache[rcept_no]
 
+        # 1-1) 주석 표에서 단기/장기 모두 확정되면 LLM 호출 생략
+        ruled = {k: self._extract_by_rule(sections, k) for k in ("단기대여금", "장기대여금")}
+        if all(v is not None for v in ruled.values()):
+            self._loan_cache[rcept_no] = ruled
+            logger.info(f"[RULE] 대여금 표 추출(캐시 저장): {ruled} (RCEPT_NO={rcept_no})")
+            return ruled
+
         # 2) 프롬프트: '대여금' 이름으로 강제 사용 (없으면 안전한 기본 프롬프트)
         receivable_prompt = get_prompt_by_account("대여금") or (
             "아래 HTML 주석에서 '대여금' 관련 표/문단을 분석해 "
@@ -280,9 +380,8 @@ class SchedulerServiceTBFinancialVariableLLM:
             "숫자 외 텍스트/단위는 넣지 마세요."
         )
 
-        # 3) 스니펫 추출
-        snippet = self._extract_snippet_near_keywords(cleaned_html, "대여금")
-        chunk = snippet if snippet and snippet.strip() else cleaned_html
+        # 3) 스니펫 추출 (토큰 예산 내)
+        chunk = self._select_chunk(cleaned_html, "대여금", receivable_prompt, index=index)
 
         # 4) LLM 호출 및 JSON 보정
         value = self._call_llm(chunk, receivable_prompt)
@@ -306,9 +405,9 @@ class SchedulerServiceTBFinancialVariableLLM:
         return fixed
 
     def _extract_value_with_flags(self, comment_html: str, account_name: str, rcept_no: str) -> Dict[str, object]:
-        cleaned_html = self._clean_html_text(comment_html)
+        cleaned_html, index, sections = self._prepare_document(comment_html, rcept_no)
         if account_name in {"단기대여금", "장기대여금"}:
-            parsed_recv = self._extract_loan_receivable(cleaned_html, rcept_no)
+            parsed_recv = self._extract_loan_receivable(cleaned_html, rcept_no, index=index, sections=sections)
             amt = int(parsed_recv.get(account_name, 0) or 0)
             return {
                 "ACCOUNT_AMOUNT": amt,
@@ -316,16 +415,18 @@ class SchedulerServiceTBFinancialVariableLLM:
                 "RAW_VALUE": json.dumps(parsed_recv, ensure_ascii=False)
             }
 
+        # 1) 주석 표 규칙 추출 (확정 시 LLM 호출 생략)
+        ruled = self._extract_by_rule(sections, account_name)
+        if ruled is not None:
+            return {"ACCOUNT_AMOUNT": ruled, "IS_COMPLETE": True, "RAW_VALUE": str(ruled)}
+
         # 일반 케이스 프롬프트 조회 (대여금은 위에서 처리됨)
         prompt = get_prompt_by_account(account_name)
         if not prompt and account_name not in {"대여금"}:
             return {"ACCOUNT_AMOUNT": None, "IS_COMPLETE": False, "RAW_VALUE": None}
 
-        # 2) 스니펫 추출 (없으면 전체 HTML)
-        snippet_text = self._extract_snippet_near_keywords(cleaned_html, account_name)
-        chunk_text = snippet_text if snippet_text.strip() else cleaned_html
-        if not snippet_text.strip():
-            logger.warn(f"[LLM] 스니펫 없음 ({account_name})")
+        # 2) 스니펫 추출 (토큰 예산 내, 없으면 표기 밀도 상위 구간)
+        chunk_text = self._select_chunk(cleaned_html, account_name, prompt, index=index)
 
         # 3) 총차입금(단일): 단일 숫자 시도 후 실패 시 합산 로직
         if account_name == "총차입금(단일)":
@@ -333,7 +434,7 @@ class SchedulerServiceTBFinancialVariableLLM:
             if val is not None:
                 logger.info(f"[LLM] 총차입금(단일) 1차 추출: {val}")
                 return {"ACCOUNT_AMOUNT": val, "IS_COMPLETE": True, "RAW_VALUE": f"{val}"}
-            return self._calculate_total_loan(cleaned_html)
+            return self._calculate_total_loan(cleaned_html, index=index)
 
         # 4) 일반 항목
         for _ in range(2):
@@ -344,7 +445,7 @@ class SchedulerServiceTBFinancialVariableLLM:
                 return {"ACCOUNT_AMOUNT": parsed, "IS_COMPLETE": True, "RAW_VALUE": str(value)}
         return {"ACCOUNT_AMOUNT": 0, "IS_COMPLETE": True, "RAW_VALUE": "0"}
 
-    def run(self, throttle_sec: float = 5.0) -> int:
+    def run(self, throttle_sec: float = 5.0, batch_size: int = 50, flush_sec: float = 30.0) -> int:
         request_context.request_id = str(uuid4())
         logger.info("[LLM] TB_FINANCIAL_VARIABLE 추출 스케줄러 시작")
 
@@ -352,6 +453,7 @@ class SchedulerServiceTBFinancialVariableLLM:
         with SessionLocal() as conn:
             factory_var = BaseQueryFactory(conn=conn, model=TB_FINANCIAL_VARIABLE)
             factory_dis = BaseQueryFactory(conn=conn, model=TB_DISCLOSURE_INFORMATION)
+            writer = LLMResultWriter(conn, batch_size=batch_size, flush_sec=flush_sec)
 
             # 후보 조회: IS_LLM=True & IS_COMPLETE=False & (ACCOUNT_AMOUNT 비어있음)
             candidates = factory_var.find_all(IS_LLM=True, IS_COMPLETE=False)
@@ -361,36 +463,50 @@ class SchedulerServiceTBFinancialVariableLLM:
                 logger.info("[LLM] 처리할 항목 없음")
                 return 0
 
-            logger.info(f"[LLM] 후보 {len(candidates)}건 처리 시작")
-
-            for row in candidates:
-                try:
-                    disclosure = factory_dis.find_one(RCEPT_NO=row.RCEPT_NO)
-                    if not disclosure or not disclosure.OFS_COMMENT:
-                        logger.warn(f"[LLM] 주석 없음: RCEPT_NO={row.RCEPT_NO}")
-                        continue
-
-                    model_name = "gpt-4.1" if row.ACCOUNT_NM in {"총차입금(단일)", "개발비", "이자비용","단기대여금","장기대여금"} else self.model_default
-                    self.model_default = model_name  
-
-                    result = self._extract_value_with_flags(
-                        comment_html=disclosure.OFS_COMMENT,
-                        account_name=row.ACCOUNT_NM,
-                        rcept_no=row.RCEPT_NO
-                    )
-                    logger.info(f"[LLM:{model_name}] RCEPT_NO={row.RCEPT_NO} → 결과: {result}")
-
-                    update_data = {"IS_COMPLETE": bool(result.get("IS_COMPLETE", False))}
-                    if result.get("IS_COMPLETE", False):
-                        update_data["ACCOUNT_AMOUNT"] = result.get("ACCOUNT_AMOUNT")
-
-                    factory_var.update(row, **update_data)
-                    processed += 1
-
-                    time.sleep(throttle_sec)
+            # 동일 문서 후보를 연속 처리 → 문서당 정제/키워드 스캔 1회
+            # 배치 커밋 후 ORM 객체 만료(재조회)를 피하기 위해 필요한 값만 미리 추출
+            jobs = sorted(
+                ((r.ID, r.RCEPT_NO, r.ACCOUNT_NM) for r in candidates),
+                key=lambda j: (j[1] or "", j[0]),
+            )
+            logger.info(f"[LLM] 후보 {len(jobs)}건 처리 시작")
 
-                except Exception as e:
-                    logger.error(f"[LLM] 처리 실패: RCEPT_NO={row.RCEPT_NO} / {e}", exc_info=True)
+            try:
+                for row_id, rcept_no, account_nm in jobs:
+                    try:
+                        disclosure = factory_dis.find_one(RCEPT_NO=rcept_no)
+                        if not disclosure or not disclosure.OFS_COMMENT:
+                            logger.warn(f"[LLM] 주석 없음: RCEPT_NO={rcept_no}")
+                            continue
+
+                        model_name = "gpt-4.1" if account_nm in {"총차입금(단일)", "개발비", "이자비용","단기대여금","장기대여금"} else self.model_default
+                        self.model_default = model_name  
+
+                        llm_calls_before = self._llm_calls
+                        result = self._extract_value_with_flags(
+                            comment_html=disclosure.OFS_COMMENT,
+                            account_name=account_nm,
+                            rcept_no=rcept_no
+                        )
+                        logger.info(f"[LLM:{model_name}] RCEPT_NO={rcept_no} → 결과: {result}")
+
+                        # 결과는 버퍼에 적재 후 N건/T초 단위로 일괄 반영
+                        writer.add(
+                            row_id,
+                            bool(result.get("IS_COMPLETE", False)),
+                            result.get("ACCOUNT_AMOUNT"),
+                        )
+                        processed += 1
+
+                        # 규칙 추출로 LLM 호출이 없었으면 대기 생략
+                        if self._llm_calls > llm_calls_before:
+                            time.sleep(throttle_sec)
+
+                    except Exception as e:
+                        logger.error(f"[LLM] 처리 실패: RCEPT_NO={rcept_no} / {e}", exc_info=True)
+            finally:
+                # 중단/예외 시에도 남은 결과 반영
+                writer.flush()
 
         logger.info(f"[LLM] 스케줄러 종료 (처리: {processed}건)")
         return processed
@@ -0,0 +1,118 @@
+import math
+import re
+from typing import Dict, List, Tuple
+
+"""
+    * LLM 입력 토큰 예산 관리
+        - 토크나이저 의존성 없이 보수적으로 토큰 수를 추정 (한글/비ASCII 1자 ≈ 1토큰, ASCII 4자 ≈ 1토큰)
+        - 후보 윈도우를 키워드 밀도 순으로 정렬하여 모델별 예산 안에 채워 넣음 (출력은 문서 순서 유지)
+        - 키워드가 전혀 없는 문서는 당기/단위 표기 밀도가 높은 구간만 예산 내에서 선택 (전체 주석 전송 금지)
+"""
+
+# 모델별 입력 토큰 예산 (접두어 매칭, 미지정 모델은 "default")
+MODEL_TOKEN_BUDGETS: Dict[str, int] = {
+    "gpt-5": 24000,
+    "gpt-4.1": 24000,
+    "default": 12000,
+}
+
+WINDOW_SEPARATOR = "\n...\n"
+FALLBACK_MARKER_RE = re.compile(r"당\s*(?:분|반)?\s*기|단위|합\s*계")
+
+Range = Tuple[int, int, int]  # (start, end, hits)
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def budget_for_model(model: str, budgets: Dict[str, int] = None) -> int:
+    budgets = budgets or MODEL_TOKEN_BUDGETS
+    for prefix, budget in sorted(budgets.items(), key=lambda kv: -len(kv[0])):
+        if prefix != "default" and str(model).startswith(prefix):
+            return budget
+    return budgets.get("default", MODEL_TOKEN_BUDGETS["default"])
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """앞에서부터 max_tokens 이내로 자르기"""
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo]
+
+
+def merge_ranges(hits: List[Tuple[int, int]], window: int, text_len: int) -> List[Range]:
+    """키워드 위치(시작, 길이) → 앞뒤 window를 붙여 겹치는 구간 병합 (구간별 적중 수 포함)"""
+    ranges = sorted(
+        (max(0, idx - window), min(text_len, idx + length + window)) for idx, length in hits
+    )
+    merged: List[List[int]] = []
+    for s, e in ranges:
+        if not merged or merged[-1][1] < s:
+            merged.append([s, e, 1])
+        else:
+            merged[-1][1] = max(merged[-1][1], e)
+            merged[-1][2] += 1
+    return [tuple(m) for m in merged]
+
+
+def fallback_ranges(text: str, chunk_size: int) -> List[Range]:
+    """키워드가 없을 때: 고정 크기 구간별 당기/단위/합계 표기 수를 밀도로 사용"""
+    ranges = []
+    for start in range(0, len(text), chunk_size):
+        end = min(len(text), start + chunk_size)
+        hits = len(FALLBACK_MARKER_RE.findall(text, start, end))
+        if hits:
+            ranges.append((start, end, hits))
+    return ranges
+
+
+def _truncate_centered(text: str, max_tokens: int) -> str:
+    """구간 중앙(키워드 위치)을 기준으로 양끝을 잘라 max_tokens 이내로 축소"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    lo, hi = 0, len(text) // 2
+    while lo < hi:
+        cut = (lo + hi) // 2
+        if estimate_tokens(text[cut:len(text) - cut]) <= max_tokens:
+            hi = cut
+        else:
+            lo = cut + 1
+    return text[lo:len(text) - lo]
+
+
+def pack_ranges(text: str, ranges: List[Range], max_tokens: int) -> str:
+    """키워드 밀도 높은 구간부터 예산 안에 채워 넣고, 문서 순서대로 연결"""
+    if not ranges or max_tokens <= 0:
+        return ""
+    sep_tokens = estimate_tokens(WINDOW_SEPARATOR)
+    ranked = sorted(ranges, key=lambda r: (-(r[2] / max(1, r[1] - r[0])), r[0]))
+    chosen: List[Tuple[int, str]] = []
+    used = 0
+    for start, end, _ in ranked:
+        remaining = max_tokens - used - (sep_tokens if chosen else 0)
+        if remaining <= 0:
+            break
+        piece = text[start:end]
+        cost = estimate_tokens(piece)
+        if cost > remaining:
+            # 남은 예산만큼만 구간 중앙 기준으로 잘라서 사용
+            piece = _truncate_centered(piece, remaining)
+            cost = estimate_tokens(piece)
+            if not piece.strip():
+                break
+        chosen.append((start, piece))
+        used += cost + (sep_tokens if len(chosen) > 1 else 0)
+    return WINDOW_SEPARATOR.join(piece for _, piece in sorted(chosen))
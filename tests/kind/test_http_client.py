@@ -0,0 +1,130 @@
+from pathlib import Path
+
+import pytest
+
+from infrastructure.kind import http_client
+from infrastructure.kind.http_client import (
+    KindHttpClient,
+    KindHttpError,
+    PAGE_SIZE,
+    cell_link,
+    cell_text,
+    check_page,
+    current_page,
+    link_isur_cd,
+    parse_rows,
+    total_pages,
+)
+
+"""
+    * KIND HTTP 파서 테스트
+        - fixtures/*.html : KIND 목록 화면 구조(표/페이지 표시/기업 링크)를 본뜬 수작성 HTML
+          (실제 응답 녹화본이 아니므로 폼 파라미터 검증은 포함하지 않음)
+"""
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def test_parse_rows_returns_data_rows():
+    rows = parse_rows(load("delisting_page1.html"))
+
+    assert len(rows) == 3
+    assert [cell_text(td) for td in rows[0]] == ["230", "가나다전자", "2025-03-31", "감사의견 거절 (범위제한)", ""]
+    assert cell_text(rows[1][4]) == "이전상장"
+
+
+def test_parse_rows_skips_no_result_row():
+    assert parse_rows(load("empty_result.html")) == []
+
+
+def test_parse_rows_without_list_table_raises():
+    with pytest.raises(KindHttpError):
+        parse_rows(load("error_page.html"))
+
+
+def test_total_pages_from_page_info():
+    assert total_pages(load("delisting_page1.html")) == 3
+    assert total_pages(load("empty_result.html")) == 1
+
+
+def test_total_pages_from_page_links():
+    assert total_pages(load("paging_links_only.html")) == 12
+
+
+def test_total_pages_defaults_to_one():
+    assert total_pages(load("error_page.html")) == 1
+
+
+def test_current_page():
+    assert current_page(load("delisting_page1.html")) == 1
+    assert current_page(load("delisting_page2_marker.html")) == 2
+    assert current_page(load("paging_links_only.html")) is None
+
+
+def test_link_isur_cd_from_onclick_and_href():
+    rows = parse_rows(load("delisting_page1.html"))
+
+    assert link_isur_cd(cell_link(rows[0][1])) == "07321"
+    assert link_isur_cd(cell_link(rows[1][1])) == "A1B2C"
+
+
+def test_link_isur_cd_without_link():
+    rows = parse_rows(load("delisting_page1.html"))
+
+    assert cell_link(rows[2][1]) is None
+    assert link_isur_cd(None) is None
+
+
+def test_check_page_rejects_empty_first_page():
+    html_text = load("empty_result.html")
+
+    with pytest.raises(KindHttpError):
+        check_page(html_text, parse_rows(html_text), 1, total_pages(html_text))
+
+
+def test_check_page_rejects_marker_mismatch():
+    html_text = load("delisting_page1.html")
+
+    with pytest.raises(KindHttpError):
+        check_page(html_text, parse_rows(html_text), 2, 3)
+
+
+def test_check_page_rejects_short_middle_page():
+    # 3페이지 중 1페이지인데 PAGE_SIZE 미만 → currentPageSize가 무시된 응답
+    html_text = load("delisting_page1.html")
+
+    assert len(parse_rows(html_text)) < PAGE_SIZE
+    with pytest.raises(KindHttpError):
+        check_page(html_text, parse_rows(html_text), 1, 3)
+
+
+def test_check_page_accepts_last_page():
+    html_text = load("paging_links_only.html")
+
+    check_page(html_text, parse_rows(html_text), 12, 12)
+
+
+def test_iter_pages_raises_on_empty_first_page(monkeypatch):
+    client = KindHttpClient()
+    monkeypatch.setattr(client, "post", lambda job, form: load("empty_result.html"))
+
+    with pytest.raises(KindHttpError):
+        list(client.iter_pages("TB_DELISTING", client.build_form("TB_DELISTING")))
+    client.close()
+
+
+def test_iter_pages_raises_on_repeated_page(monkeypatch):
+    # pageIndex가 무시되어 2페이지 요청에도 1페이지가 오는 경우
+    monkeypatch.setattr(http_client, "PAGE_SIZE", 3)
+    client = KindHttpClient()
+    monkeypatch.setattr(client, "post", lambda job, form: load("delisting_page1.html"))
+
+    pages = client.iter_pages("TB_DELISTING", client.build_form("TB_DELISTING"))
+    assert len(next(pages)) == 3
+    with pytest.raises(KindHttpError):
+        next(pages)
+    client.close()